@@ -10,10 +10,19 @@ sys.path.insert(0, str(project_root))
 
 
 @pytest.fixture(autouse=True)
-def mock_env(monkeypatch):
+def mock_env(monkeypatch, tmp_path):
     """Mock environment variables for all tests."""
     monkeypatch.setenv("OPENROUTER_API_KEY", "sk-mock-key")
     monkeypatch.setenv("TAVILY_API_KEY", "tvly-mock-key")
     monkeypatch.setenv("LANGSMITH_API_KEY", "lsv2-mock-key")
     monkeypatch.setenv("LANGCHAIN_TRACING", "false")
     monkeypatch.setenv("LANGCHAIN_PROJECT", "test-project")
+    monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "search_cache.db"))
+    monkeypatch.setenv("SEARCH_RATE_LIMIT_RPS", "0")
+    monkeypatch.setenv("LLM_BACKOFF_INITIAL_SECONDS", "0.01")
+    monkeypatch.setenv("LLM_BACKOFF_MAX_SECONDS", "0.01")
+    monkeypatch.setenv("SOURCE_INDEX_PATH", str(tmp_path / "source_index"))
+    monkeypatch.setenv("ENTITY_ALIAS_PATH", str(tmp_path / "entity_aliases.json"))
+    monkeypatch.setenv("PAGE_CACHE_PATH", str(tmp_path / "page_cache.db"))
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setenv("SEMANTIC_CACHE_PATH", str(tmp_path / "semantic_cache"))
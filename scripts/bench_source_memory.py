@@ -0,0 +1,72 @@
+"""
+Compare memory and checkpoint size of raw Tavily dicts vs Source records.
+
+Usage:
+    python -m scripts.bench_source_memory --sources 1000
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.tools.source import Source
+
+DOMAINS = ["reuters.com", "bloomberg.com", "techcrunch.com", "wikipedia.org"]
+
+
+def raw_results(n_sources: int) -> list[dict]:
+    """Generate Tavily-shaped results including fields we never use."""
+    rng = random.Random(0)
+    return [
+        {
+            "title": f"Article {i} about the market",
+            "url": f"https://www.{rng.choice(DOMAINS)}/news/{i % 200}",
+            "content": " ".join(rng.choices(["growth", "revenue", "ev"], k=120)),
+            "score": rng.random(),
+            "raw_content": None,
+            "favicon": "https://example.com/favicon.ico",
+            "published_date": "2025-11-28",
+            "images": [],
+        }
+        for i in range(n_sources)
+    ]
+
+
+def measure(build) -> tuple[object, int]:
+    """Return the built object and bytes allocated while building it."""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description="Source memory benchmark")
+    parser.add_argument("--sources", type=int, default=1000)
+    args = parser.parse_args()
+
+    serde = JsonPlusSerializer()
+    results = raw_results(args.sources)
+
+    # Copies mirror how state holds raw results (fresh dicts per response)
+    dicts, dict_bytes = measure(lambda: [dict(r) for r in results])
+    sources, source_bytes = measure(lambda: [Source.from_result(r) for r in results])
+
+    dict_ckpt = len(serde.dumps_typed({"raw_sources": dicts})[1])
+    source_ckpt = len(serde.dumps_typed({"raw_sources": sources})[1])
+
+    print(f"Sources: {args.sources:,}")
+    print(f"{'':22}{'raw dicts':>12}{'Source':>12}{'saving':>10}")
+    for label, before, after in [
+        ("In-memory (bytes)", dict_bytes, source_bytes),
+        ("Checkpoint (bytes)", dict_ckpt, source_ckpt),
+    ]:
+        print(f"{label:22}{before:>12,}{after:>12,}{1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
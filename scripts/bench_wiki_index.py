@@ -0,0 +1,75 @@
+"""
+Benchmark query latency and memory of the local Wikipedia index.
+
+Usage:
+    python -m scripts.bench_wiki_index --index data/wiki_index
+    python -m scripts.bench_wiki_index --synthetic 100000
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import tempfile
+import time
+
+from src.tools.wiki_index import WikiIndex, build_index
+
+QUERIES = [
+    "Tesla electric vehicles",
+    "Notion productivity software",
+    "OpenAI ChatGPT",
+    "Microsoft cloud computing revenue",
+    "Spotify music streaming subscribers",
+    "Airbnb short term rentals",
+]
+
+
+def synthetic_docs(n_docs: int):
+    """Generate random articles drawn from a Zipf-like vocabulary."""
+    rng = random.Random(0)
+    vocab = [f"term{i}" for i in range(50_000)] + " ".join(QUERIES).lower().split()
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    for i in range(n_docs):
+        words = rng.choices(vocab, weights=weights, k=200)
+        yield {"title": f"Article {i}", "url": "", "text": " ".join(words)}
+
+
+def main():
+    """Run the benchmark and print latency percentiles."""
+    parser = argparse.ArgumentParser(description="Wiki index query benchmark")
+    parser.add_argument("--index", help="Existing index directory")
+    parser.add_argument(
+        "--synthetic", type=int, default=20_000, help="Docs to generate if no index"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    index_path = args.index
+    if index_path is None:
+        index_path = tempfile.mkdtemp(prefix="wiki_index_")
+        print(f"Building synthetic index with {args.synthetic:,} docs...")
+        build_index(synthetic_docs(args.synthetic), index_path)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = WikiIndex(index_path)
+
+    latencies = []
+    for i in range(args.iterations):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        index.search(query, top_k=3)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Docs: {index.n_docs:,}  Queries: {args.iterations}")
+    print(f"p50: {statistics.median(latencies):.2f} ms")
+    print(f"p95: {latencies[int(0.95 * (len(latencies) - 1))]:.2f} ms")
+    print(f"max: {latencies[-1]:.2f} ms")
+    print(f"Peak RSS growth while querying: {(rss_after - rss_before) / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Build the local BM25 index used by WikipediaSearchTool.
+
+Input is a JSONL dump with one article per line:
+    {"title": "Tesla, Inc.", "url": "https://en.wikipedia.org/...", "text": "..."}
+
+Usage:
+    python -m scripts.build_wiki_index data/wiki_dump.jsonl --out data/wiki_index
+"""
+
+import argparse
+import json
+import time
+from itertools import islice
+from typing import Dict, Iterator
+
+from src.tools.wiki_index import build_index
+
+
+def read_dump(path: str) -> Iterator[Dict]:
+    """Stream articles from a JSONL dump, skipping blank lines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    """Parse arguments and build the index."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("dump", help="JSONL dump with title/url/text per line")
+    parser.add_argument(
+        "--out", default="./data/wiki_index", help="Output index directory"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Index only the first N articles"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_docs = build_index(islice(read_dump(args.dump), args.limit), args.out)
+
+    print(f"Indexed {n_docs:,} articles into {args.out}")
+    print(f"Build time: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 """Analysis Agent for competitive intelligence and SWOT analysis."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from src.agents.base import BaseAgent
 from src.utils.cost_tracker import CostTracker
+from src.utils.model_routing import StepRoute
 from src.utils.logging import setup_logger
 from src.utils.prompts import (
     ANALYST_COMPETITIVE_MATRIX,
     ANALYST_POSITIONING,
     ANALYST_RECOMMENDATIONS,
+    ANALYST_RESEARCH_CONTEXT,
     ANALYST_SWOT,
     ANALYST_SYSTEM,
 )
@@ -33,6 +35,7 @@ class AnalysisAgent(BaseAgent):
         model: Optional[str] = None,
         temperature: float = 0.4,  # Balanced for analytical reasoning
         cost_tracker: Optional[CostTracker] = None,
+        routes: Optional[Dict[str, StepRoute]] = None,
     ):
         """
         Initialize Analysis Agent.
@@ -41,12 +44,14 @@ class AnalysisAgent(BaseAgent):
             model: LLM model to use
             temperature: Sampling temperature
             cost_tracker: Cost tracker instance
+            routes: Per-step model/temperature overrides
         """
         super().__init__(
             name="AnalysisAgent",
             model=model,
             temperature=temperature,
             cost_tracker=cost_tracker,
+            routes=routes,
         )
 
     def get_system_prompt(self) -> str:
@@ -109,6 +114,47 @@ class AnalysisAgent(BaseAgent):
             logger.error(f"Analysis failed for {company_name}: {e}")
             raise
 
+    def project_cost(self, research_data: ResearchOutput) -> float:
+        """
+        Project the cost of analysing research data before running it.
+
+        Args:
+            research_data: Output from ResearchAgent
+
+        Returns:
+            Projected cost of all analysis calls in USD
+        """
+        company_name = research_data.get("company_name")
+        context = self._research_context(research_data)
+
+        def project(template: str, step: str, extra: int = 0, **fields) -> float:
+            user_message = template.format(company_name=company_name, **fields)
+            messages = self._create_messages(user_message, shared_context=context)
+            return self._project_call_cost(messages, step, extra)
+
+        return (
+            project(ANALYST_SWOT, "swot")
+            + project(ANALYST_COMPETITIVE_MATRIX, "competitive_matrix")
+            + project(ANALYST_POSITIONING, "positioning")
+            # Recommendations also read the SWOT, which does not exist yet
+            + project(
+                ANALYST_RECOMMENDATIONS,
+                "recommendations",
+                extra=self.output_model.expected("swot"),
+                swot="",
+            )
+        )
+
+    @staticmethod
+    def _research_context(research_data: ResearchOutput) -> str:
+        """Research data shared by every analysis call (the cacheable prefix)."""
+        return ANALYST_RESEARCH_CONTEXT.format(
+            company_name=research_data.get("company_name"),
+            company_overview=research_data.get("company_overview", ""),
+            competitors=research_data.get("competitors", ""),
+            market_trends=research_data.get("market_trends", ""),
+        )
+
     async def _perform_swot_analysis(
         self,
         research_data: ResearchOutput,
@@ -116,11 +162,14 @@ class AnalysisAgent(BaseAgent):
         """Generate SWOT analysis from research data."""
         user_message = ANALYST_SWOT.format(
             company_name=research_data.get("company_name"),
-            company_overview=research_data.get("company_overview", ""),
-            competitors=research_data.get("competitors", ""),
-            market_trends=research_data.get("market_trends", ""),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message, shared_context=self._research_context(research_data)
+            ),
+            step="swot",
+            entity=research_data.get("company_name"),
+        )
 
     async def _create_competitive_matrix(
         self,
@@ -129,9 +178,14 @@ class AnalysisAgent(BaseAgent):
         """Create competitive comparison matrix."""
         user_message = ANALYST_COMPETITIVE_MATRIX.format(
             company_name=research_data.get("company_name"),
-            competitors_info=research_data.get("competitors", ""),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message, shared_context=self._research_context(research_data)
+            ),
+            step="competitive_matrix",
+            entity=research_data.get("company_name"),
+        )
 
     async def _analyze_market_positioning(
         self,
@@ -140,10 +194,14 @@ class AnalysisAgent(BaseAgent):
         """Analyze market positioning strategy."""
         user_message = ANALYST_POSITIONING.format(
             company_name=research_data.get("company_name"),
-            company_overview=research_data.get("company_overview", ""),
-            competitors=research_data.get("competitors", ""),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message, shared_context=self._research_context(research_data)
+            ),
+            step="positioning",
+            entity=research_data.get("company_name"),
+        )
 
     async def _generate_recommendations(
         self,
@@ -154,6 +212,11 @@ class AnalysisAgent(BaseAgent):
         user_message = ANALYST_RECOMMENDATIONS.format(
             company_name=research_data.get("company_name"),
             swot=swot,
-            market_trends=research_data.get("market_trends", ""),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message, shared_context=self._research_context(research_data)
+            ),
+            step="recommendations",
+            entity=research_data.get("company_name"),
+        )
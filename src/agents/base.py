@@ -1,18 +1,74 @@
 """Base agent class for all agents in the system."""
 
+import asyncio
+import inspect
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import openai
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_exponential_jitter,
+)
 
 from src.utils.config import get_settings
+from src.utils.cost_projection import OutputTokenModel, get_output_model
 from src.utils.cost_tracker import CostTracker
+from src.utils.http_clients import get_http_client
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.llm_policy import LLMCallPolicy, is_retryable
+from src.utils.model_health import FallbackRouter, get_fallback_router
+from src.utils.model_routing import StepRoute, merge_routes, parse_routes
+from src.utils.rate_limiter import AdaptiveConcurrencyLimiter, get_model_limiter
+from src.utils.semantic_cache import SemanticCache, get_semantic_cache
+from src.utils.streaming import StreamCallback, StreamChunk
+from src.utils.tokens import estimate_message_tokens
 from src.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
 
 
+def _usage_from_message(message: Any) -> Dict[str, int]:
+    """
+    Read token usage from a (possibly aggregated) model response.
+
+    Prefers LangChain's usage_metadata and falls back to the raw
+    OpenAI-style usage block.
+
+    Returns:
+        Dictionary with prompt_tokens, completion_tokens, cache_read_tokens
+        and cache_write_tokens (empty if the response carried no usage)
+    """
+    usage_metadata = getattr(message, "usage_metadata", None)
+    if usage_metadata:
+        details = usage_metadata.get("input_token_details") or {}
+        return {
+            "prompt_tokens": usage_metadata.get("input_tokens", 0),
+            "completion_tokens": usage_metadata.get("output_tokens", 0),
+            "cache_read_tokens": details.get("cache_read", 0),
+            "cache_write_tokens": details.get("cache_creation", 0),
+        }
+
+    usage = getattr(message, "response_metadata", {}).get("usage") or {}
+    if not usage:
+        return {}
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "cache_read_tokens": details.get("cached_tokens") or 0,
+        "cache_write_tokens": details.get("cache_write_tokens") or 0,
+    }
+
+
 class BaseAgent(ABC):
     """
     Base class for all agents in the multi-agent system.
@@ -27,6 +83,7 @@ class BaseAgent(ABC):
         model: Optional[str] = None,
         temperature: float = 0.7,
         cost_tracker: Optional[CostTracker] = None,
+        routes: Optional[Dict[str, StepRoute]] = None,
     ):
         """
         Initialize base agent.
@@ -36,22 +93,190 @@ class BaseAgent(ABC):
             model: LLM model to use (defaults to config default)
             temperature: LLM sampling temperature (0-1)
             cost_tracker: Optional cost tracker instance
+            routes: Per-step model/temperature overrides, layered over the
+                configured model_routes
         """
         self.name = name
         self.cost_tracker = cost_tracker or CostTracker()
 
         settings = get_settings()
         self.model_name = model or settings.default_model
+        self.temperature = temperature
+        self.routes = merge_routes(parse_routes(settings.model_routes), routes or {})
+
+        # Expected completion sizes for pre-flight budget admission
+        self.output_model: OutputTokenModel = get_output_model()
+
+        # Timeout, retry and hedging policy for every LLM call
+        self.call_policy = LLMCallPolicy.from_settings(settings, name)
+
+        # Model prefixes of providers that cache prompts only at explicit
+        # markers, checked per call against the routed model
+        self.prompt_cache_marker_models: Tuple[str, ...] = (
+            tuple(settings.prompt_cache_marker_models)
+            if settings.prompt_caching_enabled
+            else ()
+        )
+
+        # Options for the process-wide per-model limiters (None = unlimited)
+        self.limiter_options: Optional[Dict[str, Any]] = (
+            {
+                "initial": settings.llm_concurrency_initial,
+                "min_limit": settings.llm_concurrency_min,
+                "max_limit": settings.llm_concurrency_max,
+                "latency_tolerance": settings.llm_concurrency_latency_tolerance,
+            }
+            if settings.llm_concurrency_enabled
+            else None
+        )
+
+        # Shared per-model health, moving calls off models breaching the SLO
+        self.fallback_router: Optional[FallbackRouter] = (
+            get_fallback_router() if settings.llm_fallback_enabled else None
+        )
 
         # Initialize LLM via OpenRouter
-        self.llm = ChatOpenAI(
-            model=self.model_name,
-            temperature=temperature,
+        self.llm = self._build_llm(self.model_name)
+        self._llms: Dict[str, ChatOpenAI] = {self.model_name: self.llm}
+
+        # Exact-match response cache; set to None to opt out
+        self.response_cache: Optional[LLMResponseCache] = (
+            LLMResponseCache(
+                path=settings.llm_cache_path,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+                max_entries=settings.llm_cache_max_entries,
+            )
+            if settings.llm_cache_enabled
+            else None
+        )
+
+        # Similarity-matched reuse, for agents with a threshold configured
+        self.semantic_threshold = settings.semantic_cache_thresholds.get(name, 0.0)
+        self.semantic_cache: Optional[SemanticCache] = (
+            get_semantic_cache(
+                settings.semantic_cache_path,
+                max_entries=settings.semantic_cache_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+            )
+            if settings.semantic_cache_enabled and self.semantic_threshold > 0
+            else None
+        )
+
+        # Sinks for streamed tokens (UI, API, files); see add_stream_callback
+        self.stream_callbacks: List[StreamCallback] = []
+
+        logger.info(f"Initialized {name} with model {self.model_name}")
+
+    def _build_llm(self, model: str) -> ChatOpenAI:
+        """
+        Create an OpenRouter chat client for a model.
+
+        Clients share the process-wide connection pool, and retries and
+        timeouts are left to the agent's call policy.
+        """
+        settings = get_settings()
+        return ChatOpenAI(
+            model=model,
+            temperature=self.temperature,
             openai_api_key=settings.openrouter_api_key,  # type: ignore[call-arg]
             openai_api_base=settings.openrouter_base_url,  # type: ignore[call-arg]
+            http_async_client=get_http_client("llm"),
+            max_retries=0,
+            timeout=self.call_policy.attempt_timeout_seconds,  # type: ignore[call-arg]
         )
 
-        logger.info(f"Initialized {name} with model {self.model_name}")
+    def _get_llm(self, model: Optional[str] = None) -> ChatOpenAI:
+        """Get the chat client for a model, creating it on first use."""
+        if model is None:
+            return self.llm
+        if model not in self._llms:
+            self._llms[model] = self._build_llm(model)
+        return self._llms[model]
+
+    def add_stream_callback(self, callback: StreamCallback) -> None:
+        """
+        Register a sink for streamed LLM output.
+
+        While any callback is registered, LLM calls stream by default.
+
+        Args:
+            callback: Function or coroutine function taking a StreamChunk
+        """
+        self.stream_callbacks.append(callback)
+
+    def remove_stream_callback(self, callback: StreamCallback) -> None:
+        """Unregister a stream sink."""
+        self.stream_callbacks.remove(callback)
+
+    async def _emit_stream(self, call_id: str, text: str, reset: bool = False) -> None:
+        """Forward a chunk to every callback; a failing sink is skipped."""
+        chunk = StreamChunk(agent=self.name, call_id=call_id, text=text, reset=reset)
+        for callback in list(self.stream_callbacks):
+            try:
+                result = callback(chunk)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"{self.name} stream callback failed: {e}")
+
+    async def _stream_llm(
+        self,
+        messages: list[BaseMessage],
+        model: Optional[str],
+        call_id: str,
+        **llm_kwargs,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Stream a completion to the callbacks, timing the first token.
+
+        If the stream fails after text was sent, a reset chunk tells the
+        sinks to discard it; a retry then streams under the same call_id.
+
+        Args:
+            messages: List of messages to send
+            model: Optional model override
+            call_id: Identifier shared by this call's chunks
+            **llm_kwargs: Additional LLM parameters
+
+        Returns:
+            Tuple of (full response text, usage as read by
+            _usage_from_message)
+        """
+        start = time.perf_counter()
+        ttft: Optional[float] = None
+        aggregate: Any = None
+
+        try:
+            async for chunk in self._get_llm(model).astream(
+                messages, stream_usage=True, **llm_kwargs
+            ):
+                aggregate = chunk if aggregate is None else aggregate + chunk
+                text = str(chunk.content)
+                if text:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    await self._emit_stream(call_id, text)
+        except BaseException:
+            # Timeouts cancel the stream too; partial text must not linger
+            if ttft is not None:
+                await self._emit_stream(call_id, "", reset=True)
+            raise
+
+        duration = time.perf_counter() - start
+        logger.info(
+            f"{self.name} streamed response: first token after "
+            f"{(ttft or duration) * 1000:.0f}ms, complete after {duration * 1000:.0f}ms",
+            extra={
+                "extra_fields": {
+                    "ttft_ms": round((ttft or duration) * 1000, 1),
+                    "stream_ms": round(duration * 1000, 1),
+                }
+            },
+        )
+
+        if aggregate is None:
+            return "", {}
+        return str(aggregate.content), _usage_from_message(aggregate)
 
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -79,58 +304,482 @@ class BaseAgent(ABC):
     async def _invoke_llm(
         self,
         messages: list[BaseMessage],
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+        step: Optional[str] = None,
+        entity: Optional[str] = None,
         **llm_kwargs,
     ) -> str:
         """
         Invoke LLM and track costs.
 
+        The step's route, if any, picks the model and temperature; an
+        explicit model only applies to unrouted steps. While that model
+        breaches its latency or error SLO, the fallback router swaps in the
+        next healthy model of its chain. Identical requests
+        (model, temperature and messages) are answered from the response
+        cache, and near-identical ones from the semantic cache when the
+        agent has a similarity threshold and the call names its entity (a
+        reuse never crosses companies); both are tracked
+        as zero-cost calls. Other calls must be admitted by the cost
+        tracker's budget before they are sent.
+
         Args:
             messages: List of messages to send
+            model: Optional model overriding the agent's own for this call
+                (a routed step's model takes precedence)
+            use_cache: Set False to always call the model for this request
+            stream: Stream tokens to the stream callbacks (defaults to
+                True while any callback is registered)
+            step: Prompt step name, keying the route and expected output
+                size (defaults to the agent name)
+            entity: Company the prompt is about, scoping semantic cache
+                reuse (calls without one skip the semantic cache)
             **llm_kwargs: Additional LLM parameters
 
         Returns:
             LLM response text
+
+        Raises:
+            BudgetExceededError: If the projected call cost exceeds the budget
         """
+        step = step or self.name
+        route = self.routes.get(step, StepRoute())
+        model_name = route.model or model or self.model_name
+        temperature = (
+            self.temperature if route.temperature is None else route.temperature
+        )
+        if self.fallback_router is not None:
+            model_name = self.fallback_router.choose(model_name)
+        messages = self._mark_shared_context(messages, model_name)
+        if stream is None:
+            stream = bool(self.stream_callbacks)
+        call_id = uuid.uuid4().hex[:8]
+        cache = self.response_cache if use_cache else None
+        entity = entity or ""
+        semantic_cache = self.semantic_cache if use_cache and entity else None
+        cache_key = (
+            LLMResponseCache.make_llm_key(model_name, temperature, messages, llm_kwargs)
+            if cache is not None
+            else ""
+        )
+
         try:
-            response = await self.llm.ainvoke(messages, **llm_kwargs)
+            if cache is not None:
+                cached = await asyncio.to_thread(cache.get, cache_key)
+                if cached is not None:
+                    self.cost_tracker.track_cache_hit(
+                        model=model_name,
+                        input_tokens=cached["input_tokens"],
+                        output_tokens=cached["output_tokens"],
+                        step=step,
+                    )
+                    logger.info(
+                        f"{self.name} LLM response served from cache",
+                        extra={"extra_fields": {"model": model_name}},
+                    )
+                    if stream:
+                        await self._emit_stream(call_id, cached["content"])
+                    return cached["content"]
+
+            if semantic_cache is not None:
+                entry, similarity = await asyncio.to_thread(
+                    semantic_cache.lookup,
+                    model_name,
+                    temperature,
+                    messages,
+                    self.semantic_threshold,
+                    entity,
+                )
+                decision = "reuse" if entry is not None else "miss"
+                logger.info(
+                    f"{self.name} semantic cache {decision}: similarity "
+                    f"{similarity:.4f} vs threshold {self.semantic_threshold}",
+                    extra={
+                        "extra_fields": {
+                            "model": model_name,
+                            "semantic_cache": decision,
+                            "similarity": round(similarity, 4),
+                            "threshold": self.semantic_threshold,
+                        }
+                    },
+                )
+                if entry is not None:
+                    self.cost_tracker.track_cache_hit(
+                        model=model_name,
+                        input_tokens=entry["input_tokens"],
+                        output_tokens=entry["output_tokens"],
+                        step=step,
+                    )
+                    if stream:
+                        await self._emit_stream(call_id, entry["content"])
+                    return entry["content"]
+
+            reserved = self.cost_tracker.admit(
+                model_name,
+                estimate_message_tokens(messages),
+                self._expected_output_tokens(step, llm_kwargs),
+            )
+            if temperature != self.temperature:
+                llm_kwargs = {**llm_kwargs, "temperature": temperature}
+            start = time.perf_counter()
+            try:
+                content, usage = await self._call_llm(
+                    messages,
+                    model_name,
+                    stream,
+                    call_id=call_id,
+                    step=step,
+                    **llm_kwargs,
+                )
+            finally:
+                self.cost_tracker.release(reserved)
+            latency = time.perf_counter() - start
 
             # Track usage if available
-            if hasattr(response, "response_metadata"):
-                usage = response.response_metadata.get("usage", {})
-                if usage:
-                    self.cost_tracker.track_usage(
-                        model=self.model_name,
-                        input_tokens=usage.get("prompt_tokens", 0),
-                        output_tokens=usage.get("completion_tokens", 0),
-                    )
+            if usage:
+                self._track_usage(model_name, usage, step=step, latency=latency)
+                self.output_model.observe(step, usage.get("completion_tokens", 0))
+
+            if cache is not None and content:
+                await asyncio.to_thread(
+                    cache.set,
+                    cache_key,
+                    {
+                        "content": content,
+                        "input_tokens": usage.get("prompt_tokens", 0),
+                        "output_tokens": usage.get("completion_tokens", 0),
+                    },
+                )
+            if semantic_cache is not None and content:
+                await asyncio.to_thread(
+                    semantic_cache.add,
+                    model_name,
+                    temperature,
+                    messages,
+                    content,
+                    usage.get("prompt_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                    entity,
+                )
 
             logger.info(
                 f"{self.name} LLM call complete",
                 extra={
                     "extra_fields": {
-                        "model": self.model_name,
+                        "step": step,
+                        "model": model_name,
+                        "temperature": temperature,
+                        "latency_s": round(latency, 3),
                         "total_cost": self.cost_tracker.total_cost,
                     }
                 },
             )
 
-            return str(response.content)
+            return content
 
         except Exception as e:
             logger.error(f"{self.name} LLM call failed: {e}")
             raise
 
+    async def _request_llm(
+        self,
+        messages: list[BaseMessage],
+        model: Optional[str],
+        stream: bool,
+        call_id: Optional[str] = None,
+        **llm_kwargs,
+    ) -> Tuple[str, Dict[str, int]]:
+        """Send one request, returning its text and usage."""
+        if stream:
+            return await self._stream_llm(
+                messages, model, call_id or uuid.uuid4().hex[:8], **llm_kwargs
+            )
+
+        response = await self._get_llm(model).ainvoke(messages, **llm_kwargs)
+        return str(response.content), _usage_from_message(response)
+
+    def _expected_output_tokens(self, step: str, llm_kwargs: Dict[str, Any]) -> int:
+        """Expected completion tokens of a call, capped by its max_tokens."""
+        expected = self.output_model.expected(step)
+        max_tokens = llm_kwargs.get("max_tokens")
+        return min(expected, max_tokens) if max_tokens else expected
+
+    def _project_call_cost(
+        self,
+        messages: list[BaseMessage],
+        step: str,
+        extra_input_tokens: int = 0,
+    ) -> float:
+        """
+        Project the cost of a call from its messages and expected output.
+
+        Args:
+            messages: Messages the call would send
+            step: Prompt step name
+            extra_input_tokens: Input not in the messages yet (outputs of
+                earlier steps that have not run)
+
+        Returns:
+            Projected cost in USD
+        """
+        return self.cost_tracker.calculate_cost(
+            self.routes.get(step, StepRoute()).model or self.model_name,
+            estimate_message_tokens(messages) + extra_input_tokens,
+            self.output_model.expected(step),
+        )
+
+    def _track_usage(
+        self,
+        model_name: str,
+        usage: Dict[str, int],
+        step: str = "",
+        latency: float = 0.0,
+    ) -> None:
+        """Record a billed response, including its prompt-cache tokens."""
+        self.cost_tracker.track_usage(
+            model=model_name,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            cache_read_tokens=usage.get("cache_read_tokens", 0),
+            cache_write_tokens=usage.get("cache_write_tokens", 0),
+            step=step,
+            latency=latency,
+        )
+
+    async def _attempt_llm(
+        self,
+        messages: list[BaseMessage],
+        model: Optional[str],
+        stream: bool,
+        timeout: float,
+        call_id: Optional[str] = None,
+        step: str = "",
+        **llm_kwargs,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Send one timed request and record it as an attempt.
+
+        The request holds a slot of the model's concurrency limiter, which
+        learns from 429 responses and from its latency compared with recent
+        requests for the same step, and its outcome feeds the model's
+        health statistics.
+        """
+        model_name = model or self.model_name
+        limiter = self._get_limiter(model_name)
+        if limiter is not None:
+            queued = await limiter.acquire()
+            if queued:
+                logger.debug(
+                    f"{self.name} waited {queued:.2f}s for a {model_name} slot",
+                    extra={"extra_fields": {"model": model_name, "queued_s": queued}},
+                )
+
+        start = time.perf_counter()
+        latency: Optional[float] = None
+        rate_limited = False
+        try:
+            result = await asyncio.wait_for(
+                self._request_llm(messages, model, stream, call_id, **llm_kwargs),
+                timeout,
+            )
+            latency = time.perf_counter() - start
+        except asyncio.CancelledError:
+            self.cost_tracker.track_attempt(
+                model_name, "cancelled", time.perf_counter() - start
+            )
+            raise
+        except Exception as e:
+            latency = time.perf_counter() - start
+            rate_limited = isinstance(e, openai.APIStatusError) and e.status_code == 429
+            timed_out = isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError))
+            self.cost_tracker.track_attempt(
+                model_name, "timeout" if timed_out else "error", latency
+            )
+            if self.fallback_router is not None and is_retryable(e):
+                # Bad requests are our fault, not a sign of model health
+                self.fallback_router.record(model_name, latency, ok=False)
+            if not (rate_limited or timed_out):
+                latency = None  # Says nothing about upstream load
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release(latency, rate_limited=rate_limited, key=step)
+
+        self.cost_tracker.track_attempt(model_name, "ok", latency)
+        if self.fallback_router is not None:
+            self.fallback_router.record(model_name, latency, ok=True)
+        return result
+
+    def _get_limiter(self, model_name: str) -> Optional[AdaptiveConcurrencyLimiter]:
+        """Get the shared concurrency limiter for a model, if enabled."""
+        if self.limiter_options is None:
+            return None
+        return get_model_limiter(model_name, **self.limiter_options)
+
+    async def _hedged_attempt(
+        self,
+        messages: list[BaseMessage],
+        model: Optional[str],
+        timeout: float,
+        step: str = "",
+        **llm_kwargs,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Send a request, and a second one if the first is slower than the
+        policy's hedge delay. The first success wins; the other request is
+        cancelled, or costed if it had finished as well.
+        """
+        hedge_after = self.call_policy.hedge_after_seconds or 0.0
+        primary = asyncio.create_task(
+            self._attempt_llm(messages, model, False, timeout, step=step, **llm_kwargs)
+        )
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.info(
+            f"{self.name} LLM request slower than {hedge_after:.1f}s, sending hedge",
+            extra={"extra_fields": {"model": model or self.model_name}},
+        )
+        hedge = asyncio.create_task(
+            self._attempt_llm(
+                messages,
+                model,
+                False,
+                max(timeout - hedge_after, 0.0),
+                step=step,
+                **llm_kwargs,
+            )
+        )
+
+        pending = {primary, hedge}
+        winner: Optional[asyncio.Task] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif winner is None:
+                        winner = task
+                    else:
+                        # Both answered at once; the second was paid for too
+                        _, usage = task.result()
+                        self._track_usage(model or self.model_name, usage, step=step)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None:
+            assert error is not None
+            raise error
+        if winner is hedge:
+            logger.info(f"{self.name} hedge request answered first")
+        return winner.result()
+
+    async def _call_llm(
+        self,
+        messages: list[BaseMessage],
+        model: Optional[str],
+        stream: bool,
+        call_id: Optional[str] = None,
+        step: str = "",
+        **llm_kwargs,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Call the LLM under the agent's timeout, retry and hedging policy.
+
+        Each attempt gets the attempt timeout, capped by what is left of the
+        call's deadline. Retryable failures (timeouts, connection errors,
+        429 and 5xx) are retried with exponential backoff and jitter until
+        the attempts or the deadline run out. Streamed calls are never
+        hedged, so sinks see one request at a time, and every attempt
+        streams under the same call_id.
+
+        Args:
+            messages: List of messages to send
+            model: Optional model override
+            stream: Stream tokens to the stream callbacks
+            call_id: Identifier for streamed chunks (new one if None)
+            step: Prompt step, for the concurrency limiter's latency baseline
+            **llm_kwargs: Additional LLM parameters
+
+        Returns:
+            Tuple of (response text, usage as read by _usage_from_message)
+        """
+        policy = self.call_policy
+        model_name = model or self.model_name
+        deadline = time.monotonic() + policy.deadline_seconds
+
+        def log_retry(state: RetryCallState) -> None:
+            error = state.outcome.exception() if state.outcome else None
+            logger.warning(
+                f"{self.name} LLM attempt {state.attempt_number} failed "
+                f"({error!r}), retrying in {state.upcoming_sleep:.1f}s",
+                extra={
+                    "extra_fields": {
+                        "model": model_name,
+                        "attempt": state.attempt_number,
+                        "retry_in_s": round(state.upcoming_sleep, 2),
+                    }
+                },
+            )
+
+        retrying = AsyncRetrying(
+            stop=(
+                stop_after_attempt(policy.max_attempts)
+                | stop_before_delay(policy.deadline_seconds)
+            ),
+            wait=wait_exponential_jitter(
+                initial=policy.backoff_initial_seconds,
+                max=policy.backoff_max_seconds,
+                jitter=policy.backoff_initial_seconds,
+            ),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=log_retry,
+            reraise=True,
+        )
+
+        async for attempt in retrying:
+            with attempt:
+                timeout = min(
+                    policy.attempt_timeout_seconds, deadline - time.monotonic()
+                )
+                if stream or policy.hedge_after_seconds is None:
+                    return await self._attempt_llm(
+                        messages, model, stream, timeout, call_id, step, **llm_kwargs
+                    )
+                return await self._hedged_attempt(
+                    messages, model, timeout, step, **llm_kwargs
+                )
+
+        raise AssertionError("unreachable: tenacity re-raises the last error")
+
     def _create_messages(
         self,
         user_message: str,
         system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
     ) -> list[BaseMessage]:
         """
         Create message list for LLM.
 
+        Context shared by several calls goes in its own message right after
+        the system prompt, so every call starts with the same prefix and
+        providers can serve it from their prompt cache. Models that only
+        cache marked prefixes get a cache_control breakpoint after it once
+        the call's model is known (see _mark_shared_context).
+
         Args:
             user_message: User message content
             system_prompt: Optional system prompt (uses default if None)
+            shared_context: Optional context repeated across this agent's calls
 
         Returns:
             List of messages
@@ -141,11 +790,52 @@ class BaseAgent(ABC):
         prompt = system_prompt or self.get_system_prompt()
         messages.append(SystemMessage(content=prompt))
 
+        # Add the cacheable shared context
+        if shared_context:
+            messages.append(
+                HumanMessage(
+                    content=shared_context, additional_kwargs={"shared_context": True}
+                )
+            )
+
         # Add user message
         messages.append(HumanMessage(content=user_message))
 
         return messages
 
+    def _mark_shared_context(
+        self, messages: list[BaseMessage], model_name: str
+    ) -> list[BaseMessage]:
+        """
+        Add a cache_control breakpoint after the shared context when the
+        model only caches marked prefixes.
+
+        Args:
+            messages: Messages built by _create_messages
+            model_name: Model the call is sent to (after routing and fallback)
+
+        Returns:
+            The messages, with the shared context marked if needed
+        """
+        if not model_name.startswith(self.prompt_cache_marker_models):
+            return messages
+        return [
+            HumanMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": message.content,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+                additional_kwargs=message.additional_kwargs,
+            )
+            if message.additional_kwargs.get("shared_context")
+            and isinstance(message.content, str)
+            else message
+            for message in messages
+        ]
+
     def get_cost_summary(self) -> Dict[str, Any]:
         """
         Get cost summary for this agent's operations.
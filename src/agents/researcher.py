@@ -1,16 +1,31 @@
 """Research Agent for gathering market intelligence data."""
 
-from typing import Optional
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Optional
 
 from src.agents.base import BaseAgent
-from src.tools.search import TavilySearchTool
+from src.tools.context_packer import split_context
+from src.tools.dedup import SourceDeduplicator
+from src.tools.enrichment import PageEnricher
+from src.tools.search import TavilySearchTool, WikipediaSearchTool
+from src.tools.search_cache import SearchCache
+from src.tools.source import Source
+from src.tools.source_index import get_source_index
+from src.utils.config import get_settings
 from src.utils.cost_tracker import CostTracker
+from src.utils.model_routing import StepRoute
 from src.utils.logging import setup_logger
+from src.utils.tokens import estimate_tokens
 from src.utils.prompts import (
     RESEARCHER_ANALYZE_COMPANY,
     RESEARCHER_ANALYZE_COMPETITORS,
     RESEARCHER_ANALYZE_TRENDS,
+    RESEARCHER_COMPANY_INTENT,
+    RESEARCHER_COMPETITORS_INTENT,
+    RESEARCHER_MAP_SUMMARIZE,
     RESEARCHER_SYSTEM,
+    RESEARCHER_TRENDS_INTENT,
 )
 from src.workflows.types import ResearchOutput
 
@@ -33,6 +48,7 @@ class ResearchAgent(BaseAgent):
         model: Optional[str] = None,
         temperature: float = 0.3,  # Lower for more factual responses
         cost_tracker: Optional[CostTracker] = None,
+        routes: Optional[Dict[str, StepRoute]] = None,
     ):
         """
         Initialize Research Agent.
@@ -41,15 +57,64 @@ class ResearchAgent(BaseAgent):
             model: LLM model to use
             temperature: Sampling temperature (lower for research)
             cost_tracker: Cost tracker instance
+            routes: Per-step model/temperature overrides
         """
         super().__init__(
             name="ResearchAgent",
             model=model,
             temperature=temperature,
             cost_tracker=cost_tracker,
+            routes=routes,
         )
 
+        settings = get_settings()
         self.search_tool = TavilySearchTool()
+        self.wiki_tool = WikipediaSearchTool()
+        self.dedup_threshold = settings.source_dedup_threshold
+        self.context_token_budgets = {
+            "basic": settings.context_token_budget_basic,
+            "comprehensive": settings.context_token_budget_comprehensive,
+        }
+        self.query_expansion = {
+            "basic": settings.query_expansion_basic,
+            "comprehensive": settings.query_expansion_comprehensive,
+        }
+        self.chunk_retrieval = settings.chunk_retrieval_enabled
+        self.chunk_top_k = settings.chunk_retrieval_top_k
+        self.chunk_words = settings.chunk_retrieval_words
+        self.map_reduce_threshold = settings.map_reduce_threshold_tokens
+        self.map_reduce_chunk_tokens = settings.map_reduce_chunk_tokens
+        self.map_reduce_model = settings.map_reduce_model
+        self.map_reduce_concurrency = settings.map_reduce_concurrency
+        self.source_index = (
+            get_source_index(settings.source_index_path, dim=settings.source_index_dim)
+            if settings.source_index_enabled
+            else None
+        )
+        self.enricher = (
+            PageEnricher(
+                top_k=settings.page_enrichment_top_k,
+                timeout=settings.page_fetch_timeout,
+                max_per_host=settings.page_fetch_max_per_host,
+                max_chars=settings.page_fetch_max_chars,
+                cache=SearchCache(
+                    path=settings.page_cache_path,
+                    ttl_seconds=settings.page_cache_ttl_seconds,
+                ),
+            )
+            if settings.page_enrichment_enabled
+            else None
+        )
+        self.local_min_similarity = settings.source_index_min_similarity
+        self.local_min_hits = settings.source_index_min_hits
+        # Hours a locally indexed source stays usable per topic (0 = no limit)
+        self.local_max_age_hours = {
+            "company": settings.source_index_max_age_hours,
+            "competitors": settings.source_index_max_age_hours,
+            "trends": settings.source_index_trends_max_age_hours,
+        }
+        # Set True to search every topic even when the index covers it
+        self.refresh_sources = False
 
     def get_system_prompt(self) -> str:
         """Get system prompt for research agent."""
@@ -74,10 +139,13 @@ class ResearchAgent(BaseAgent):
                 - company_overview: Company information
                 - competitors: Competitor analysis
                 - market_trends: Industry trends
-                - raw_sources: List of sources used
+                - raw_sources: List of Source records used
         """
         logger.info(f"Starting research for: {company_name}")
 
+        # The UI passes "Basic"/"Comprehensive"
+        research_depth = research_depth.lower()
+
         results: ResearchOutput = {
             "company_name": company_name,
             "industry": industry,
@@ -87,33 +155,87 @@ class ResearchAgent(BaseAgent):
             "raw_sources": [],
         }
 
+        # Shared across the three searches so repeats are caught cross-query
+        dedup = SourceDeduplicator(similarity_threshold=self.dedup_threshold)
+        # A budget of 0 disables packing and passes full contents through
+        token_budget = self.context_token_budgets.get(research_depth) or None
+        num_queries = self.query_expansion.get(research_depth, 1)
+        # Local index hits per topic, to watch search spend fall over time
+        local_hits: Dict[str, int] = {}
+        company_intent = f"{company_name} {RESEARCHER_COMPANY_INTENT}"
+        competitors_intent = f"{company_name} {RESEARCHER_COMPETITORS_INTENT}"
+
         try:
             # 1. Company Overview
-            company_data = await self.search_tool.get_company_info(
-                company_name=company_name,
-                max_results=10 if research_depth == "comprehensive" else 5,
+            max_results = 10 if research_depth == "comprehensive" else 5
+            company_data = await self._search_local_first(
+                "company",
+                company_intent,
+                company_name,
+                max_results,
+                partial(
+                    self.search_tool.get_company_info,
+                    company_name=company_name,
+                    max_results=max_results,
+                    num_queries=num_queries,
+                ),
+                local_hits,
             )
 
-            results["raw_sources"].extend(company_data.get("results", []))
+            # Free baseline facts from the local Wikipedia index, if built
+            if self.wiki_tool.available:
+                wiki_data = await self.wiki_tool.search(company_name, max_results=2)
+                company_data = {
+                    **company_data,
+                    "results": company_data.get("results", []) + wiki_data["results"],
+                }
+
+            company_data = dedup.filter_response(company_data)
+            results["raw_sources"].extend(
+                map(Source.from_result, company_data.get("results", []))
+            )
+            kept_per_topic = {"company": len(company_data.get("results", []))}
+
+            # Full page text for the top results (after sources are recorded)
+            if self.enricher is not None:
+                company_data = await self.enricher.enrich(company_data)
 
             # Analyze company data with LLM
-            company_context = self.search_tool.format_results_for_llm(company_data)
+            company_context = self._format_context(
+                company_data, company_intent, token_budget
+            )
             company_analysis = await self._analyze_company(
                 company_name, company_context
             )
             results["company_overview"] = company_analysis
 
             # 2. Competitor Analysis
-            competitor_data = await self.search_tool.get_competitor_info(
-                company_name=company_name,
-                industry=industry,
-                max_results=10 if research_depth == "comprehensive" else 5,
+            competitor_data = await self._search_local_first(
+                "competitors",
+                competitors_intent,
+                company_name,
+                max_results,
+                partial(
+                    self.search_tool.get_competitor_info,
+                    company_name=company_name,
+                    industry=industry,
+                    max_results=max_results,
+                    num_queries=num_queries,
+                ),
+                local_hits,
+            )
+
+            competitor_data = dedup.filter_response(competitor_data)
+            results["raw_sources"].extend(
+                map(Source.from_result, competitor_data.get("results", []))
             )
+            kept_per_topic["competitors"] = len(competitor_data.get("results", []))
 
-            results["raw_sources"].extend(competitor_data.get("results", []))
+            if self.enricher is not None:
+                competitor_data = await self.enricher.enrich(competitor_data)
 
-            competitor_context = self.search_tool.format_results_for_llm(
-                competitor_data
+            competitor_context = self._format_context(
+                competitor_data, competitors_intent, token_budget
             )
             competitor_analysis = await self._analyze_competitors(
                 company_name, competitor_context
@@ -122,21 +244,58 @@ class ResearchAgent(BaseAgent):
 
             # 3. Market Trends (if industry provided)
             if industry:
-                trend_data = await self.search_tool.get_market_trends(
-                    industry=industry,
-                    max_results=8 if research_depth == "comprehensive" else 4,
+                trends_intent = f"{industry} {RESEARCHER_TRENDS_INTENT}"
+                trend_max_results = 8 if research_depth == "comprehensive" else 4
+                trend_data = await self._search_local_first(
+                    "trends",
+                    trends_intent,
+                    industry,
+                    trend_max_results,
+                    partial(
+                        self.search_tool.get_market_trends,
+                        industry=industry,
+                        max_results=trend_max_results,
+                        num_queries=num_queries,
+                    ),
+                    local_hits,
                 )
 
-                results["raw_sources"].extend(trend_data.get("results", []))
+                trend_data = dedup.filter_response(trend_data)
+                results["raw_sources"].extend(
+                    map(Source.from_result, trend_data.get("results", []))
+                )
+                kept_per_topic["trends"] = len(trend_data.get("results", []))
+
+                if self.enricher is not None:
+                    trend_data = await self.enricher.enrich(trend_data)
 
-                trend_context = self.search_tool.format_results_for_llm(trend_data)
+                trend_context = self._format_context(
+                    trend_data, trends_intent, token_budget
+                )
                 trend_analysis = await self._analyze_trends(industry, trend_context)
                 results["market_trends"] = trend_analysis
 
+            dedup_stats = dedup.get_stats()
             logger.info(
                 f"Research complete for {company_name}. "
-                f"Processed {len(results['raw_sources'])} sources"
+                f"Processed {len(results['raw_sources'])} sources, "
+                f"removed {dedup_stats['removed']} duplicates "
+                f"(~{dedup_stats['tokens_saved']} tokens saved)",
+                extra={"extra_fields": {"dedup": dedup_stats}},
+            )
+            logger.info(
+                "Results kept per topic: "
+                + ", ".join(f"{k}={v}" for k, v in kept_per_topic.items()),
+                extra={"extra_fields": {"results_kept": kept_per_topic}},
             )
+            if self.source_index is not None:
+                skipped = sum(n >= self.local_min_hits for n in local_hits.values())
+                logger.info(
+                    "Local index hits per topic: "
+                    + ", ".join(f"{k}={v}" for k, v in local_hits.items())
+                    + f" (search skipped for {skipped})",
+                    extra={"extra_fields": {"local_index_hits": local_hits}},
+                )
 
             return results
 
@@ -144,16 +303,157 @@ class ResearchAgent(BaseAgent):
             logger.error(f"Research failed for {company_name}: {e}")
             raise
 
+    async def _search_local_first(
+        self,
+        topic: str,
+        query: str,
+        entity: str,
+        max_results: int,
+        fetch: Callable[[], Awaitable[Dict]],
+        local_hits: Dict[str, int],
+    ) -> Dict:
+        """
+        Answer a topic from the local source index, searching if it is thin.
+
+        Sources fetched from the search API are added to the index so later
+        runs can reuse them. Sources older than the topic's max age do not
+        count as hits, and ``refresh_sources`` skips the lookup entirely.
+        Local hits carry their cosine similarity as ``local_similarity``,
+        not as a search relevance ``score``; they keep similarity order.
+
+        Args:
+            topic: Topic name for reporting
+            query: Query text to match indexed sources against
+            entity: Company or industry every local hit must be titled or
+                indexed with; new sources are indexed under it
+            max_results: Maximum sources to return
+            fetch: Zero-argument coroutine factory running the web search
+            local_hits: Per-topic hit counts, updated in place
+
+        Returns:
+            Tavily-shaped search response
+        """
+        if self.source_index is None:
+            return await fetch()
+
+        hits = []
+        if not self.refresh_sources:
+            max_age_hours = self.local_max_age_hours.get(topic, 0.0)
+            hits = await asyncio.to_thread(
+                self.source_index.search,
+                query,
+                top_k=max_results,
+                min_similarity=self.local_min_similarity,
+                must_contain=entity,
+                max_age_seconds=max_age_hours * 3600 or None,
+            )
+        local_hits[topic] = len(hits)
+
+        if hits and len(hits) >= self.local_min_hits:
+            logger.info(f"Answered {topic} from {len(hits)} locally indexed sources")
+            return {
+                "query": query,
+                "results": [
+                    {**record, "local_similarity": round(similarity, 4)}
+                    for record, similarity in hits
+                ],
+            }
+
+        data = await fetch()
+        await asyncio.to_thread(self.source_index.add, data.get("results", []), entity)
+        return data
+
+    def _format_context(
+        self,
+        data: dict,
+        intent: str,
+        token_budget: Optional[int],
+    ) -> str:
+        """
+        Format search results, keeping only passages relevant to intent.
+
+        The map-reduce threshold applies to the full source text, before
+        retrieval and packing cut it down: sources larger than the
+        threshold are passed through whole, to be map-reduced into notes
+        by _reduce_context instead of truncated.
+        """
+        if self.map_reduce_threshold:
+            full_context = self.search_tool.format_results_for_llm(data)
+            if estimate_tokens(full_context) > self.map_reduce_threshold:
+                return full_context
+
+        return self.search_tool.format_results_for_llm(
+            data,
+            token_budget=token_budget,
+            intent=intent if self.chunk_retrieval else None,
+            top_k_chunks=self.chunk_top_k,
+            chunk_words=self.chunk_words,
+        )
+
+    async def _reduce_context(self, search_context: str, focus: str) -> str:
+        """
+        Map-reduce an oversized search context into cited notes.
+
+        Contexts under the threshold are returned unchanged. Larger ones
+        are split into chunks that are summarized concurrently on the
+        cheap map model, with bounded parallelism; the notes then stand in
+        for the raw results in the final (reduce) prompt.
+
+        Args:
+            search_context: Formatted search results
+            focus: What the final prompt needs from the results
+
+        Returns:
+            Context that fits under the threshold where possible
+        """
+        context_tokens = estimate_tokens(search_context)
+        if not self.map_reduce_threshold or context_tokens <= self.map_reduce_threshold:
+            return search_context
+
+        chunks = split_context(search_context, self.map_reduce_chunk_tokens)
+        semaphore = asyncio.Semaphore(self.map_reduce_concurrency)
+
+        async def summarize(chunk: str) -> str:
+            async with semaphore:
+                user_message = RESEARCHER_MAP_SUMMARIZE.format(
+                    focus=focus, search_context=chunk
+                )
+                return await self._invoke_llm(
+                    self._create_messages(user_message),
+                    model=self.map_reduce_model,
+                    step="research_map",
+                )
+
+        notes = "\n\n".join(await asyncio.gather(*map(summarize, chunks)))
+
+        logger.info(
+            f"Map-reduced {context_tokens} context tokens in {len(chunks)} "
+            f"chunks to {estimate_tokens(notes)} tokens of notes",
+            extra={
+                "extra_fields": {
+                    "map_chunks": len(chunks),
+                    "context_tokens": context_tokens,
+                    "notes_tokens": estimate_tokens(notes),
+                }
+            },
+        )
+        return notes
+
     async def _analyze_company(
         self,
         company_name: str,
         search_context: str,
     ) -> str:
         """Analyze company information from search results."""
+        search_context = await self._reduce_context(
+            search_context, RESEARCHER_COMPANY_INTENT
+        )
         user_message = RESEARCHER_ANALYZE_COMPANY.format(
             company_name=company_name, search_context=search_context
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(user_message), step="research_company"
+        )
 
     async def _analyze_competitors(
         self,
@@ -161,10 +461,15 @@ class ResearchAgent(BaseAgent):
         search_context: str,
     ) -> str:
         """Analyze competitor landscape."""
+        search_context = await self._reduce_context(
+            search_context, RESEARCHER_COMPETITORS_INTENT
+        )
         user_message = RESEARCHER_ANALYZE_COMPETITORS.format(
             company_name=company_name, search_context=search_context
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(user_message), step="research_competitors"
+        )
 
     async def _analyze_trends(
         self,
@@ -172,7 +477,12 @@ class ResearchAgent(BaseAgent):
         search_context: str,
     ) -> str:
         """Analyze market trends."""
+        search_context = await self._reduce_context(
+            search_context, RESEARCHER_TRENDS_INTENT
+        )
         user_message = RESEARCHER_ANALYZE_TRENDS.format(
             industry=industry, search_context=search_context
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(user_message), step="research_trends"
+        )
@@ -1,14 +1,16 @@
 """Writer Agent for generating professional market intelligence reports."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from src.agents.base import BaseAgent
 from src.utils.cost_tracker import CostTracker
+from src.utils.model_routing import StepRoute
 from src.utils.logging import setup_logger
 from src.utils.prompts import (
     WRITER_EXECUTIVE_SUMMARY,
     WRITER_FULL_REPORT,
+    WRITER_REPORT_CONTEXT,
     WRITER_SYSTEM,
 )
 from src.workflows.types import AnalysisOutput, ReportOutput, ResearchOutput
@@ -31,6 +33,7 @@ class WriterAgent(BaseAgent):
         model: Optional[str] = None,
         temperature: float = 0.6,  # Higher for better writing quality
         cost_tracker: Optional[CostTracker] = None,
+        routes: Optional[Dict[str, StepRoute]] = None,
     ):
         """
         Initialize Writer Agent.
@@ -39,12 +42,14 @@ class WriterAgent(BaseAgent):
             model: LLM model to use
             temperature: Sampling temperature
             cost_tracker: Cost tracker instance
+            routes: Per-step model/temperature overrides
         """
         super().__init__(
             name="WriterAgent",
             model=model,
             temperature=temperature,
             cost_tracker=cost_tracker,
+            routes=routes,
         )
 
     def get_system_prompt(self) -> str:
@@ -88,7 +93,14 @@ class WriterAgent(BaseAgent):
                 "industry": research_data.get("industry"),
                 "generated_date": datetime.now().isoformat(),
                 "sources_count": len(research_data.get("raw_sources", [])),
-                "model_used": self.model_name,
+                # Models that actually served each step, after routing
+                # and fallback
+                "models_used": {
+                    step: entry["models"]
+                    for step, entry in self.cost_tracker.get_summary()[
+                        "by_step"
+                    ].items()
+                },
             }
 
             logger.info(f"Report generation complete for {company_name}")
@@ -103,21 +115,92 @@ class WriterAgent(BaseAgent):
             logger.error(f"Report generation failed for {company_name}: {e}")
             raise
 
-    async def _write_executive_summary(
+    def project_cost(
         self,
+        research_data: ResearchOutput,
+        analysis_data: Optional[AnalysisOutput] = None,
+    ) -> float:
+        """
+        Project the cost of writing the report before running it.
+
+        Args:
+            research_data: Output from ResearchAgent
+            analysis_data: Output from AnalysisAgent (None if analysis has
+                not run yet; its expected output sizes are used instead)
+
+        Returns:
+            Projected cost of both writer calls in USD
+        """
+        company_name = research_data.get("company_name")
+        pending_analysis = 0
+        if analysis_data is None:
+            analysis_data = {
+                "company_name": company_name or "",
+                "swot": "",
+                "competitive_matrix": "",
+                "positioning": "",
+                "strategic_recommendations": "",
+            }
+            pending_analysis = sum(
+                self.output_model.expected(step)
+                for step in ("swot", "competitive_matrix", "positioning")
+            ) + self.output_model.expected("recommendations")
+        context = self._report_context(research_data, analysis_data)
+
+        exec_messages = self._create_messages(
+            WRITER_EXECUTIVE_SUMMARY.format(company_name=company_name),
+            shared_context=context,
+        )
+        report_messages = self._create_messages(
+            WRITER_FULL_REPORT.format(
+                company_name=company_name, exec_summary="", date=""
+            ),
+            shared_context=context,
+        )
+        return self._project_call_cost(
+            exec_messages, "executive_summary", pending_analysis
+        ) + self._project_call_cost(
+            report_messages,
+            "full_report",
+            pending_analysis + self.output_model.expected("executive_summary"),
+        )
+
+    @staticmethod
+    def _report_context(
         research_data: ResearchOutput,
         analysis_data: AnalysisOutput,
     ) -> str:
-        """Write executive summary (200-300 words)."""
-        user_message = WRITER_EXECUTIVE_SUMMARY.format(
+        """Research and analysis shared by both writer calls (cacheable prefix)."""
+        return WRITER_REPORT_CONTEXT.format(
             company_name=research_data.get("company_name"),
             company_overview=research_data.get("company_overview", ""),
+            competitors=research_data.get("competitors", ""),
+            competitive_matrix=analysis_data.get("competitive_matrix", ""),
             swot=analysis_data.get("swot", ""),
+            positioning=analysis_data.get("positioning", ""),
+            market_trends=research_data.get("market_trends", ""),
             strategic_recommendations=analysis_data.get(
                 "strategic_recommendations", ""
             ),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+
+    async def _write_executive_summary(
+        self,
+        research_data: ResearchOutput,
+        analysis_data: AnalysisOutput,
+    ) -> str:
+        """Write executive summary (200-300 words)."""
+        user_message = WRITER_EXECUTIVE_SUMMARY.format(
+            company_name=research_data.get("company_name"),
+        )
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message,
+                shared_context=self._report_context(research_data, analysis_data),
+            ),
+            step="executive_summary",
+            entity=research_data.get("company_name"),
+        )
 
     async def _write_full_report(
         self,
@@ -131,15 +214,13 @@ class WriterAgent(BaseAgent):
         user_message = WRITER_FULL_REPORT.format(
             company_name=company_name,
             exec_summary=exec_summary,
-            company_overview=research_data.get("company_overview", ""),
-            competitors=research_data.get("competitors", ""),
-            competitive_matrix=analysis_data.get("competitive_matrix", ""),
-            swot=analysis_data.get("swot", ""),
-            positioning=analysis_data.get("positioning", ""),
-            market_trends=research_data.get("market_trends", ""),
-            strategic_recommendations=analysis_data.get(
-                "strategic_recommendations", ""
-            ),
             date=datetime.now().strftime("%B %d, %Y"),
         )
-        return await self._invoke_llm(self._create_messages(user_message))
+        return await self._invoke_llm(
+            self._create_messages(
+                user_message,
+                shared_context=self._report_context(research_data, analysis_data),
+            ),
+            step="full_report",
+            entity=research_data.get("company_name"),
+        )
@@ -1,23 +1,54 @@
 """FastAPI application for Market Intelligence API."""
 
+import json
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.api.schemas import (
+    AliasRequest,
     AnalysisRequest,
     AnalysisResponse,
     StatusResponse,
     HistoryResponse,
     HistoryItem,
 )
+from src.tools.entity_resolver import EntityResolver
+from src.tools.backends import TAVILY_API_URL, tavily_http_client
 from src.workflows.market_analysis import MarketIntelligenceWorkflow
+from src.utils.config import get_settings
+from src.utils.http_clients import aclose_http_clients, get_http_client, warm_up
 from src.utils.logging import setup_logger
+from src.utils.model_health import get_fallback_router
+from src.utils.rate_limiter import get_model_limiter_stats
+from src.utils.streaming import StreamBufferStore
 
 logger = setup_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the shared HTTP pools on startup and close them on shutdown."""
+    settings = get_settings()
+    stream_buffers.ttl_seconds = settings.stream_buffer_ttl_seconds
+    if settings.http_warmup_enabled:
+        await warm_up(
+            {
+                settings.openrouter_base_url: get_http_client("llm"),
+                TAVILY_API_URL: tavily_http_client(
+                    settings.tavily_api_key,
+                    settings.tavily_http_proxy,
+                    settings.tavily_https_proxy,
+                ),
+            }
+        )
+    yield
+    await aclose_http_clients()
+
+
 # API application
 app = FastAPI(
     title="Market Intelligence API",
@@ -25,6 +56,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -39,6 +71,9 @@ app.add_middleware(
 # In-memory storage (replace with database in production)
 analysis_store: dict[str, dict] = {}
 
+# Streamed LLM output per run, served by /stream/{run_id} until it expires
+stream_buffers = StreamBufferStore()
+
 
 @app.get("/")
 async def root():
@@ -67,7 +102,20 @@ async def run_analysis_task(run_id: str, request: AnalysisRequest):
         logger.info(f"Starting analysis {run_id} for {request.company_name}")
 
         # Create workflow
-        workflow = MarketIntelligenceWorkflow(max_budget=request.max_budget)
+        workflow = MarketIntelligenceWorkflow(
+            max_budget=request.max_budget,
+            model_name=request.model,
+            model_routes=(
+                {
+                    step: route.model_dump()
+                    for step, route in request.model_routes.items()
+                }
+                if request.model_routes
+                else None
+            ),
+            refresh_sources=request.refresh_sources,
+        )
+        workflow.add_stream_callback(stream_buffers.open(run_id))
 
         # Run analysis
         result = await workflow.run(
@@ -84,6 +132,7 @@ async def run_analysis_task(run_id: str, request: AnalysisRequest):
                 "full_report": result.get("full_report"),
                 "total_cost": result.get("total_cost", 0.0),
                 "total_tokens": result.get("total_tokens", 0),
+                "cost_by_step": result.get("cost_by_step", {}),
                 "sources_count": len(result.get("raw_sources", [])),
                 "errors": result.get("errors", []),
                 "approved": result.get("approved", False),
@@ -103,6 +152,9 @@ async def run_analysis_task(run_id: str, request: AnalysisRequest):
             }
         )
 
+    finally:
+        stream_buffers.open(run_id).close()
+
 
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_company(request: AnalysisRequest, background_tasks: BackgroundTasks):
@@ -120,6 +172,7 @@ async def analyze_company(request: AnalysisRequest, background_tasks: Background
         "company_name": request.company_name,
         "industry": request.industry,
         "model": request.model,
+        "model_routes": request.model_dump()["model_routes"],
         "max_budget": request.max_budget,
         "status": "pending",
         "created_at": datetime.now().isoformat(),
@@ -132,6 +185,8 @@ async def analyze_company(request: AnalysisRequest, background_tasks: Background
         "approved": False,
     }
 
+    stream_buffers.open(run_id)
+
     # Start analysis in background
     background_tasks.add_task(run_analysis_task, run_id, request)
 
@@ -175,6 +230,34 @@ async def get_status(run_id: str):
     )
 
 
+@app.get("/stream/{run_id}")
+async def stream_output(run_id: str, start: int = 0):
+    """
+    Stream LLM output of an analysis as server-sent events.
+
+    Each event carries one chunk as JSON (agent, call_id, text, reset).
+    A reset event means the call's attempt failed and is being retried:
+    discard the text received so far for that call_id. Pass `start` to
+    resume after the chunks already received.
+    """
+    buffer = stream_buffers.get(run_id)
+    if buffer is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    async def events():
+        async for chunk in buffer.subscribe(start):
+            payload = {
+                "agent": chunk.agent,
+                "call_id": chunk.call_id,
+                "text": chunk.text,
+                "reset": chunk.reset,
+            }
+            yield f"data: {json.dumps(payload)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.get("/result/{run_id}", response_model=AnalysisResponse)
 async def get_result(run_id: str):
     """
@@ -194,6 +277,61 @@ async def get_result(run_id: str):
     return AnalysisResponse(**analysis)
 
 
+@app.get("/concurrency")
+async def get_concurrency():
+    """
+    Get the adaptive LLM concurrency window of each model in use.
+    """
+    return {"models": get_model_limiter_stats()}
+
+
+@app.get("/routing")
+async def get_routing():
+    """
+    Get rolling p50/p95 latency and error rate per model, and where each
+    model with a fallback chain is currently routed.
+    """
+    return get_fallback_router().get_stats()
+
+
+def _entity_resolver() -> EntityResolver:
+    """Open the configured company alias table."""
+    settings = get_settings()
+    return EntityResolver(
+        settings.entity_alias_path, fuzzy_threshold=settings.entity_fuzzy_threshold
+    )
+
+
+@app.get("/aliases")
+async def list_aliases():
+    """
+    Get learned company aliases (normalized alias -> canonical name).
+    """
+    return {"aliases": _entity_resolver().list_aliases()}
+
+
+@app.put("/aliases")
+async def add_alias(request: AliasRequest):
+    """
+    Confirm an alias, e.g. a prefix or fuzzy match seen in the logs.
+    """
+    try:
+        _entity_resolver().add_alias(request.name, request.canonical)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"name": request.name, "canonical": request.canonical}
+
+
+@app.delete("/aliases/{name}")
+async def remove_alias(name: str):
+    """
+    Remove a learned alias.
+    """
+    if not _entity_resolver().remove_alias(name):
+        raise HTTPException(status_code=404, detail="Alias not found")
+    return {"removed": name}
+
+
 @app.get("/history", response_model=HistoryResponse)
 async def get_history(limit: int = 10, offset: int = 0):
     """
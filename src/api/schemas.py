@@ -1,7 +1,18 @@
 """Pydantic schemas for API request/response models."""
 
 from typing import Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from src.utils.model_routing import parse_routes
+
+
+class StepRouteRequest(BaseModel):
+    """Model and temperature override for one prompt step."""
+
+    model: str | None = Field(None, description="LLM model for this step")
+    temperature: float | None = Field(
+        None, ge=0.0, le=2.0, description="Sampling temperature for this step"
+    )
 
 
 class AnalysisRequest(BaseModel):
@@ -36,6 +47,36 @@ class AnalysisRequest(BaseModel):
         default=2.0, ge=0.0, le=10.0, description="Maximum cost in USD"
     )
 
+    model_routes: dict[str, StepRouteRequest] | None = Field(
+        default=None,
+        description="Per-step model/temperature overrides (unrouted steps use model)",
+        examples=[
+            {
+                "research_company": {"model": "openai/gpt-5-mini"},
+                "full_report": {
+                    "model": "anthropic/claude-sonnet-4.5",
+                    "temperature": 0.6,
+                },
+            }
+        ],
+    )
+
+    refresh_sources: bool = Field(
+        default=False,
+        description="Search the web for every topic even when locally indexed "
+        "sources cover it",
+    )
+
+    @field_validator("model_routes")
+    @classmethod
+    def check_route_steps(
+        cls, routes: dict[str, StepRouteRequest] | None
+    ) -> dict[str, StepRouteRequest] | None:
+        """Reject routes for steps the workflow does not have."""
+        if routes:
+            parse_routes({step: route.model_dump() for step, route in routes.items()})
+        return routes
+
 
 class AnalysisResponse(BaseModel):
     """Response from analysis endpoint."""
@@ -53,6 +94,9 @@ class AnalysisResponse(BaseModel):
     # Metadata
     total_cost: float = Field(default=0.0, description="Total cost in USD")
     total_tokens: int = Field(default=0, description="Total tokens used")
+    cost_by_step: dict[str, dict] = Field(
+        default_factory=dict, description="Models, cost and latency per prompt step"
+    )
     sources_count: int = Field(default=0, description="Number of sources processed")
 
     # Errors
@@ -88,3 +132,10 @@ class HistoryResponse(BaseModel):
 
     analyses: list[HistoryItem]
     total: int
+
+
+class AliasRequest(BaseModel):
+    """Confirm a company alias so it resolves to a canonical name."""
+
+    name: str = Field(..., min_length=1, max_length=200, examples=["Tesla Model Y"])
+    canonical: str = Field(..., min_length=1, max_length=200, examples=["Tesla"])
@@ -0,0 +1,459 @@
+"""Pluggable search backends behind TavilySearchTool."""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+from tavily import AsyncTavilyClient  # type: ignore[import-untyped]
+
+from src.tools.search_cache import SearchCache
+from src.utils.config import Settings
+from src.utils.http_clients import BorrowedClient, get_http_client
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SearchBackend(ABC):
+    """
+    Base class for search providers.
+
+    Every backend returns Tavily-shaped responses (``query``, ``results``
+    with ``title``/``url``/``content``/``score``, optional ``answer``) so
+    the rest of the pipeline is provider-agnostic.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Run a search.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+            search_depth: "basic" or "advanced"
+            include_domains: Optional list of domains to include
+            exclude_domains: Optional list of domains to exclude
+
+        Returns:
+            Tavily-shaped search response
+        """
+        pass
+
+
+TAVILY_API_URL = "https://api.tavily.com"
+
+
+def tavily_http_client(
+    api_key: str,
+    http_proxy: Optional[str] = None,
+    https_proxy: Optional[str] = None,
+) -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client for Tavily requests made with an API key.
+
+    Args:
+        api_key: Tavily API key
+        http_proxy: Proxy for http:// requests (TAVILY_HTTP_PROXY)
+        https_proxy: Proxy for https:// requests (TAVILY_HTTPS_PROXY)
+
+    Returns:
+        Shared httpx.AsyncClient with Tavily's base URL, auth headers and
+        proxy transports
+    """
+    proxies = {"http://": http_proxy, "https://": https_proxy}
+    mounts: Optional[Dict[str, httpx.AsyncBaseTransport]] = {
+        scheme: httpx.AsyncHTTPTransport(proxy=proxy)
+        for scheme, proxy in proxies.items()
+        if proxy
+    } or None
+    key_id = hashlib.sha256(
+        f"{api_key}|{http_proxy}|{https_proxy}".encode("utf-8")
+    ).hexdigest()[:12]
+    return get_http_client(
+        f"tavily:{key_id}",
+        base_url=TAVILY_API_URL,
+        mounts=mounts,
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+            "X-Client-Source": "tavily-python",
+        },
+    )
+
+
+class TavilyBackend(SearchBackend):
+    """Tavily search via the native async client."""
+
+    name = "tavily"
+
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[AsyncTavilyClient] = None,
+        http_proxy: Optional[str] = None,
+        https_proxy: Optional[str] = None,
+    ):
+        """
+        Initialize Tavily backend.
+
+        Args:
+            api_key: Tavily API key
+            client: Optional pre-built async client
+            http_proxy: Proxy for http:// requests
+            https_proxy: Proxy for https:// requests
+        """
+        if client is None:
+            proxies = {"http": http_proxy, "https": https_proxy}
+            client = AsyncTavilyClient(
+                api_key=api_key,
+                proxies={k: v for k, v in proxies.items() if v},
+                api_base_url=TAVILY_API_URL,
+            )
+            # The SDK opens and closes an httpx client per request; lend it
+            # the shared keep-alive pool instead. This hook is private to
+            # the pinned tavily-python version, so fall back to the SDK's
+            # own clients if it disappears.
+            if hasattr(client, "_client_creator"):
+                client._client_creator = lambda: BorrowedClient(
+                    tavily_http_client(api_key, http_proxy, https_proxy)
+                )
+            else:
+                logger.warning(
+                    "tavily-python no longer exposes _client_creator; "
+                    "Tavily requests will not use the shared connection pool"
+                )
+        self.client = client
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> Dict:
+        """Run a Tavily search."""
+        return await self.client.search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+        )
+
+
+class BraveBackend(SearchBackend):
+    """Brave Search web API, mapped onto Tavily's response shape."""
+
+    name = "brave"
+    BASE_URL = "https://api.search.brave.com/res/v1/web/search"
+
+    def __init__(self, api_key: str, timeout: float = 30.0):
+        """
+        Initialize Brave backend.
+
+        Args:
+            api_key: Brave Search API key
+            timeout: Request timeout in seconds
+        """
+        self.api_key = api_key
+        self.timeout = timeout
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> Dict:
+        """Run a Brave search (search_depth has no Brave equivalent)."""
+        # Domain filters map onto Brave's query operators
+        terms = [query]
+        if include_domains:
+            terms.append("(" + " OR ".join(f"site:{d}" for d in include_domains) + ")")
+        terms.extend(f"-site:{d}" for d in exclude_domains or [])
+
+        response = await get_http_client("brave").get(
+            self.BASE_URL,
+            params={"q": " ".join(terms), "count": min(max_results, 20)},
+            headers={
+                "Accept": "application/json",
+                "X-Subscription-Token": self.api_key,
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        web_results = data.get("web", {}).get("results", [])[:max_results]
+        count = len(web_results)
+
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": r.get("title", ""),
+                    "url": r.get("url", ""),
+                    "content": r.get("description", ""),
+                    # Brave has no relevance score; derive one from rank
+                    "score": round(1.0 - i / count, 4),
+                }
+                for i, r in enumerate(web_results)
+            ],
+        }
+
+
+class FixtureBackend(SearchBackend):
+    """
+    Offline replay provider backed by JSON fixture files.
+
+    Each response is stored as ``<cache key>.json`` in a directory. With
+    ``record_from`` set, misses are fetched from that backend and saved,
+    so a live session can be recorded once and replayed for benchmarks.
+    """
+
+    name = "fixture"
+
+    def __init__(
+        self,
+        path: str = "./data/search_fixtures",
+        latency: float = 0.0,
+        record_from: Optional[SearchBackend] = None,
+    ):
+        """
+        Initialize fixture backend.
+
+        Args:
+            path: Directory holding fixture files
+            latency: Simulated upstream latency in seconds
+            record_from: Optional backend used to record missing fixtures
+        """
+        self.path = Path(path)
+        self.latency = latency
+        self.record_from = record_from
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> Dict:
+        """Replay (or record) a search response."""
+        key = SearchCache.make_key(
+            query, max_results, search_depth, include_domains, exclude_domains
+        )
+        fixture = self.path / f"{key}.json"
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if fixture.exists():
+            return json.loads(fixture.read_text(encoding="utf-8"))
+
+        if self.record_from is None:
+            logger.warning(f"No search fixture for: {query}")
+            return {"query": query, "results": []}
+
+        response = await self.record_from.search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+        )
+        self.path.mkdir(parents=True, exist_ok=True)
+        fixture.write_text(json.dumps(response, indent=2), encoding="utf-8")
+        logger.info(f"Recorded search fixture for: {query}")
+
+        return response
+
+
+class HedgedBackend(SearchBackend):
+    """
+    Fire a second backend when the first is slow or fails.
+
+    The hedge delay is the primary's rolling p95 latency, so only the
+    slowest ~5% of requests pay for a second search. Until enough samples
+    exist, a fixed initial delay is used.
+    """
+
+    def __init__(
+        self,
+        primary: SearchBackend,
+        secondary: SearchBackend,
+        initial_delay: float = 2.0,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        """
+        Initialize hedged backend.
+
+        Args:
+            primary: Backend tried first
+            secondary: Backend fired as the hedge
+            initial_delay: Hedge delay before enough latency samples exist
+            min_samples: Samples required before using the p95
+            window: Number of recent primary latencies kept
+        """
+        self.name = f"{primary.name}+{secondary.name}"
+        self.primary = primary
+        self.secondary = secondary
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    @property
+    def hedge_delay(self) -> float:
+        """Current hedge delay (p95 of primary latency)."""
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    async def _timed_primary(self, hedge_delay: float, **kwargs) -> Dict:
+        """
+        Run the primary search and record its latency.
+
+        Failed and cancelled searches are recorded too, so slow requests
+        that lose to the hedge still push the p95 up. A cancelled search
+        counts as at least the hedge delay it outlived.
+
+        Args:
+            hedge_delay: Hedge delay in effect when the search started
+            **kwargs: Search arguments
+        """
+        start = time.perf_counter()
+        cancelled = False
+        try:
+            return await self.primary.search(**kwargs)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._latencies.append(max(elapsed, hedge_delay) if cancelled else elapsed)
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> Dict:
+        """Search the primary, hedging to the secondary after the delay."""
+        kwargs: Dict[str, Any] = {
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+        }
+        hedge_delay = self.hedge_delay
+        primary = asyncio.create_task(self._timed_primary(hedge_delay, **kwargs))
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if primary in done and primary.exception() is None:
+            return primary.result()
+
+        if primary in done:
+            logger.warning(
+                f"{self.primary.name} search failed, failing over to "
+                f"{self.secondary.name}: {primary.exception()}"
+            )
+        else:
+            logger.info(
+                f"{self.primary.name} search slower than "
+                f"{hedge_delay:.2f}s, hedging to {self.secondary.name}"
+            )
+        self.hedges_fired += 1
+
+        secondary = asyncio.create_task(self.secondary.search(**kwargs))
+        pending = {primary, secondary} - done
+        last_error: Optional[BaseException] = primary.exception() if done else None
+
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self.hedges_won += 1
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            # Wait for the loser to unwind so its latency is recorded and
+            # no task outlives the call
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        assert last_error is not None
+        raise last_error
+
+    def get_stats(self) -> Dict:
+        """
+        Get hedging statistics.
+
+        Returns:
+            Dictionary with current delay and hedge counters
+        """
+        return {
+            "hedge_delay": round(self.hedge_delay, 4),
+            "samples": len(self._latencies),
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+        }
+
+
+def create_backend(name: str, settings: Settings) -> SearchBackend:
+    """
+    Build a search backend by name.
+
+    Args:
+        name: "tavily", "brave" or "fixture"
+        settings: Application settings
+
+    Returns:
+        Configured backend
+
+    Raises:
+        ValueError: If the name is unknown or its API key is missing
+    """
+    if name == "tavily":
+        return TavilyBackend(
+            api_key=settings.tavily_api_key,
+            http_proxy=settings.tavily_http_proxy,
+            https_proxy=settings.tavily_https_proxy,
+        )
+    if name == "brave":
+        if not settings.brave_search_api_key:
+            raise ValueError("BRAVE_SEARCH_API_KEY is required for Brave search")
+        return BraveBackend(api_key=settings.brave_search_api_key)
+    if name == "fixture":
+        return FixtureBackend(path=settings.search_fixture_path)
+    raise ValueError(f"Unknown search backend: {name}")
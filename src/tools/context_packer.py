@@ -0,0 +1,138 @@
+"""Token-budgeted packing of search results into LLM context."""
+
+import re
+from typing import Dict, List, Tuple
+
+from src.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# A source gets at least this many content tokens or is dropped entirely
+MIN_TOKENS_PER_SOURCE = 40
+
+# Start of a "[n] Title" source block in formatted context
+_SOURCE_BLOCK_RE = re.compile(r"(?m)^(?=\[\d+\] )")
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to roughly max_tokens, cutting at a word boundary.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token limit
+
+    Returns:
+        Original text if it fits, otherwise a truncated copy ending in "..."
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    cut = text[: max(0, max_tokens * CHARS_PER_TOKEN - 3)]
+    if " " in cut:
+        cut = cut[: cut.rfind(" ")]
+    return cut.rstrip() + "..."
+
+
+def pack_results(
+    results: List[Dict],
+    token_budget: int,
+    header_tokens: List[int],
+    min_tokens_per_source: int = MIN_TOKENS_PER_SOURCE,
+) -> Tuple[Dict[int, str], int]:
+    """
+    Fit result contents into a token budget.
+
+    Results are ranked by Tavily score; the lowest-ranked are dropped when
+    the budget cannot give every source a minimum share. The remaining
+    content budget is split max-min fairly, so short sources keep their
+    full text and long ones share what is left equally.
+
+    Args:
+        results: Search results in citation order
+        token_budget: Total tokens available for these results
+        header_tokens: Tokens used by each result's title/URL header
+        min_tokens_per_source: Minimum content tokens per kept source
+
+    Returns:
+        Tuple of (citation index -> packed content, content tokens dropped)
+    """
+    content_tokens = [estimate_tokens(r.get("content", "")) for r in results]
+    ranked = sorted(
+        range(len(results)), key=lambda i: results[i].get("score", 0), reverse=True
+    )
+
+    # Keep the highest-ranked sources that can each get a minimum share
+    kept: List[int] = []
+    used = 0
+    for i in ranked:
+        cost = header_tokens[i] + min(content_tokens[i], min_tokens_per_source)
+        if used + cost > token_budget:
+            break
+        kept.append(i)
+        used += cost
+
+    # Water-fill the content budget, smallest sources first
+    remaining = token_budget - sum(header_tokens[i] for i in kept)
+    shares: Dict[int, int] = {}
+    for n, i in enumerate(sorted(kept, key=lambda i: content_tokens[i])):
+        fair_share = remaining // (len(kept) - n)
+        shares[i] = min(content_tokens[i], fair_share)
+        remaining -= shares[i]
+
+    packed = {
+        i: truncate_to_tokens(results[i].get("content", ""), shares[i])
+        for i in sorted(kept)
+    }
+    dropped = sum(content_tokens) - sum(estimate_tokens(c) for c in packed.values())
+
+    return packed, max(0, dropped)
+
+
+def split_context(context: str, max_tokens: int) -> List[str]:
+    """
+    Split formatted search context into chunks of roughly max_tokens.
+
+    Chunks break between ``[n]`` source blocks. A block larger than
+    max_tokens is split by words, and each continuation piece repeats the
+    block's first line so its citation number is not lost.
+
+    Args:
+        context: Output of format_results_for_llm()
+        max_tokens: Token limit per chunk
+
+    Returns:
+        List of context chunks in original order
+    """
+    pieces: List[str] = []
+    for block in _SOURCE_BLOCK_RE.split(context):
+        if not block.strip():
+            continue
+        if estimate_tokens(block) <= max_tokens:
+            pieces.append(block)
+            continue
+
+        first_line = block.split("\n", 1)[0]
+        header = f"{first_line} (cont.)\n"
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        words = block.split(" ")
+        start = 0
+        while start < len(words):
+            prefix = header if start else ""
+            length = len(prefix)
+            end = start
+            while end < len(words) and (
+                end == start or length + len(words[end]) + 1 <= max_chars
+            ):
+                length += len(words[end]) + 1
+                end += 1
+            piece = " ".join(words[start:end])
+            if piece.strip():
+                pieces.append(prefix + piece)
+            start = end
+
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and estimate_tokens(chunks[-1] + piece) <= max_tokens:
+            chunks[-1] += piece
+        else:
+            chunks.append(piece)
+    return chunks
@@ -0,0 +1,195 @@
+"""Source deduplication across search responses."""
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.utils.logging import setup_logger
+from src.utils.tokens import estimate_tokens
+
+logger = setup_logger(__name__)
+
+# Mersenne prime used for MinHash universal hashing
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TRACKING_PARAMS = {"ref", "fbclid", "gclid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different links compare equal.
+
+    Lowercases scheme and host, drops "www.", fragments, tracking
+    parameters and trailing slashes.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query)
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        )
+    )
+    path = parts.path.rstrip("/")
+
+    return urlunsplit((parts.scheme.lower(), host, path, query, ""))
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase text and collapse punctuation and whitespace."""
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+
+class SourceDeduplicator:
+    """
+    Remove repeated sources across the searches of a research run.
+
+    Exact duplicates are caught by normalized URL and content hash.
+    Near-duplicates (syndicated or lightly edited copies) are caught by
+    comparing MinHash signatures of word shingles.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        num_perm: int = 64,
+        shingle_size: int = 5,
+    ):
+        """
+        Initialize deduplicator.
+
+        Args:
+            similarity_threshold: Estimated Jaccard similarity above which
+                two sources count as near-duplicates
+            num_perm: Number of MinHash permutations
+            shingle_size: Words per shingle
+        """
+        self.similarity_threshold = similarity_threshold
+        self.shingle_size = shingle_size
+
+        rng = random.Random(1)  # Fixed seed keeps signatures deterministic
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        self._urls: Set[str] = set()
+        self._hashes: Set[str] = set()
+        self._signatures: List[List[int]] = []
+
+        self.kept = 0
+        self.removed = 0
+        self.tokens_saved = 0
+
+    def _signature(self, text: str) -> Optional[List[int]]:
+        """Compute the MinHash signature of a text's word shingles."""
+        words = text.split()
+        if not words:
+            return None
+
+        size = min(self.shingle_size, len(words))
+        shingles = {
+            int.from_bytes(
+                hashlib.blake2b(
+                    " ".join(words[i : i + size]).encode("utf-8"), digest_size=4
+                ).digest(),
+                "big",
+            )
+            for i in range(len(words) - size + 1)
+        }
+
+        return [
+            min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+            for a, b in self._perms
+        ]
+
+    def _is_near_duplicate(self, signature: List[int]) -> bool:
+        """Check a signature against all kept sources."""
+        num_perm = len(signature)
+        for kept in self._signatures:
+            matches = sum(1 for x, y in zip(signature, kept) if x == y)
+            if matches / num_perm >= self.similarity_threshold:
+                return True
+        return False
+
+    def is_duplicate(self, result: Dict) -> bool:
+        """
+        Check a search result and remember it if it is new.
+
+        Args:
+            result: Single search result dict
+
+        Returns:
+            True if the result repeats a source already seen
+        """
+        url = normalize_url(result.get("url", ""))
+        text = _normalize_text(result.get("content", ""))
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        if url and url in self._urls:
+            return True
+        if text and content_hash in self._hashes:
+            return True
+
+        signature = self._signature(text)
+        if signature is not None and self._is_near_duplicate(signature):
+            return True
+
+        if url:
+            self._urls.add(url)
+        if text:
+            self._hashes.add(content_hash)
+        if signature is not None:
+            self._signatures.append(signature)
+
+        return False
+
+    def filter_response(self, search_response: Dict) -> Dict:
+        """
+        Drop results already seen in this or earlier responses.
+
+        Args:
+            search_response: Tavily search response
+
+        Returns:
+            Copy of the response with only novel results
+        """
+        kept = []
+        for result in search_response.get("results", []):
+            if self.is_duplicate(result):
+                logger.debug(f"Dropped duplicate source: {result.get('url', '')}")
+                self.removed += 1
+                self.tokens_saved += estimate_tokens(
+                    result.get("title", "") + result.get("content", "")
+                )
+            else:
+                self.kept += 1
+                kept.append(result)
+
+        return {**search_response, "results": kept}
+
+    def get_stats(self) -> Dict:
+        """
+        Get deduplication statistics.
+
+        Returns:
+            Dictionary with kept/removed counts and estimated tokens saved
+        """
+        return {
+            "kept": self.kept,
+            "removed": self.removed,
+            "tokens_saved": self.tokens_saved,
+        }
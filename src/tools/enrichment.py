@@ -0,0 +1,317 @@
+"""Full-page content enrichment for top search results.
+
+Search APIs return short snippets, which often miss the figures the
+analysis prompts ask for. The enricher fetches the top results' pages
+concurrently, strips navigation and other boilerplate, and swaps the
+cleaned text in for the snippet before context packing.
+"""
+
+import asyncio
+import codecs
+import hashlib
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import DefaultDict, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.tools.dedup import normalize_url
+from src.tools.search_cache import SearchCache
+from src.utils.http_clients import get_http_client
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Elements whose text is never article content
+_SKIP_TAGS = frozenset(
+    "aside button footer form header iframe nav noscript script style svg template".split()
+)
+# Elements that end a line of text
+_BLOCK_TAGS = frozenset(
+    "article br dd div dt h1 h2 h3 h4 h5 h6 li main p section td th tr".split()
+)
+# Lines shorter than this are menus, buttons and bylines rather than prose
+_MIN_LINE_WORDS = 4
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text lines outside boilerplate elements."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+
+    def _flush(self) -> None:
+        line = " ".join(" ".join(self._current).split())
+        if line:
+            self.lines.append(line)
+        self._current = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._current.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def strip_boilerplate(html: str, max_chars: Optional[int] = None) -> str:
+    """
+    Extract the main text of an HTML page.
+
+    Drops scripts, styles, navigation, headers, footers and forms, then
+    short lines (menus, buttons) and repeated lines (cookie banners,
+    share widgets).
+
+    Args:
+        html: Page HTML
+        max_chars: Optional cap on the returned text length
+
+    Returns:
+        Cleaned text with one paragraph per line
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+
+    seen = set()
+    lines = []
+    for line in parser.lines:
+        if len(line.split()) < _MIN_LINE_WORDS or line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+
+    text = "\n".join(lines)
+    return text[:max_chars] if max_chars else text
+
+
+class PageEnricher:
+    """
+    Fetch and clean the pages behind top search results.
+
+    One async HTTP client is shared by all fetches of an enricher, with a
+    per-host connection limit so a single slow site cannot take the whole
+    pool. Cleaned text is cached by URL, and by a hash of the page body so
+    mirrored or unchanged pages are only cleaned once.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 3,
+        timeout: float = 10.0,
+        max_per_host: int = 2,
+        max_chars: int = 20000,
+        max_bytes: int = 2_000_000,
+        cache: Optional[SearchCache] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize page enricher.
+
+        Args:
+            top_k: Number of highest-scored results to enrich per response
+            timeout: Per-page fetch timeout in seconds
+            max_per_host: Concurrent connections allowed per host
+            max_chars: Maximum cleaned characters kept per page
+            max_bytes: Pages larger than this are skipped
+            cache: Optional cache for cleaned page text
+            client: Optional pre-built HTTP client (shared pool if None)
+        """
+        self.top_k = top_k
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self._client = client
+        self._host_slots: DefaultDict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+
+        self.fetched = 0
+        self.failed = 0
+        self.cache_hits = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pre-built client, or the process-wide page-fetch pool."""
+        if self._client is not None:
+            return self._client
+        return get_http_client(
+            "pages",
+            follow_redirects=True,
+            headers={"User-Agent": "MarketIntelligenceAgent/1.0"},
+        )
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        """Cache key for a page URL."""
+        return "url:" + hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+    async def _download(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Stream a page body, giving up on non-HTML and oversized pages.
+
+        The declared Content-Length is checked before reading, and reading
+        stops as soon as the body passes max_bytes, so an oversized page
+        costs at most max_bytes of transfer and memory.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Tuple of (body, text encoding), or None if the page was skipped
+
+        Raises:
+            httpx.HTTPError: On connection errors, timeouts and error statuses
+        """
+        async with self.client.stream("GET", url, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if "html" not in response.headers.get("content-type", "html"):
+                return None
+
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > self.max_bytes:
+                logger.debug(f"Skipping oversized page ({declared} bytes): {url}")
+                return None
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    logger.debug(f"Skipping oversized page: {url}")
+                    return None
+            encoding = response.charset_encoding or "utf-8"
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = "utf-8"  # Unknown charset label
+            return bytes(body), encoding
+
+    async def fetch_text(self, url: str) -> Optional[str]:
+        """
+        Fetch a page and return its cleaned text.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Cleaned text, or None if the page could not be used
+        """
+        url_key = self._url_key(url)
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, url_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached["text"]
+
+        try:
+            async with self._host_slots[urlsplit(url).netloc]:
+                page = await self._download(url)
+        except httpx.HTTPError as e:
+            self.failed += 1
+            logger.warning(f"Page fetch failed for {url}: {e!r}")
+            return None
+
+        self.fetched += 1
+        if page is None:
+            return None
+        content, encoding = page
+
+        body_key = "body:" + hashlib.sha256(content).hexdigest()
+        cached = (
+            await asyncio.to_thread(self.cache.get, body_key)
+            if self.cache is not None
+            else None
+        )
+        if cached is not None:
+            text = cached["text"]
+        else:
+            # Parsing up to max_bytes of HTML would stall other fetches
+            text = await asyncio.to_thread(
+                strip_boilerplate,
+                content.decode(encoding, errors="replace"),
+                self.max_chars,
+            )
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, body_key, {"text": text})
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, url_key, {"text": text})
+        return text
+
+    async def enrich(self, search_response: Dict) -> Dict:
+        """
+        Replace the snippets of the top-k results with full page text.
+
+        Pages that fail, time out or yield less text than the snippet keep
+        the snippet.
+
+        Args:
+            search_response: Tavily-shaped search response
+
+        Returns:
+            Copy of the response with enriched result contents
+        """
+        results = list(search_response.get("results", []))
+        ranked = sorted(
+            (
+                i
+                for i, r in enumerate(results)
+                if r.get("url", "").startswith(("http://", "https://"))
+            ),
+            key=lambda i: results[i].get("score", 0),
+            reverse=True,
+        )[: self.top_k]
+
+        texts = await asyncio.gather(
+            *(self.fetch_text(results[i]["url"]) for i in ranked)
+        )
+
+        enriched = 0
+        for i, text in zip(ranked, texts):
+            if text and len(text) > len(results[i].get("content", "")):
+                results[i] = {**results[i], "content": text, "enriched": True}
+                enriched += 1
+
+        logger.info(
+            f"Enriched {enriched}/{len(ranked)} top results with page content",
+            extra={"extra_fields": {"enrichment": self.get_stats()}},
+        )
+        return {**search_response, "results": results}
+
+    def get_stats(self) -> Dict:
+        """
+        Get enrichment statistics.
+
+        Returns:
+            Dictionary with fetch, failure and cache hit counts
+        """
+        return {
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "cache_hits": self.cache_hits,
+        }
+
+    async def aclose(self) -> None:
+        """Close a pre-built HTTP client (the shared pool stays open)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
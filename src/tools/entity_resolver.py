@@ -0,0 +1,262 @@
+"""Canonical company-name resolution.
+
+"Tesla", "Tesla Inc", "tesla motors" and "Tesla Model Y" should all research
+the same company, share search cache keys and produce the same report. The
+resolver maps a raw name onto a canonical one using, in order:
+
+1. an exact lookup of the normalized name in the alias table,
+2. the longest known name the input extends with a product or model
+   suffix ("Model Y", "Pro", "15"),
+3. fuzzy matching against known names (typos, spacing),
+
+and otherwise registers the name as a new canonical company. Prefix
+matches apply to the current run only. A fuzzy match is only reported:
+"Salesforge" is one letter from "Salesforce" but a different company, so
+the run keeps the name it was given. Either becomes a permanent alias
+once confirmed with ``add_alias``, so a wrong guess ("Delta
+Electronics" -> "Delta") is never written to disk or researched under
+another company's name. Learned aliases can be listed and removed.
+"""
+
+import difflib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Serializes table writes from every resolver in the process
+_save_lock = threading.Lock()
+
+# Legal-form suffixes that never distinguish two companies
+_LEGAL_SUFFIXES = frozenset(
+    "ag co company corp corporation gmbh holdings inc incorporated limited llc "
+    "ltd plc sa".split()
+)
+_PUNCT_RE = re.compile(r"[^\w\s&]+")
+
+# Words naming a product line or edition rather than a different company
+_PRODUCT_WORDS = frozenset(
+    "air edition gen generation lite max mini model plus pro series ultra "
+    "version".split()
+)
+# Model codes: "y", "3", "x5", "15", "v2.1"
+_MODEL_CODE_RE = re.compile(r"^(?:[a-z]|[a-z]{0,2}\d[\w.]*)$")
+
+# Well-known renames and legacy names; learned aliases are added on top
+DEFAULT_ALIASES: Dict[str, str] = {
+    "tesla motors": "Tesla",
+    "facebook": "Meta",
+    "meta platforms": "Meta",
+    "twitter": "X",
+}
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name to its lookup key.
+
+    Lowercases, drops punctuation and trailing legal-form suffixes
+    ("Inc", "Ltd", ...) and collapses whitespace.
+
+    Args:
+        name: Raw company name
+
+    Returns:
+        Normalized key (empty if nothing remains)
+    """
+    tokens = _PUNCT_RE.sub(" ", name.lower()).split()
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def _display_name(name: str) -> str:
+    """Strip legal-form suffixes from a name, keeping its original casing."""
+    words = name.replace(",", " ").split()
+    while len(words) > 1 and _PUNCT_RE.sub("", words[-1].lower()) in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words).strip(" .")
+
+
+def _is_product_suffix(tokens: list[str]) -> bool:
+    """Whether tokens after a known name describe a product or model."""
+    return all(t in _PRODUCT_WORDS or _MODEL_CODE_RE.match(t) for t in tokens)
+
+
+class EntityResolver:
+    """Persistent alias table mapping company names to canonical names."""
+
+    def __init__(
+        self,
+        path: str = "./data/entity_aliases.json",
+        fuzzy_threshold: float = 0.88,
+    ):
+        """
+        Load (or start) an alias table.
+
+        Args:
+            path: JSON file holding learned aliases
+            fuzzy_threshold: Similarity ratio (0-1) for fuzzy matches
+        """
+        self.path = Path(path)
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.Lock()
+
+        self.aliases: Dict[str, str] = dict(DEFAULT_ALIASES)
+        self.aliases.update(self._read())
+        # Changes made here since loading, merged into the file on save
+        self._added: Dict[str, str] = {}
+        self._removed: Set[str] = set()
+
+    def _read(self) -> Dict[str, str]:
+        """Read the learned aliases on disk."""
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _match(self, key: str) -> Tuple[str, str]:
+        """Find the canonical name for a key and how it was matched."""
+        if key in self.aliases:
+            return self.aliases[key], "exact"
+
+        # Longest known name the input extends with a product or model
+        # suffix: "tesla model y" -> "tesla", but not "delta electronics"
+        tokens = key.split()
+        for end in range(len(tokens) - 1, 0, -1):
+            prefix = " ".join(tokens[:end])
+            if prefix in self.aliases and _is_product_suffix(tokens[end:]):
+                return self.aliases[prefix], "prefix"
+
+        close = difflib.get_close_matches(
+            key, self.aliases, n=1, cutoff=self.fuzzy_threshold
+        )
+        if close:
+            return self.aliases[close[0]], "fuzzy"
+
+        return "", "new"
+
+    def resolve(self, name: str) -> str:
+        """
+        Resolve a company name to its canonical form.
+
+        New companies are added to the table and prefix matches are
+        returned without being saved. A fuzzy match is logged as a warning
+        and the given name is returned unchanged and unsaved; confirm
+        either kind of match with ``add_alias``.
+
+        Args:
+            name: Raw company name
+
+        Returns:
+            Canonical company name
+        """
+        key = normalize_company_name(name)
+        if not key:
+            return name.strip()
+
+        with self._lock:
+            canonical, how = self._match(key)
+            if how == "exact":
+                return canonical
+
+            if how == "new":
+                canonical = _display_name(name)
+                self._added[key] = canonical
+                self._save()
+
+        if how == "fuzzy":
+            logger.warning(
+                f"Company '{name}' looks like '{canonical}' but is researched "
+                "as given; confirm the alias to merge them",
+                extra={"extra_fields": {"company": name, "fuzzy_match": canonical}},
+            )
+            return name.strip()
+        if how == "prefix":
+            logger.info(
+                f"Resolved company '{name}' to '{canonical}' (prefix match, not saved)"
+            )
+        return canonical
+
+    def add_alias(self, name: str, canonical: str) -> None:
+        """
+        Save an alias, e.g. to confirm a prefix or fuzzy match.
+
+        Args:
+            name: Raw alias ("Tesla Model Y")
+            canonical: Canonical company name it should resolve to
+
+        Raises:
+            ValueError: If either name is empty after normalization
+        """
+        key = normalize_company_name(name)
+        canonical_key = normalize_company_name(canonical)
+        if not key or not canonical_key:
+            raise ValueError("Alias and canonical name must not be empty")
+
+        with self._lock:
+            self._added[key] = canonical
+            self._added.setdefault(canonical_key, canonical)
+            self._removed -= {key, canonical_key}
+            self._save()
+
+    def remove_alias(self, name: str) -> bool:
+        """
+        Remove a learned alias.
+
+        Args:
+            name: Alias to remove (raw or normalized)
+
+        Returns:
+            False if no learned alias matched
+        """
+        key = normalize_company_name(name)
+        with self._lock:
+            self.aliases.update(self._read())
+            if key not in self.list_aliases():
+                return False
+            self._added.pop(key, None)
+            self._removed.add(key)
+            self._save()
+        logger.info(f"Removed company alias '{key}'")
+        return True
+
+    def list_aliases(self) -> Dict[str, str]:
+        """
+        Get learned aliases (built-in defaults excluded).
+
+        Returns:
+            Mapping of normalized alias to canonical name
+        """
+        return {
+            key: canonical
+            for key, canonical in self.aliases.items()
+            if DEFAULT_ALIASES.get(key) != canonical
+        }
+
+    def _save(self) -> None:
+        """Apply this resolver's changes to the file and replace it atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with _save_lock:
+            # Keep aliases learned by other resolvers sharing the file
+            table = {**self._read(), **self._added}
+            for key in self._removed:
+                table.pop(key, None)
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(table, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+        self.aliases = {**DEFAULT_ALIASES, **table}
+        for key in self._removed:
+            self.aliases.pop(key, None)
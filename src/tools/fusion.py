@@ -0,0 +1,44 @@
+"""Rank fusion for merging results of several search queries."""
+
+from typing import Dict, List
+
+from src.tools.dedup import normalize_url
+
+# Standard RRF constant; damps the influence of top ranks in any one list
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Dict]],
+    top_k: int,
+    k: int = RRF_K,
+) -> List[Dict]:
+    """
+    Merge ranked result lists with reciprocal-rank fusion.
+
+    Each result scores sum(1 / (k + rank)) over the lists it appears in,
+    so sources found by several sub-queries rise to the top. Results are
+    matched by normalized URL; the first copy seen is kept, annotated
+    with ``rrf_score`` and the best Tavily ``score`` across lists.
+
+    Args:
+        result_lists: Result lists, each ordered best first
+        top_k: Number of fused results to return
+        k: RRF damping constant
+
+    Returns:
+        Fused results, best first
+    """
+    fused: Dict[str, Dict] = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            url = normalize_url(result.get("url", "")) or f"#{id(result)}"
+            if url not in fused:
+                fused[url] = {**result, "rrf_score": 0.0}
+            entry = fused[url]
+            entry["rrf_score"] += 1.0 / (k + rank)
+            entry["score"] = max(entry.get("score", 0), result.get("score", 0))
+
+    ranked = sorted(fused.values(), key=lambda r: r["rrf_score"], reverse=True)
+    return ranked[:top_k]
@@ -0,0 +1,51 @@
+"""Relevance-based cutoffs for search result lists."""
+
+from typing import Dict, List
+
+
+def relevance_cutoff(
+    results: List[Dict],
+    min_score: float,
+    plateau_delta: float = 0.02,
+    plateau_window: int = 3,
+    min_results: int = 2,
+    plateau_margin: float = 0.35,
+) -> int:
+    """
+    Find how many leading results are worth keeping.
+
+    Results are expected best first. The list is cut at the first result
+    scoring below min_score, or where the score curve goes flat (the last
+    plateau_window scores within plateau_delta of each other) in the
+    low-information band under min_score + plateau_margin, which marks a
+    tail of interchangeable weak hits. A flat run of strong results is kept.
+
+    Args:
+        results: Search results ordered by descending score
+        min_score: Minimum relevance score to keep a result
+        plateau_delta: Score spread under which the tail counts as flat
+        plateau_window: Number of consecutive scores checked for a plateau
+        min_results: Results always kept when available
+        plateau_margin: Height above min_score under which flat stretches
+            count as a tail
+
+    Returns:
+        Number of leading results to keep
+    """
+    scores = [r.get("score", 0.0) for r in results]
+
+    for i, score in enumerate(scores):
+        if i < min_results:
+            continue
+        if score < min_score:
+            return i
+        window = scores[i - plateau_window + 1 : i + 1]
+        if (
+            len(window) == plateau_window
+            and max(window) < min_score + plateau_margin
+            and max(window) - min(window) < plateau_delta
+        ):
+            # Keep the first result of the flat stretch, drop the rest
+            return max(min_results, i - plateau_window + 2)
+
+    return len(scores)
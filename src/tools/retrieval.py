@@ -0,0 +1,130 @@
+"""Chunk-level retrieval of search result passages for a prompt."""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.tools.wiki_index import tokenize
+
+# Separator between non-adjacent passages taken from the same source
+PASSAGE_SEPARATOR = " ... "
+
+
+def chunk_text(text: str, chunk_words: int = 90, overlap: int = 15) -> List[str]:
+    """
+    Split text into overlapping word windows.
+
+    Args:
+        text: Text to split
+        chunk_words: Words per chunk
+        overlap: Words shared by consecutive chunks
+
+    Returns:
+        List of chunks (a single chunk for short texts)
+    """
+    words = text.split()
+    if len(words) <= chunk_words:
+        return [text] if words else []
+
+    step = max(1, chunk_words - overlap)
+    return [
+        " ".join(words[start : start + chunk_words])
+        for start in range(0, len(words) - overlap, step)
+    ]
+
+
+def bm25_scores(
+    chunks: List[List[str]],
+    query_terms: List[str],
+    k1: float = 1.5,
+    b: float = 0.75,
+) -> np.ndarray:
+    """
+    Score tokenized chunks against query terms with vectorized BM25.
+
+    Term frequencies for all chunks are counted in a single bincount
+    over (chunk, term) pairs, then scored as one matrix expression.
+
+    Args:
+        chunks: Tokenized chunks
+        query_terms: Tokenized query
+        k1: BM25 term-frequency saturation
+        b: BM25 length normalization
+
+    Returns:
+        Array with one score per chunk
+    """
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(query_terms))}
+    if not chunks or not vocab:
+        return np.zeros(len(chunks))
+
+    doc_lengths = np.array([len(tokens) for tokens in chunks], dtype=np.float64)
+    pairs = np.array(
+        [
+            chunk_id * len(vocab) + vocab[token]
+            for chunk_id, tokens in enumerate(chunks)
+            for token in tokens
+            if token in vocab
+        ],
+        dtype=np.int64,
+    )
+    tf = np.bincount(pairs, minlength=len(chunks) * len(vocab)).reshape(
+        len(chunks), len(vocab)
+    )
+
+    n_chunks = len(chunks)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1.0 + (n_chunks - df + 0.5) / (df + 0.5))
+
+    avg_length = doc_lengths.mean() or 1.0
+    norm = k1 * (1.0 - b + b * doc_lengths / avg_length)
+    scores = idf * tf * (k1 + 1.0) / (tf + norm[:, None])
+
+    return scores.sum(axis=1)
+
+
+def retrieve_passages(
+    results: List[Dict],
+    intent: str,
+    top_k: int,
+    chunk_words: int = 90,
+) -> Dict[int, str]:
+    """
+    Select the passages of each source most relevant to a prompt intent.
+
+    Args:
+        results: Search results in citation order
+        intent: Description of what the prompt needs
+        top_k: Number of chunks to keep across all sources
+        chunk_words: Words per chunk
+
+    Returns:
+        Mapping of result index to its selected passages (in original
+        order, joined with PASSAGE_SEPARATOR); sources with no selected
+        chunk are omitted
+    """
+    spans: List[Tuple[int, int, str]] = []
+    for i, result in enumerate(results):
+        for position, chunk in enumerate(
+            chunk_text(result.get("content", ""), chunk_words=chunk_words)
+        ):
+            spans.append((i, position, chunk))
+
+    if not spans:
+        return {}
+
+    scores = bm25_scores([tokenize(chunk) for _, _, chunk in spans], tokenize(intent))
+
+    # Break ties with the source's own relevance score
+    tie_break = np.array([results[i].get("score", 0.0) for i, _, _ in spans]) * 1e-6
+    best = np.argsort(-(scores + tie_break), kind="stable")[:top_k]
+
+    selected: Dict[int, List[Tuple[int, str]]] = {}
+    for span_id in best:
+        i, position, chunk = spans[span_id]
+        selected.setdefault(i, []).append((position, chunk))
+
+    return {
+        i: PASSAGE_SEPARATOR.join(chunk for _, chunk in sorted(selected[i]))
+        for i in sorted(selected)
+    }
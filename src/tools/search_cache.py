@@ -0,0 +1,196 @@
+"""Persistent on-disk cache for search results."""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SearchCache:
+    """
+    SQLite-backed cache for search responses with TTL and LRU eviction.
+
+    Entries are stored on disk so they survive restarts and can be shared
+    by the API and UI processes. Each operation opens its own connection,
+    which keeps the cache safe to use from worker threads.
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/search_cache.db",
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 1000,
+    ):
+        """
+        Initialize search cache.
+
+        Args:
+            path: Path to SQLite cache database
+            ttl_seconds: Default time-to-live for new entries
+            max_entries: Maximum entries kept before LRU eviction
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_accessed "
+                "ON search_cache (last_accessed)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        query: str,
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Build a cache key from normalized search parameters.
+
+        Args:
+            query: Search query (case and whitespace are normalized)
+            max_results: Maximum number of results
+            search_depth: Search depth
+            include_domains: Optional domains to include
+            exclude_domains: Optional domains to exclude
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "query": re.sub(r"\s+", " ", query).strip().lower(),
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": sorted(d.lower() for d in include_domains or []),
+            "exclude_domains": sorted(d.lower() for d in exclude_domains or []),
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached response, refreshing its LRU position.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response, or None on miss or expiry
+        """
+        now = time.time()
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, expires_at FROM search_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE search_cache SET last_accessed = ? WHERE key = ?",
+                (now, key),
+            )
+
+        self.hits += 1
+        logger.debug(f"Search cache hit: {key[:12]}")
+        return json.loads(response)
+
+    def set(
+        self, key: str, response: Dict, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Store a response and evict least recently used entries over the cap.
+
+        Args:
+            key: Cache key from make_key()
+            response: Search response to store
+            ttl_seconds: Optional per-entry TTL (uses default if None)
+        """
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(key, response, expires_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now + ttl, now),
+            )
+            conn.execute(
+                """
+                DELETE FROM search_cache WHERE key IN (
+                    SELECT key FROM search_cache
+                    ORDER BY last_accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+    def __len__(self) -> int:
+        """Number of entries currently stored."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache hit/miss statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit rate and entry count
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,97 @@
+"""Single-flight coalescing of identical concurrent async calls."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight calls so only one reaches upstream.
+
+    The first caller for a key (the leader) runs the call; callers that
+    arrive while it is in flight await the leader's result instead. Both
+    results and errors are shared with every waiter. A cancelled leader's
+    cancellation is not: its waiters belong to other runs, so they retry,
+    one of them becoming the new leader.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[str, Tuple[asyncio.Future, str]] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        label: Optional[str] = None,
+    ) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Identity of the call (identical calls share a key)
+            fn: Zero-argument coroutine factory performing the call
+            label: Human-readable key name for stats and logs
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        while key in self._inflight:
+            future, _ = self._inflight[key]
+            self._waiters[key] += 1
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise  # This caller was cancelled, not the leader
+                logger.info(f"Leader cancelled, retrying: {label or key}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, label or key)
+        self._waiters[key] = 0
+        self.calls += 1
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody is waiting
+            raise
+        finally:
+            waiters = self._waiters.pop(key, 0)
+            del self._inflight[key]
+            if waiters:
+                logger.info(f"Coalesced {waiters} waiter(s) onto: {label or key}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with per-key waiter counts for calls in flight
+            and totals for upstream calls and coalesced callers
+        """
+        return {
+            "in_flight": {
+                label: self._waiters[key] for key, (_, label) in self._inflight.items()
+            },
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,60 @@
+"""Compact source records kept in workflow state."""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+@dataclass(slots=True)
+class Source:
+    """
+    A search result projected down to the fields the pipeline uses.
+
+    Slotted to avoid a per-instance __dict__, with URL and domain strings
+    interned so repeated hosts share memory. Checkpointers serialize it
+    as a plain field tuple instead of the full provider response.
+    """
+
+    title: str
+    url: str
+    domain: str
+    content: str
+    score: float
+
+    @classmethod
+    def from_result(cls, result: Dict) -> "Source":
+        """
+        Project a raw search result dict onto a Source.
+
+        Args:
+            result: Search result (Tavily-shaped)
+
+        Returns:
+            Source with unused provider fields dropped
+        """
+        url = result.get("url", "") or ""
+        domain = urlsplit(url).netloc.lower().removeprefix("www.")
+
+        return cls(
+            title=result.get("title", "") or "",
+            url=sys.intern(url),
+            domain=sys.intern(domain),
+            content=result.get("content", "") or "",
+            score=float(result.get("score", 0.0) or 0.0),
+        )
+
+    def to_dict(self) -> Dict:
+        """
+        Convert back to a result dict (e.g. for formatting or JSON APIs).
+
+        Returns:
+            Dictionary with title, url, domain, content and score
+        """
+        return {
+            "title": self.title,
+            "url": self.url,
+            "domain": self.domain,
+            "content": self.content,
+            "score": self.score,
+        }
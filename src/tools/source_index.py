@@ -0,0 +1,289 @@
+"""Local vector index of previously fetched sources.
+
+Every source a run pays to fetch is appended here so later runs can answer
+from disk before calling the search API. Texts are embedded with a
+hashing vectorizer (no vocabulary to store or fit) and kept as a float16
+matrix in a flat file opened with ``np.memmap``.
+
+Layout:
+    meta.json       vector dimension
+    vectors.f16     float16 matrix, one L2-normalized row per source
+    sources.jsonl   one JSON record (title, url, content, entity, fetched_at)
+                    per row
+
+Titles, entities and fetch times are also kept in memory, so searches
+filter candidates before reading any record from disk.
+
+Open indexes through ``get_source_index`` so every agent in the process
+shares one instance. Appends are serialized within the process, and an
+instance picks up rows appended by another one when the record file
+grows; concurrent writers in separate processes are not supported.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.tools.dedup import normalize_url
+from src.tools.wiki_index import hash_term, tokenize
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# One writer at a time per process, shared by every SourceIndex instance
+_write_lock = threading.Lock()
+
+_source_indexes: Dict[str, "SourceIndex"] = {}
+
+# Rows upcast to float32 at a time when scoring
+_SCORE_BLOCK_ROWS = 65536
+
+# Most similar rows examined by a search before giving up on filters
+_MAX_CANDIDATES = 1000
+
+
+def hash_vectorize(texts: List[str], dim: int) -> np.ndarray:
+    """
+    Embed texts with the signed hashing trick.
+
+    Args:
+        texts: Texts to embed
+        dim: Vector dimension
+
+    Returns:
+        float32 array of shape (len(texts), dim) with L2-normalized rows
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for term in tokenize(text):
+            h = hash_term(term)
+            vectors[row, h % dim] += 1.0 if (h >> 63) else -1.0
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class SourceIndex:
+    """Append-only, memory-mapped embedding index of sources."""
+
+    def __init__(self, path: str = "./data/source_index", dim: int = 2048):
+        """
+        Open (or create) a source index directory.
+
+        Args:
+            path: Index directory
+            dim: Vector dimension for a new index (an existing index
+                keeps the dimension it was built with)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            dim = json.loads(meta_path.read_text(encoding="utf-8"))["dim"]
+        else:
+            meta_path.write_text(json.dumps({"dim": dim}), encoding="utf-8")
+        self.dim: int = dim
+
+        self._vectors_path = self.path / "vectors.f16"
+        self._sources_path = self.path / "sources.jsonl"
+        self._vectors_path.touch()
+        self._sources_path.touch()
+
+        self._offsets: List[int] = []
+        self._urls: Set[str] = set()
+        self._labels: List[str] = []  # Lowercased "title entity" per row
+        self._fetched_at: List[float] = []
+        self._size = 0  # Bytes of the record file already loaded
+        self._load_records()
+        self._matrix: Optional[np.ndarray] = None
+
+    def _remember(self, offset: int, record: Dict) -> None:
+        """Keep a row's offset and filter metadata in memory."""
+        self._offsets.append(offset)
+        self._urls.add(normalize_url(record["url"]))
+        self._labels.append(f"{record['title']} {record.get('entity', '')}".lower())
+        # Sources indexed before fetch times were stored count as oldest
+        self._fetched_at.append(record.get("fetched_at", 0.0))
+
+    def _scan_records(self) -> None:
+        """Load complete records appended after the loaded ones."""
+        row_bytes = 2 * self.dim
+        vector_rows = self._vectors_path.stat().st_size // row_bytes
+        with open(self._sources_path, "rb") as f:
+            f.seek(self._size)
+            for line in f:
+                # Only rows whose record and vector are both written
+                if not line.endswith(b"\n") or len(self._offsets) >= vector_rows:
+                    break
+                record = json.loads(line)
+                self._remember(self._size, record)
+                self._size += len(line)
+
+    def _load_records(self) -> None:
+        """Scan the record file for byte offsets and known URLs."""
+        self._scan_records()
+
+        # Trim a half-written append so vectors and records line up again
+        os.truncate(self._vectors_path, len(self._offsets) * 2 * self.dim)
+        os.truncate(self._sources_path, self._size)
+
+    def _refresh(self) -> None:
+        """Pick up rows another instance appended since the last look."""
+        with _write_lock:
+            if self._sources_path.stat().st_size != self._size:
+                self._scan_records()
+
+    def __len__(self) -> int:
+        """Number of indexed sources."""
+        return len(self._offsets)
+
+    def _get_matrix(self) -> np.ndarray:
+        """Map the vector file, remapping after appends."""
+        if self._matrix is None or len(self._matrix) != len(self):
+            self._matrix = (
+                np.memmap(
+                    self._vectors_path,
+                    dtype=np.float16,
+                    mode="r",
+                    shape=(len(self), self.dim),
+                )
+                if len(self)
+                else np.zeros((0, self.dim), dtype=np.float16)
+            )
+        return self._matrix
+
+    def _read_record(self, row: int) -> Dict:
+        """Read the stored record for a row."""
+        with open(self._sources_path, "rb") as f:
+            f.seek(self._offsets[row])
+            return json.loads(f.readline())
+
+    def add(self, results: List[Dict], entity: str = "") -> int:
+        """
+        Append sources not already indexed.
+
+        Args:
+            results: Search results with title, url and content
+            entity: Company or industry the sources were fetched for
+
+        Returns:
+            Number of sources added
+        """
+        self._refresh()
+        fetched_at = round(time.time(), 3)
+        with _write_lock:
+            new = []
+            for result in results:
+                url = normalize_url(result.get("url", ""))
+                if result.get("content") and url not in self._urls:
+                    self._urls.add(url)
+                    new.append(result)
+            if not new:
+                return 0
+
+            vectors = hash_vectorize(
+                [f"{r.get('title', '')} {r['content']}" for r in new], self.dim
+            ).astype(np.float16)
+
+            offset = self._sources_path.stat().st_size
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._sources_path, "ab") as f:
+                for r in new:
+                    record = {
+                        "title": r.get("title", ""),
+                        "url": r["url"],
+                        "content": r["content"],
+                        "entity": entity,
+                        "fetched_at": fetched_at,
+                    }
+                    line = (json.dumps(record) + "\n").encode("utf-8")
+                    f.write(line)
+                    self._remember(offset, record)
+                    offset += len(line)
+            self._size = offset
+
+        logger.debug(f"Indexed {len(new)} new sources ({len(self)} total)")
+        return len(new)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_similarity: float = 0.0,
+        must_contain: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+        max_candidates: int = _MAX_CANDIDATES,
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Find indexed sources similar to a query.
+
+        Only the returned records are read from disk; the phrase and age
+        filters run on the metadata kept in memory.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of sources to return
+            min_similarity: Cosine similarity a source must reach
+            must_contain: Optional phrase (e.g. the company name) that a
+                source's title or indexed entity must mention
+            max_age_seconds: Optional age limit; older sources (and
+                sources indexed before fetch times were stored) are skipped
+            max_candidates: Most similar rows examined for the filters
+
+        Returns:
+            List of (record, similarity) tuples, best first
+        """
+        self._refresh()
+        matrix = self._get_matrix()
+        if not len(matrix):
+            return []
+
+        # float16 matmul is emulated in NumPy; score in float32 blocks instead
+        query_vector = hash_vectorize([query], self.dim)[0]
+        similarities = np.concatenate(
+            [
+                matrix[start : start + _SCORE_BLOCK_ROWS].astype(np.float32)
+                @ query_vector
+                for start in range(0, len(matrix), _SCORE_BLOCK_ROWS)
+            ]
+        )
+        eligible = similarities >= min_similarity
+        if max_age_seconds:
+            fetched_at = np.asarray(self._fetched_at[: len(matrix)])
+            eligible &= fetched_at >= time.time() - max_age_seconds
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) > max_candidates:
+            top = np.argpartition(-similarities[candidates], max_candidates - 1)
+            candidates = candidates[top[:max_candidates]]
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+
+        phrase = must_contain.lower() if must_contain else None
+        rows = [
+            int(row)
+            for row in candidates
+            if phrase is None or phrase in self._labels[row]
+        ][:top_k]
+        return [(self._read_record(row), float(similarities[row])) for row in rows]
+
+
+def get_source_index(path: str, **kwargs) -> SourceIndex:
+    """
+    Get the process-wide source index for a directory.
+
+    Args:
+        path: Index directory
+        **kwargs: SourceIndex options used when it is first opened
+
+    Returns:
+        Shared SourceIndex instance
+    """
+    if path not in _source_indexes:
+        _source_indexes[path] = SourceIndex(path, **kwargs)
+    return _source_indexes[path]
@@ -0,0 +1,351 @@
+"""Offline BM25 index over a Wikipedia/company-facts dump.
+
+The index is a directory of flat NumPy arrays opened with ``mmap_mode="r"``,
+so queries touch only the postings they need and the OS page cache does
+the rest. Terms are stored as sorted 64-bit hashes rather than a Python
+vocabulary dict, which keeps resident memory close to zero.
+
+Layout:
+    meta.json           document count, average length, BM25 parameters
+    term_hashes.npy     sorted uint64 term hashes
+    term_offsets.npy    int64 start of each term's postings (n_terms + 1)
+    postings_docs.npy   int32 document ids, grouped by term
+    postings_tf.npy     uint16 term frequencies, aligned with postings_docs
+    doc_lengths.npy     int32 token count per document
+    doc_offsets.npy     int64 byte offsets into docs.bin (n_docs + 1)
+    docs.bin            UTF-8 JSON records with title, url and text
+
+Building never holds the postings in memory: they are flushed in sorted
+chunks to a scratch directory and merged by term-hash range, so a full
+dump builds in memory bounded by the chunk size plus the vocabulary.
+"""
+
+import hashlib
+import json
+import math
+import re
+import tempfile
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the "
+    "to was were with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms without stopwords.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def hash_term(term: str) -> int:
+    """Map a term to a stable unsigned 64-bit hash."""
+    return int.from_bytes(
+        hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _flush_chunk(
+    scratch: Path,
+    index: int,
+    terms: "array[int]",
+    docs: "array[int]",
+    tfs: "array[int]",
+) -> int:
+    """Write buffered postings sorted by term (doc order kept) as one chunk."""
+    term_array = np.frombuffer(terms, dtype=np.uint64)
+    order = np.argsort(term_array, kind="stable")
+    np.save(scratch / f"{index}_terms.npy", term_array[order])
+    np.save(scratch / f"{index}_docs.npy", np.frombuffer(docs, dtype=np.int32)[order])
+    np.save(scratch / f"{index}_tf.npy", np.frombuffer(tfs, dtype=np.uint16)[order])
+    return len(term_array)
+
+
+def _merge_chunks(
+    scratch: Path, n_chunks: int, total: int, block_postings: int, out: Path
+) -> int:
+    """
+    Merge sorted posting chunks into the index's postings arrays.
+
+    Chunks hold increasing document ids, so concatenating a term's postings
+    in chunk order keeps them sorted by document. Term hashes are uniform,
+    so splitting the hash space into equal ranges gives blocks of about
+    block_postings postings each.
+
+    Returns:
+        Number of distinct terms
+    """
+    chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = [
+        tuple(  # type: ignore[misc]
+            np.load(scratch / f"{i}_{name}.npy", mmap_mode="r")
+            for name in ("terms", "docs", "tf")
+        )
+        for i in range(n_chunks)
+    ]
+    postings_docs = np.lib.format.open_memmap(
+        out / "postings_docs.npy", mode="w+", dtype=np.int32, shape=(total,)
+    )
+    postings_tf = np.lib.format.open_memmap(
+        out / "postings_tf.npy", mode="w+", dtype=np.uint16, shape=(total,)
+    )
+
+    n_blocks = max(1, math.ceil(total / block_postings))
+    bounds = [(2**64 * b) // n_blocks for b in range(n_blocks)]
+    term_hashes: List[np.ndarray] = []
+    term_counts: List[np.ndarray] = []
+    written = 0
+    for b, low in enumerate(bounds):
+        high = bounds[b + 1] if b + 1 < n_blocks else None
+        block_terms, block_docs, block_tf = [], [], []
+        for terms, docs, tf in chunks:
+            start = int(np.searchsorted(terms, np.uint64(low)))
+            end = (
+                int(np.searchsorted(terms, np.uint64(high)))
+                if high is not None
+                else len(terms)
+            )
+            block_terms.append(terms[start:end])
+            block_docs.append(docs[start:end])
+            block_tf.append(tf[start:end])
+
+        merged_terms = np.concatenate(block_terms)
+        order = np.argsort(merged_terms, kind="stable")
+        size = len(order)
+        postings_docs[written : written + size] = np.concatenate(block_docs)[order]
+        postings_tf[written : written + size] = np.concatenate(block_tf)[order]
+        written += size
+
+        unique, counts = np.unique(merged_terms[order], return_counts=True)
+        term_hashes.append(unique)
+        term_counts.append(counts)
+
+    postings_docs.flush()
+    postings_tf.flush()
+    del postings_docs, postings_tf
+
+    hashes = np.concatenate(term_hashes).astype(np.uint64)
+    term_offsets = np.zeros(len(hashes) + 1, dtype=np.int64)
+    np.cumsum(np.concatenate(term_counts), out=term_offsets[1:])
+    np.save(out / "term_hashes.npy", hashes)
+    np.save(out / "term_offsets.npy", term_offsets)
+    return len(hashes)
+
+
+def build_index(
+    docs: Iterable[Dict], out_dir: str, chunk_postings: int = 5_000_000
+) -> int:
+    """
+    Build a memory-mappable BM25 index.
+
+    Args:
+        docs: Iterable of dicts with "title", "text" and optional "url"
+        out_dir: Directory to write the index to
+        chunk_postings: Postings buffered in memory before a sorted chunk
+            is flushed to disk (also the size of each merge block)
+
+    Returns:
+        Number of documents indexed
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    doc_lengths = array("i")
+    doc_offsets = array("q", [0])
+
+    with tempfile.TemporaryDirectory(dir=out, prefix="build-") as scratch_dir:
+        scratch = Path(scratch_dir)
+        terms, doc_ids, tfs = array("Q"), array("i"), array("H")
+        n_chunks = 0
+        total = 0
+
+        with open(out / "docs.bin", "wb") as docs_file:
+            for doc_id, doc in enumerate(docs):
+                title = doc.get("title", "")
+                text = doc.get("text", "")
+                doc_terms = tokenize(f"{title} {text}")
+
+                for term, tf in Counter(doc_terms).items():
+                    terms.append(hash_term(term))
+                    doc_ids.append(doc_id)
+                    tfs.append(min(tf, 65535))
+                doc_lengths.append(len(doc_terms))
+
+                record = json.dumps(
+                    {"title": title, "url": doc.get("url", ""), "text": text}
+                ).encode("utf-8")
+                docs_file.write(record)
+                doc_offsets.append(doc_offsets[-1] + len(record))
+
+                if len(terms) >= chunk_postings:
+                    total += _flush_chunk(scratch, n_chunks, terms, doc_ids, tfs)
+                    n_chunks += 1
+                    terms, doc_ids, tfs = array("Q"), array("i"), array("H")
+
+        if len(terms) or not n_chunks:
+            total += _flush_chunk(scratch, n_chunks, terms, doc_ids, tfs)
+            n_chunks += 1
+
+        n_terms = _merge_chunks(scratch, n_chunks, total, chunk_postings, out)
+
+    lengths = np.frombuffer(doc_lengths, dtype=np.int32)
+    np.save(out / "doc_lengths.npy", lengths)
+    np.save(out / "doc_offsets.npy", np.frombuffer(doc_offsets, dtype=np.int64))
+
+    n_docs = len(lengths)
+    meta = {
+        "n_docs": n_docs,
+        "avg_doc_length": float(np.mean(lengths)) if n_docs else 0.0,
+        "k1": 1.5,
+        "b": 0.75,
+    }
+    (out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    logger.info(
+        f"Built wiki index with {n_docs} docs, {n_terms} terms from {n_chunks} chunks"
+    )
+    return n_docs
+
+
+def _query_hashes(query: str) -> np.ndarray:
+    """Sorted distinct term hashes of a query."""
+    return np.array(sorted({hash_term(t) for t in tokenize(query)}), dtype=np.uint64)
+
+
+class WikiIndex:
+    """Read-only BM25 index opened from memory-mapped arrays."""
+
+    def __init__(self, path: str):
+        """
+        Open an index directory built by build_index().
+
+        Args:
+            path: Index directory
+        """
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.n_docs: int = meta["n_docs"]
+        self.avg_doc_length: float = meta["avg_doc_length"] or 1.0
+        self.k1: float = meta["k1"]
+        self.b: float = meta["b"]
+
+        def load(name: str) -> np.ndarray:
+            return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+        self.term_hashes = load("term_hashes")
+        self.term_offsets = load("term_offsets")
+        self.postings_docs = load("postings_docs")
+        self.postings_tf = load("postings_tf")
+        self.doc_lengths = load("doc_lengths")
+        self.doc_offsets = load("doc_offsets")
+        docs_path = self.path / "docs.bin"
+        self._docs = (
+            np.memmap(docs_path, dtype=np.uint8, mode="r")
+            if docs_path.stat().st_size
+            else np.zeros(0, dtype=np.uint8)
+        )
+
+    def get_document(self, doc_id: int) -> Dict:
+        """
+        Read a stored document.
+
+        Args:
+            doc_id: Document id
+
+        Returns:
+            Dict with title, url and text
+        """
+        start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+        return json.loads(bytes(self._docs[start:end]).decode("utf-8"))
+
+    def _term_positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Positions in term_hashes of the hashes present in the index."""
+        if not len(hashes) or not len(self.term_hashes):
+            return np.zeros(0, dtype=np.int64)
+        positions = np.searchsorted(self.term_hashes, hashes)
+        in_range = positions < len(self.term_hashes)
+        positions, hashes = positions[in_range], hashes[in_range]
+        return positions[self.term_hashes[positions] == hashes]
+
+    def _idf(self, df: Union[np.ndarray, float]) -> np.ndarray:
+        """BM25 inverse document frequency."""
+        return np.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def max_score(self, query: str) -> float:
+        """
+        Upper bound of a query's BM25 score.
+
+        A document matching every query term with saturated frequency
+        approaches this score, which makes it an absolute scale for
+        comparing scores across queries. Terms absent from the index count
+        at their (highest) idf, so partial matches stay well below it.
+
+        Args:
+            query: Free-text query
+
+        Returns:
+            Sum of idf * (k1 + 1) over the distinct query terms
+        """
+        hashes = _query_hashes(query)
+        positions = self._term_positions(hashes)
+        df = np.zeros(len(hashes))
+        df[: len(positions)] = (
+            self.term_offsets[positions + 1] - self.term_offsets[positions]
+        )
+        return float(np.sum(self._idf(df)) * (self.k1 + 1.0))
+
+    def search(self, query: str, top_k: int = 3) -> List[tuple]:
+        """
+        Rank documents against a query with BM25.
+
+        Args:
+            query: Free-text query
+            top_k: Number of documents to return
+
+        Returns:
+            List of (doc_id, score) tuples, best first
+        """
+        positions = self._term_positions(_query_hashes(query))
+
+        doc_chunks = []
+        score_chunks = []
+        for pos in positions:
+            start, end = self.term_offsets[pos], self.term_offsets[pos + 1]
+            docs = np.asarray(self.postings_docs[start:end])
+            tf = np.asarray(self.postings_tf[start:end], dtype=np.float32)
+
+            idf = self._idf(float(end - start))
+            norm = self.k1 * (
+                1.0 - self.b + self.b * self.doc_lengths[docs] / self.avg_doc_length
+            )
+            doc_chunks.append(docs)
+            score_chunks.append(idf * tf * (self.k1 + 1.0) / (tf + norm))
+
+        if not doc_chunks:
+            return []
+
+        docs, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_chunks))
+
+        top_k = min(top_k, len(docs))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+
+        return [(int(docs[i]), float(scores[i])) for i in best]
@@ -2,6 +2,7 @@
 
 import gradio as gr
 import asyncio
+import json
 import logging
 import queue
 import tempfile
@@ -10,6 +11,7 @@ from datetime import datetime
 
 from src.workflows.market_analysis import MarketIntelligenceWorkflow
 from src.utils.logging import setup_logger
+from src.utils.streaming import StreamBuffer
 
 logger = setup_logger(__name__)
 
@@ -47,16 +49,33 @@ def create_ui():
             return "Grok 4.1 Fast (Free)"
         return model_name
 
+    def format_step_costs(cost_by_step: dict) -> str:
+        """Render per-step models, cost and latency as a markdown table."""
+        if not cost_by_step:
+            return "No LLM calls recorded."
+        rows = [
+            "| Step | Model | Calls | Cost ($) | Latency (s) |",
+            "|---|---|---|---|---|",
+        ]
+        for step, entry in cost_by_step.items():
+            rows.append(
+                f"| {step} | {', '.join(entry['models'])} | {entry['calls']} "
+                f"| {entry['cost']:.4f} | {entry['latency_seconds']:.1f} |"
+            )
+        return "\n".join(rows)
+
     async def run_analysis(
         company_name: str,
         industry: str,
         model_choice: str,
+        writing_model_choice: str,
+        step_routes: str,
         max_budget: float,
         research_depth: str,
     ):
         """Run market intelligence analysis with live logging."""
         if not company_name:
-            yield ("Please enter a company name", "", 0.0, "Not started", "")
+            yield ("Please enter a company name", "", 0.0, "Not started", "", "")
             return
 
         # Model mapping
@@ -67,6 +86,22 @@ def create_ui():
             "Gemini 2.5 Flash Lite (Fast)": "google/gemini-2.5-flash-lite",
         }
 
+        # Per-step routing: writing model first, explicit JSON routes on top
+        model_routes: dict = {}
+        if writing_model_choice in model_map:
+            writing_model = model_map[writing_model_choice]
+            model_routes = {
+                "executive_summary": {"model": writing_model},
+                "full_report": {"model": writing_model},
+            }
+        if step_routes and step_routes.strip():
+            try:
+                for step, route in json.loads(step_routes).items():
+                    model_routes[step] = {**model_routes.get(step, {}), **route}
+            except (ValueError, AttributeError, TypeError) as e:
+                yield ("", "", 0.0, f"❌ Invalid step routes: {e}", "", "")
+                return
+
         # Setup logging
         log_queue: queue.Queue = queue.Queue()
         queue_handler = QueueHandler(log_queue)
@@ -91,8 +126,10 @@ def create_ui():
         try:
             # Create workflow
             workflow = MarketIntelligenceWorkflow(
-                max_budget=max_budget, model_name=model
+                max_budget=max_budget, model_name=model, model_routes=model_routes
             )
+            stream_buffer = StreamBuffer()
+            workflow.add_stream_callback(stream_buffer)
 
             # Create task for workflow execution
             task = asyncio.create_task(
@@ -115,13 +152,14 @@ def create_ui():
                     except queue.Empty:
                         break
 
-                # Yield current state (logs only, other fields empty/default)
+                # Yield current state: logs plus the LLM output streaming now
                 yield (
                     activity_text,
-                    "Analysis in progress...",
+                    stream_buffer.latest_text() or "Analysis in progress...",
                     0.0,
                     "🔄 Running...",
                     "Generating summary...",
+                    format_step_costs(workflow.cost_tracker.get_summary()["by_step"]),
                 )
 
                 await asyncio.sleep(0.1)
@@ -152,11 +190,12 @@ def create_ui():
                 result.get("total_cost", 0.0),
                 final_status,
                 result.get("executive_summary", ""),
+                format_step_costs(result.get("cost_by_step", {})),
             )
 
         except Exception as e:
             logger.error(f"UI analysis failed: {e}")
-            yield (f"Error: {str(e)}", "", 0.0, f"❌ Failed: {str(e)}", "")
+            yield (f"Error: {str(e)}", "", 0.0, f"❌ Failed: {str(e)}", "", "")
 
         finally:
             # Cleanup handlers
@@ -209,6 +248,25 @@ def create_ui():
                         info="Free models for testing, paid for production",
                     )
 
+                    writing_model_choice = gr.Dropdown(
+                        choices=[
+                            "Same as AI Model",
+                            "GPT-5 Mini (Cheap)",
+                            "Claude Sonnet 4.5 (Best) - Temporarily Unavailable",
+                            "Gemini 2.5 Flash Lite (Fast)",
+                        ],
+                        value="Same as AI Model",
+                        label="Report Writing Model",
+                        info="Write the summary and report with a stronger model",
+                    )
+
+                    step_routes_input = gr.Textbox(
+                        label="Step Routes (JSON, optional)",
+                        placeholder='{"swot": {"model": "openai/gpt-5-mini", "temperature": 0.3}}',
+                        info="Model/temperature per step, e.g. research_company, swot, full_report",
+                        lines=2,
+                    )
+
                     budget_slider = gr.Slider(
                         minimum=0.1,
                         maximum=2.0,
@@ -254,6 +312,9 @@ def create_ui():
                     with gr.TabItem("📊 Full Report"):
                         report_display = gr.Markdown()
 
+                    with gr.TabItem("💰 Cost by Step"):
+                        step_costs_display = gr.Markdown()
+
                     with gr.TabItem("📥 Download"):
                         gr.Markdown("### Download Full Report")
                         download_btn = gr.DownloadButton("Download Report (Markdown)")
@@ -266,7 +327,15 @@ def create_ui():
         )
 
         def clear_inputs():
-            return "", "", "Comprehensive", "Grok 4.1 Fast (Free)", 0.5
+            return (
+                "",
+                "",
+                "Comprehensive",
+                "Grok 4.1 Fast (Free)",
+                "Same as AI Model",
+                "",
+                0.5,
+            )
 
         clear_btn.click(
             fn=clear_inputs,
@@ -275,6 +344,8 @@ def create_ui():
                 industry_input,
                 research_depth,
                 model_choice,
+                writing_model_choice,
+                step_routes_input,
                 budget_slider,
             ],
         )
@@ -285,6 +356,8 @@ def create_ui():
                 company_input,
                 industry_input,
                 model_choice,
+                writing_model_choice,
+                step_routes_input,
                 budget_slider,
                 research_depth,
             ],
@@ -294,6 +367,7 @@ def create_ui():
                 cost_display,
                 budget_status,
                 exec_summary,
+                step_costs_display,
             ],
         )
 
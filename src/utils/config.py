@@ -14,12 +14,280 @@ class Settings(BaseSettings):
     # === LLM Providers ===
     openrouter_api_key: str = Field(..., description="OpenRouter API key")
 
+    # === LLM Call Policy ===
+    llm_deadline_seconds: float = Field(
+        300.0, description="Total time for all attempts of one LLM call"
+    )
+    llm_attempt_timeout_seconds: float = Field(
+        120.0, description="Timeout of a single LLM request"
+    )
+    llm_max_attempts: int = Field(4, description="Attempts per LLM call, incl. first")
+    llm_backoff_initial_seconds: float = Field(
+        1.0, description="First retry delay (exponential, with jitter)"
+    )
+    llm_backoff_max_seconds: float = Field(30.0, description="Longest retry delay")
+    llm_hedge_after_seconds: float | None = Field(
+        None, description="Send a second request after this long (unset=off)"
+    )
+    llm_policy_overrides: dict[str, dict[str, float]] = Field(
+        {}, description="Per-agent policy fields, e.g. {'WriterAgent': {...}}"
+    )
+
+    # === LLM Concurrency ===
+    llm_concurrency_enabled: bool = Field(
+        True, description="Adapt concurrent requests per model to 429s and latency"
+    )
+    llm_concurrency_initial: int = Field(4, description="Starting requests per model")
+    llm_concurrency_min: int = Field(1, description="Lowest concurrency per model")
+    llm_concurrency_max: int = Field(32, description="Highest concurrency per model")
+    llm_concurrency_latency_tolerance: float = Field(
+        4.0, description="Latency multiple of the fastest that counts as congestion"
+    )
+
+    # === Model Routing ===
+    model_routes: dict[str, dict[str, str | float]] = Field(
+        {},
+        description="Model/temperature per prompt step, e.g. {'swot': {...}}",
+    )
+
+    # === LLM Fallback ===
+    llm_fallback_enabled: bool = Field(
+        True, description="Move calls off models breaching their latency/error SLO"
+    )
+    llm_fallback_chains: dict[str, list[str]] = Field(
+        {}, description="Alternates per primary model, best first"
+    )
+    llm_slo_p95_seconds: float = Field(
+        90.0, description="Highest acceptable rolling p95 latency per model"
+    )
+    llm_slo_error_rate: float = Field(
+        0.3, description="Highest acceptable rolling error rate per model (0-1)"
+    )
+    llm_health_window: int = Field(50, description="Recent requests kept per model")
+    llm_health_min_samples: int = Field(
+        5, description="Requests needed before a model can breach its SLO"
+    )
+    llm_fallback_probe_seconds: float = Field(
+        120.0, description="Wait before probing a degraded model again"
+    )
+
+    # === HTTP Connection Pools ===
+    http_max_connections: int = Field(100, description="Connections per client")
+    http_max_keepalive_connections: int = Field(
+        20, description="Idle connections kept open per client"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        60.0, description="Idle time before a pooled connection is closed"
+    )
+    http_timeout_seconds: float = Field(30.0, description="Default request timeout")
+    http2_enabled: bool = Field(
+        True, description="Use HTTP/2 when the h2 package is installed"
+    )
+    http_warmup_enabled: bool = Field(
+        True, description="Open upstream connections when the API starts"
+    )
+
     # === Search APIs ===
     tavily_api_key: str = Field(..., description="Tavily API key for web search")
+    tavily_http_proxy: str | None = Field(
+        None, description="Proxy for Tavily http:// requests"
+    )
+    tavily_https_proxy: str | None = Field(
+        None, description="Proxy for Tavily https:// requests"
+    )
     brave_search_api_key: str | None = Field(
         None, description="Brave Search API key (optional backup)"
     )
 
+    search_backend: str = Field(
+        "tavily", description="Search backend: tavily, brave or fixture"
+    )
+    search_hedge_backend: str | None = Field(
+        None, description="Optional backend fired when the primary is slow"
+    )
+    search_hedge_initial_delay: float = Field(
+        2.0, description="Hedge delay (s) until primary p95 latency is known"
+    )
+    search_fixture_path: str = Field(
+        "./data/search_fixtures", description="Directory of offline search fixtures"
+    )
+
+    search_rate_limit_rps: float = Field(
+        1.5, description="Process-wide search requests per second (0 = unlimited)"
+    )
+    search_rate_limit_burst: int = Field(
+        5, description="Searches allowed back to back before rate limiting"
+    )
+
+    wikipedia_index_path: str = Field(
+        "./data/wiki_index", description="Local BM25 Wikipedia index directory"
+    )
+
+    # === Search Cache ===
+    search_cache_enabled: bool = Field(
+        True, description="Cache search results on disk across runs"
+    )
+    search_cache_path: str = Field(
+        "./data/search_cache.db", description="SQLite search cache path"
+    )
+    search_cache_ttl_seconds: float = Field(
+        86400.0, description="Time-to-live for cached search results"
+    )
+    search_cache_max_entries: int = Field(
+        1000, description="Maximum cached searches before LRU eviction"
+    )
+
+    # === LLM Response Cache ===
+    llm_cache_enabled: bool = Field(
+        True, description="Reuse responses to identical LLM requests"
+    )
+    llm_cache_path: str = Field(
+        "./data/llm_cache.db", description="LLM response cache database"
+    )
+    llm_cache_ttl_seconds: int = Field(
+        604800, description="LLM response cache TTL (seconds)"
+    )
+    llm_cache_max_entries: int = Field(
+        5000, description="Maximum cached LLM responses before LRU eviction"
+    )
+
+    semantic_cache_enabled: bool = Field(
+        True, description="Reuse responses to near-identical LLM prompts"
+    )
+    semantic_cache_path: str = Field(
+        "./data/semantic_cache", description="Semantic LLM cache directory"
+    )
+    semantic_cache_max_entries: int = Field(
+        2000, description="Prompts kept for similarity matching"
+    )
+    semantic_cache_thresholds: dict[str, float] = Field(
+        {"AnalysisAgent": 0.97, "WriterAgent": 0.97},
+        description="Cosine similarity needed for reuse, per agent (absent=off)",
+    )
+
+    # === Prompt Caching ===
+    prompt_caching_enabled: bool = Field(
+        True, description="Mark shared prompt prefixes for provider caching"
+    )
+    prompt_cache_marker_models: list[str] = Field(
+        ["anthropic/", "google/"],
+        description="Model prefixes that need cache_control markers to cache",
+    )
+
+    # === Streaming ===
+    llm_stream_log_path: str | None = Field(
+        None, description="Append streamed LLM output to this file (unset=off)"
+    )
+    stream_buffer_ttl_seconds: float = Field(
+        600.0, description="Time a finished run's stream stays replayable"
+    )
+
+    # === Entity Resolution ===
+    entity_resolution_enabled: bool = Field(
+        True, description="Resolve company names to canonical names before research"
+    )
+    entity_alias_path: str = Field(
+        "./data/entity_aliases.json", description="Learned company alias table"
+    )
+    entity_fuzzy_threshold: float = Field(
+        0.88, description="Similarity ratio for fuzzy company-name matches"
+    )
+
+    # === Source Index ===
+    source_index_enabled: bool = Field(
+        True, description="Answer from previously fetched sources before searching"
+    )
+    source_index_path: str = Field(
+        "./data/source_index", description="Local source vector index directory"
+    )
+    source_index_dim: int = Field(
+        2048, description="Hashing vectorizer dimension for new indexes"
+    )
+    source_index_min_similarity: float = Field(
+        0.2, description="Cosine similarity for a local source to count as a hit"
+    )
+    source_index_min_hits: int = Field(
+        3, description="Local hits needed to skip the search API for a topic"
+    )
+    source_index_max_age_hours: float = Field(
+        168.0,
+        description="Age after which an indexed company or competitor source "
+        "no longer counts as a hit (0 = no limit)",
+    )
+    source_index_trends_max_age_hours: float = Field(
+        24.0,
+        description="Age after which an indexed market-trend source no longer "
+        "counts as a hit (0 = no limit)",
+    )
+
+    # === Page Enrichment ===
+    page_enrichment_enabled: bool = Field(
+        False, description="Fetch full pages for the top results of each topic"
+    )
+    page_enrichment_top_k: int = Field(
+        3, description="Highest-scored results enriched per topic"
+    )
+    page_fetch_timeout: float = Field(10.0, description="Per-page fetch timeout (s)")
+    page_fetch_max_per_host: int = Field(
+        2, description="Concurrent page fetches allowed per host"
+    )
+    page_fetch_max_chars: int = Field(
+        20000, description="Maximum cleaned characters kept per page"
+    )
+    page_cache_path: str = Field(
+        "./data/page_cache.db", description="Cleaned page text cache database"
+    )
+    page_cache_ttl_seconds: int = Field(
+        604800, description="Cleaned page text cache TTL (seconds)"
+    )
+
+    # === Research ===
+    source_dedup_threshold: float = Field(
+        0.8, description="MinHash similarity above which sources are duplicates"
+    )
+    query_expansion_basic: int = Field(
+        1, description="Sub-queries per research topic (basic depth)"
+    )
+    query_expansion_comprehensive: int = Field(
+        3, description="Sub-queries per research topic (comprehensive depth)"
+    )
+    adaptive_results_enabled: bool = Field(
+        True, description="Cut the low-relevance tail of search results"
+    )
+    adaptive_min_score: float = Field(
+        0.3, description="Minimum Tavily score for a result to reach the LLM"
+    )
+    context_token_budget_basic: int = Field(
+        1500, description="Search context token budget per prompt (basic, 0=off)"
+    )
+    context_token_budget_comprehensive: int = Field(
+        4000,
+        description="Search context token budget per prompt (comprehensive, 0=off)",
+    )
+    chunk_retrieval_enabled: bool = Field(
+        True, description="Send only the passages most relevant to each prompt"
+    )
+    chunk_retrieval_top_k: int = Field(
+        12, description="Passages kept per prompt by chunk retrieval"
+    )
+    chunk_retrieval_words: int = Field(
+        90, description="Words per passage for chunk retrieval"
+    )
+    map_reduce_threshold_tokens: int = Field(
+        6000,
+        description="Full source text size (before retrieval and packing) "
+        "that triggers map-reduce (0=off)",
+    )
+    map_reduce_chunk_tokens: int = Field(
+        2000, description="Context tokens per map-step chunk"
+    )
+    map_reduce_model: str = Field(
+        "openai/gpt-5-nano", description="Cheap model for map-step summaries"
+    )
+    map_reduce_concurrency: int = Field(
+        4, description="Maximum concurrent map-step LLM calls"
+    )
+
     # === Observability ===
     langsmith_api_key: str | None = Field(
         None, description="LangSmith API key for tracing"
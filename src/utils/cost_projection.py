@@ -0,0 +1,94 @@
+"""Expected completion sizes for projecting LLM cost before a call."""
+
+from typing import Dict, Optional
+
+from src.utils.prompts import DEFAULT_EXPECTED_OUTPUT_TOKENS, EXPECTED_OUTPUT_TOKENS
+
+_output_model: Optional["OutputTokenModel"] = None
+
+
+class OutputTokenModel:
+    """
+    Expected output tokens per prompt step.
+
+    Each step starts from a prior (the typical length its prompt asks for)
+    and moves towards observed completion sizes with an exponentially
+    weighted moving average, so reasoning overhead and model verbosity are
+    learned over runs.
+    """
+
+    def __init__(
+        self,
+        priors: Optional[Dict[str, int]] = None,
+        default: int = DEFAULT_EXPECTED_OUTPUT_TOKENS,
+        alpha: float = 0.2,
+    ):
+        """
+        Initialize output model.
+
+        Args:
+            priors: Expected output tokens per step before any observation
+            default: Expectation for steps without a prior
+            alpha: Weight of each new observation (0-1)
+        """
+        self.priors = dict(EXPECTED_OUTPUT_TOKENS if priors is None else priors)
+        self.default = default
+        self.alpha = alpha
+        self._estimates: Dict[str, float] = {}
+        self._observations: Dict[str, int] = {}
+
+    def expected(self, step: str) -> int:
+        """
+        Expected output tokens of a step.
+
+        Args:
+            step: Prompt step name
+
+        Returns:
+            Expected completion tokens
+        """
+        if step in self._estimates:
+            return round(self._estimates[step])
+        return self.priors.get(step, self.default)
+
+    def observe(self, step: str, output_tokens: int) -> None:
+        """
+        Learn from a completed call.
+
+        Args:
+            step: Prompt step name
+            output_tokens: Completion tokens the call used
+        """
+        current = self._estimates.get(step, float(self.expected(step)))
+        self._estimates[step] = current + self.alpha * (output_tokens - current)
+        self._observations[step] = self._observations.get(step, 0) + 1
+
+    def get_stats(self) -> Dict:
+        """
+        Get the current expectations.
+
+        Returns:
+            Mapping of step to expected tokens and observation count
+        """
+        steps = set(self.priors) | set(self._estimates)
+        return {
+            step: {
+                "expected_tokens": self.expected(step),
+                "observations": self._observations.get(step, 0),
+            }
+            for step in sorted(steps)
+        }
+
+
+def get_output_model() -> OutputTokenModel:
+    """
+    Get the process-wide output model, shared so every run refines it.
+
+    Returns:
+        Shared OutputTokenModel
+    """
+    global _output_model
+
+    if _output_model is None:
+        _output_model = OutputTokenModel()
+    return _output_model
@@ -15,6 +15,11 @@ class TokenUsage:
     input_tokens: int
     output_tokens: int
     model: str
+    cached: bool = False  # Served from the response cache at no cost
+    cache_read_tokens: int = 0  # Input tokens read from the provider prompt cache
+    cache_write_tokens: int = 0  # Input tokens written to the provider prompt cache
+    step: str = ""  # Prompt step that made the call
+    latency: float = 0.0  # Seconds the call took, including retries
 
     @property
     def total_tokens(self) -> int:
@@ -22,6 +27,15 @@ class TokenUsage:
         return self.input_tokens + self.output_tokens
 
 
+@dataclass
+class LLMAttempt:
+    """One request sent for an LLM call (retries and hedges add more)."""
+
+    model: str
+    outcome: str  # "ok", "error", "timeout" or "cancelled" (lost a hedge)
+    latency: float
+
+
 @dataclass
 class CostTracker:
     """
@@ -29,6 +43,10 @@ class CostTracker:
 
     Pricing updated: November 2025
     OpenRouter adds ~5% commission to provider pricing.
+
+    Input tokens read from a provider's prompt cache are billed at the
+    model's "cached_input" price, and tokens written to it at "cache_write";
+    both default to the normal input price.
     """
 
     # Pricing per 1M tokens (input/output) - Verified by user (Nov 28, 2025)
@@ -39,38 +57,62 @@ class CostTracker:
         "ollama": {"input": 0.0, "output": 0.0},  # Local
         # === CHEAP (testing/development) ===
         # OpenAI
-        "openai/gpt-5-nano": {"input": 0.05 / 1_000_000, "output": 0.40 / 1_000_000},
-        "openai/gpt-5-mini": {"input": 0.25 / 1_000_000, "output": 2.00 / 1_000_000},
+        "openai/gpt-5-nano": {
+            "input": 0.05 / 1_000_000,
+            "output": 0.40 / 1_000_000,
+            "cached_input": 0.005 / 1_000_000,
+        },
+        "openai/gpt-5-mini": {
+            "input": 0.25 / 1_000_000,
+            "output": 2.00 / 1_000_000,
+            "cached_input": 0.025 / 1_000_000,
+        },
         # === PRODUCTION ===
         # Google (enterprise credibility + advanced reasoning)
         "google/gemini-2.5-flash-lite": {
             "input": 0.10 / 1_000_000,
             "output": 0.40 / 1_000_000,
+            "cached_input": 0.025 / 1_000_000,
         },
         "google/gemini-3-pro-preview": {
             "input": 2.00 / 1_000_000,
             "output": 12.00 / 1_000_000,
+            "cached_input": 0.20 / 1_000_000,
         },
         # Anthropic (best for technical audiences - strong code/reasoning)
         "anthropic/claude-sonnet-4.5": {
             "input": 3.00 / 1_000_000,
             "output": 15.00 / 1_000_000,
+            "cached_input": 0.30 / 1_000_000,
+            "cache_write": 3.75 / 1_000_000,
         },
     }
 
     total_cost: float = field(default=0.0)
+    cost_saved: float = field(default=0.0)
+    budget: float | None = field(default=None)  # Enforced by admit() when set
+    reserved_cost: float = field(default=0.0)  # Projected cost of calls in flight
+    rejected_calls: int = field(default=0)
     usage_history: list[TokenUsage] = field(default_factory=list)
+    attempt_history: list[LLMAttempt] = field(default_factory=list)
 
     def calculate_cost(
-        self, model: str, input_tokens: int, output_tokens: int
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
     ) -> float:
         """
         Calculate cost for a single LLM call.
 
         Args:
             model: Model name (e.g., "anthropic/claude-3.5-sonnet")
-            input_tokens: Number of input tokens
+            input_tokens: Number of input tokens (including cached ones)
             output_tokens: Number of output tokens
+            cache_read_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
 
         Returns:
             Cost in USD
@@ -78,32 +120,60 @@ class CostTracker:
         # Get pricing for model (fallback to GPT-5-mini if unknown)
         pricing = self.PRICING.get(model, self.PRICING["openai/gpt-5-mini"])
 
-        cost = (input_tokens * pricing["input"]) + (output_tokens * pricing["output"])
+        uncached = max(0, input_tokens - cache_read_tokens - cache_write_tokens)
+        cost = (
+            uncached * pricing["input"]
+            + cache_read_tokens * pricing.get("cached_input", pricing["input"])
+            + cache_write_tokens * pricing.get("cache_write", pricing["input"])
+            + output_tokens * pricing["output"]
+        )
 
         logger.debug(
             f"Cost calculated for {model}: ${cost:.4f} "
-            f"(input: {input_tokens}, output: {output_tokens})"
+            f"(input: {input_tokens}, cached: {cache_read_tokens}, "
+            f"output: {output_tokens})"
         )
 
         return cost
 
-    def track_usage(self, model: str, input_tokens: int, output_tokens: int) -> float:
+    def track_usage(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        step: str = "",
+        latency: float = 0.0,
+    ) -> float:
         """
         Track LLM usage and update total cost.
 
         Args:
             model: Model name
-            input_tokens: Number of input tokens
+            input_tokens: Number of input tokens (including cached ones)
             output_tokens: Number of output tokens
+            cache_read_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+            step: Prompt step that made the call
+            latency: Seconds the call took
 
         Returns:
             Cost for this call (USD)
         """
         usage = TokenUsage(
-            input_tokens=input_tokens, output_tokens=output_tokens, model=model
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            model=model,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            step=step,
+            latency=latency,
         )
 
-        cost = self.calculate_cost(model, input_tokens, output_tokens)
+        cost = self.calculate_cost(
+            model, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens
+        )
 
         self.usage_history.append(usage)
         self.total_cost += cost
@@ -114,6 +184,98 @@ class CostTracker:
 
         return cost
 
+    def track_cache_hit(
+        self, model: str, input_tokens: int, output_tokens: int, step: str = ""
+    ) -> float:
+        """
+        Track a call answered from the response cache as a zero-cost call.
+
+        Args:
+            model: Model name
+            input_tokens: Input tokens of the original call
+            output_tokens: Output tokens of the original call
+            step: Prompt step that made the call
+
+        Returns:
+            Cost the call would have had (USD saved)
+        """
+        self.usage_history.append(
+            TokenUsage(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                model=model,
+                cached=True,
+                step=step,
+            )
+        )
+
+        saved = self.calculate_cost(model, input_tokens, output_tokens)
+        self.cost_saved += saved
+
+        logger.info(
+            f"Cache hit tracked: {model} - saved ${saved:.4f} "
+            f"(total saved: ${self.cost_saved:.4f})"
+        )
+
+        return saved
+
+    def track_attempt(self, model: str, outcome: str, latency: float) -> None:
+        """
+        Record one LLM request, including failed, timed-out and hedged ones.
+
+        Args:
+            model: Model name
+            outcome: "ok", "error", "timeout" or "cancelled"
+            latency: Seconds until the request finished or was abandoned
+        """
+        self.attempt_history.append(
+            LLMAttempt(model=model, outcome=outcome, latency=latency)
+        )
+
+    def admit(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """
+        Admit a call before it is sent, reserving its projected cost.
+
+        The call is refused if the money already spent, the reservations
+        of calls still in flight and this call's projection together exceed
+        the budget. Release the reservation once the call finishes.
+
+        Args:
+            model: Model name
+            input_tokens: Estimated input tokens
+            output_tokens: Expected output tokens
+
+        Returns:
+            Reserved cost (USD), to pass to release()
+
+        Raises:
+            BudgetExceededError: If the call would exceed the budget
+        """
+        projected = self.calculate_cost(model, input_tokens, output_tokens)
+
+        if (
+            self.budget is not None
+            and self.total_cost + self.reserved_cost + projected > self.budget
+        ):
+            self.rejected_calls += 1
+            raise BudgetExceededError(
+                f"Projected call cost ${projected:.4f} on top of "
+                f"${self.total_cost:.4f} spent and ${self.reserved_cost:.4f} "
+                f"in flight exceeds budget ${self.budget:.2f}"
+            )
+
+        self.reserved_cost += projected
+        return projected
+
+    def release(self, reserved: float) -> None:
+        """
+        Release a reservation made by admit().
+
+        Args:
+            reserved: Cost returned by admit()
+        """
+        self.reserved_cost = max(0.0, self.reserved_cost - reserved)
+
     def check_budget(self, max_budget: float) -> None:
         """
         Check if total cost exceeds budget and raise exception if so.
@@ -136,8 +298,10 @@ class CostTracker:
         Returns:
             Dictionary with cost summary
         """
-        total_input = sum(u.input_tokens for u in self.usage_history)
-        total_output = sum(u.output_tokens for u in self.usage_history)
+        billed = [u for u in self.usage_history if not u.cached]
+        cached = [u for u in self.usage_history if u.cached]
+        total_input = sum(u.input_tokens for u in billed)
+        total_output = sum(u.output_tokens for u in billed)
 
         # Group by model
         model_costs = {}
@@ -147,13 +311,77 @@ class CostTracker:
                     "input_tokens": 0,
                     "output_tokens": 0,
                     "cost": 0.0,
+                    "cached_calls": 0,
+                    "cache_read_tokens": 0,
                 }
 
+            if usage.cached:
+                model_costs[usage.model]["cached_calls"] += 1
+                continue
+
             model_costs[usage.model]["input_tokens"] += usage.input_tokens
             model_costs[usage.model]["output_tokens"] += usage.output_tokens
+            model_costs[usage.model]["cache_read_tokens"] += usage.cache_read_tokens
             model_costs[usage.model]["cost"] += self.calculate_cost(
-                usage.model, usage.input_tokens, usage.output_tokens
+                usage.model,
+                usage.input_tokens,
+                usage.output_tokens,
+                usage.cache_read_tokens,
+                usage.cache_write_tokens,
+            )
+
+        # What the provider prompt cache took off the bill
+        prompt_cache_saved = sum(
+            self.calculate_cost(u.model, u.input_tokens, u.output_tokens)
+            - self.calculate_cost(
+                u.model,
+                u.input_tokens,
+                u.output_tokens,
+                u.cache_read_tokens,
+                u.cache_write_tokens,
             )
+            for u in billed
+            if u.cache_read_tokens or u.cache_write_tokens
+        )
+
+        # Group by prompt step (calls tracked without one are left out)
+        step_costs: dict[str, dict] = {}
+        for usage in self.usage_history:
+            if not usage.step:
+                continue
+            entry = step_costs.setdefault(
+                usage.step,
+                {
+                    "models": [],
+                    "calls": 0,
+                    "cached_calls": 0,
+                    "output_tokens": 0,
+                    "cost": 0.0,
+                    "latency_seconds": 0.0,
+                },
+            )
+            entry["calls"] += 1
+            if usage.model not in entry["models"]:
+                entry["models"].append(usage.model)
+            if usage.cached:
+                entry["cached_calls"] += 1
+                continue
+            entry["output_tokens"] += usage.output_tokens
+            entry["cost"] += self.calculate_cost(
+                usage.model,
+                usage.input_tokens,
+                usage.output_tokens,
+                usage.cache_read_tokens,
+                usage.cache_write_tokens,
+            )
+            entry["latency_seconds"] += usage.latency
+        for entry in step_costs.values():
+            entry["cost"] = round(entry["cost"], 6)
+            entry["latency_seconds"] = round(entry["latency_seconds"], 3)
+
+        attempts: dict[str, int] = {}
+        for attempt in self.attempt_history:
+            attempts[attempt.outcome] = attempts.get(attempt.outcome, 0) + 1
 
         return {
             "total_cost": round(self.total_cost, 4),
@@ -161,7 +389,16 @@ class CostTracker:
             "total_output_tokens": total_output,
             "total_tokens": total_input + total_output,
             "calls": len(self.usage_history),
+            "cached_calls": len(cached),
+            "cached_tokens": sum(u.total_tokens for u in cached),
+            "cost_saved": round(self.cost_saved, 4),
+            "cache_read_tokens": sum(u.cache_read_tokens for u in billed),
+            "cache_write_tokens": sum(u.cache_write_tokens for u in billed),
+            "prompt_cache_saved": round(prompt_cache_saved, 4),
+            "rejected_calls": self.rejected_calls,
+            "attempts": attempts,
             "by_model": model_costs,
+            "by_step": step_costs,
         }
 
 
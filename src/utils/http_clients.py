@@ -0,0 +1,142 @@
+"""Process-wide pooled HTTP clients.
+
+Agents, search backends and page fetching share one keep-alive client per
+upstream instead of opening fresh TLS connections for every workflow, run
+or request. HTTP/2 is used when the optional ``h2`` package is installed.
+
+Connections belong to the event loop that opened them, so clients are
+registered per running loop (with one extra set for code running outside
+a loop, such as agent construction).
+"""
+
+import asyncio
+import importlib.util
+import time
+import weakref
+from typing import Any, Dict, MutableMapping, Optional
+
+import httpx
+
+from src.utils.config import get_settings
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_unbound_clients: Dict[str, httpx.AsyncClient] = {}
+_loop_clients: MutableMapping[
+    asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+
+
+def _registry() -> Dict[str, httpx.AsyncClient]:
+    """Clients registered for the running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _unbound_clients
+    return _loop_clients.setdefault(loop, {})
+
+
+def get_http_client(name: str, **client_kwargs: Any) -> httpx.AsyncClient:
+    """
+    Get the shared client for an upstream, creating it on first use.
+
+    Pool sizes, keep-alive expiry and HTTP/2 come from config; keyword
+    arguments (base_url, headers, ...) only apply when the client is
+    created, so every caller of one name must pass the same ones.
+
+    Args:
+        name: Registry key, e.g. "llm" or "tavily"
+        **client_kwargs: Extra httpx.AsyncClient arguments
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    clients = _registry()
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        settings = get_settings()
+        client_kwargs.setdefault("timeout", settings.http_timeout_seconds)
+        client = httpx.AsyncClient(
+            http2=settings.http2_enabled and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            ),
+            **client_kwargs,
+        )
+        clients[name] = client
+        logger.debug(f"Created pooled HTTP client '{name}'")
+    return client
+
+
+class BorrowedClient:
+    """
+    Async context manager lending a shared client without closing it.
+
+    For SDKs that wrap every request in ``async with client:``.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        """
+        Initialize borrowed client.
+
+        Args:
+            client: Shared client to lend
+        """
+        self.client = client
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        """Return the shared client."""
+        return self.client
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Leave the client open for the next borrower."""
+        return None
+
+
+async def warm_up(targets: Dict[str, httpx.AsyncClient]) -> Dict[str, float]:
+    """
+    Open pooled connections to upstreams ahead of the first real request.
+
+    Any HTTP response counts as warm: the point is DNS, TCP and TLS setup,
+    not the endpoint itself. Failures are logged and otherwise ignored.
+
+    Args:
+        targets: Mapping of URL to the shared client that will call it
+
+    Returns:
+        Mapping of URL to connection setup seconds (failed URLs omitted)
+    """
+
+    async def touch(url: str, client: httpx.AsyncClient) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            await client.head(url, timeout=5.0)
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP warm-up failed for {url}: {e!r}")
+            return None
+        return time.perf_counter() - start
+
+    timings = await asyncio.gather(*(touch(u, c) for u, c in targets.items()))
+    warmed = {url: t for url, t in zip(targets, timings) if t is not None}
+    logger.info(
+        f"Warmed {len(warmed)}/{len(targets)} HTTP upstreams",
+        extra={
+            "extra_fields": {
+                "warmup_ms": {u: round(t * 1000, 1) for u, t in warmed.items()}
+            }
+        },
+    )
+    return warmed
+
+
+async def aclose_http_clients() -> None:
+    """Close every client registered for the running loop."""
+    clients = _registry()
+    for client in clients.values():
+        await client.aclose()
+    clients.clear()
@@ -0,0 +1,63 @@
+"""Persistent exact-match cache for LLM responses."""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage
+
+from src.tools.search_cache import SearchCache
+
+
+class LLMResponseCache(SearchCache):
+    """
+    SQLite-backed cache of LLM responses with TTL and LRU eviction.
+
+    Shares storage and eviction with SearchCache; only the key differs.
+    Entries hold the response text and the token usage of the original
+    call, so a hit can be costed as a saving.
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/llm_cache.db",
+        ttl_seconds: float = 604800.0,
+        max_entries: int = 5000,
+    ):
+        """
+        Initialize LLM response cache.
+
+        Args:
+            path: Path to SQLite cache database
+            ttl_seconds: Default time-to-live for new entries
+            max_entries: Maximum entries kept before LRU eviction
+        """
+        super().__init__(path=path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    @staticmethod
+    def make_llm_key(
+        model: str,
+        temperature: float,
+        messages: List[BaseMessage],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build a cache key from the model, sampling settings and prompt.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            messages: Messages sent to the model
+            params: Extra LLM call parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[m.type, m.content] for m in messages],
+            "params": params or {},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
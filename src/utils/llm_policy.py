@@ -0,0 +1,81 @@
+"""Timeout, retry and hedging policy for LLM calls."""
+
+import asyncio
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional
+
+import httpx
+import openai
+
+from src.utils.config import Settings
+
+# Statuses worth another attempt: timeouts, conflicts, rate limits, 5xx
+_RETRYABLE_STATUS = frozenset({408, 409, 425, 429})
+
+
+@dataclass(frozen=True)
+class LLMCallPolicy:
+    """How long an agent waits for an LLM and how it recovers."""
+
+    deadline_seconds: float = 300.0  # Total for all attempts of one call
+    attempt_timeout_seconds: float = 120.0
+    max_attempts: int = 4
+    backoff_initial_seconds: float = 1.0
+    backoff_max_seconds: float = 30.0
+    hedge_after_seconds: Optional[float] = None  # None = never hedge
+
+    @classmethod
+    def from_settings(cls, settings: Settings, agent_name: str) -> "LLMCallPolicy":
+        """
+        Build an agent's policy from config defaults and its overrides.
+
+        Args:
+            settings: Application settings
+            agent_name: Agent whose entry in llm_policy_overrides applies
+
+        Returns:
+            Policy for the agent
+
+        Raises:
+            ValueError: If an override names an unknown policy field
+        """
+        policy = cls(
+            deadline_seconds=settings.llm_deadline_seconds,
+            attempt_timeout_seconds=settings.llm_attempt_timeout_seconds,
+            max_attempts=settings.llm_max_attempts,
+            backoff_initial_seconds=settings.llm_backoff_initial_seconds,
+            backoff_max_seconds=settings.llm_backoff_max_seconds,
+            hedge_after_seconds=settings.llm_hedge_after_seconds,
+        )
+
+        overrides: Dict[str, Any] = dict(
+            settings.llm_policy_overrides.get(agent_name, {})
+        )
+        unknown = set(overrides) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown LLM policy fields for {agent_name}: {unknown}")
+        if "max_attempts" in overrides:
+            overrides["max_attempts"] = int(overrides["max_attempts"])
+        return replace(policy, **overrides)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether a failed LLM request is worth another attempt.
+
+    Timeouts, connection failures, rate limits and server errors are;
+    request errors (bad request, auth, unknown model) are not.
+
+    Args:
+        error: Exception raised by the attempt
+
+    Returns:
+        True if the call should be retried
+    """
+    if isinstance(
+        error, (asyncio.TimeoutError, openai.APIConnectionError, httpx.TransportError)
+    ):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
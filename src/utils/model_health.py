@@ -0,0 +1,308 @@
+"""Per-model latency and error statistics with SLO-driven fallback.
+
+Every LLM request reports its latency and outcome here. While a model's
+rolling p95 latency or error rate breaches the SLO, calls for it move to
+the next healthy model in its fallback chain. Once the probe interval
+has passed, a single call goes to the degraded model as a probe. A fast,
+successful probe restores the model; anything else keeps the fallback
+for another interval.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional, Sequence, Tuple
+
+from src.utils.config import get_settings
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+_fallback_router: Optional["FallbackRouter"] = None
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples (need not be sorted)
+        q: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        The smallest sample at or above the q-th fraction of samples
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ModelStats:
+    """Rolling window of recent request outcomes for one model."""
+
+    def __init__(self, window: int = 50):
+        """
+        Initialize model statistics.
+
+        Args:
+            window: Most recent requests kept
+        """
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Add one request's latency and whether it succeeded."""
+        self.samples.append((latency, ok))
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+
+    def p50(self) -> Optional[float]:
+        """Median latency of the window (None if empty)."""
+        return percentile([s[0] for s in self.samples], 0.5) if self.samples else None
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency of the window (None if empty)."""
+        return percentile([s[0] for s in self.samples], 0.95) if self.samples else None
+
+    def error_rate(self) -> float:
+        """Share of failed requests in the window."""
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def get_stats(self) -> Dict:
+        """
+        Get the window's percentiles and error rate.
+
+        Returns:
+            Dictionary with p50/p95 seconds, error rate and counters
+        """
+        p50, p95 = self.p50(), self.p95()
+        return {
+            "samples": len(self.samples),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class FallbackRouter:
+    """
+    Route calls away from models breaching their latency or error SLO.
+
+    Chains list alternates in order of preference for each primary model.
+    A degraded model is skipped until its probe is due; models without a
+    chain are tracked but always used as requested.
+    """
+
+    def __init__(
+        self,
+        chains: Optional[Mapping[str, Sequence[str]]] = None,
+        p95_slo: float = 90.0,
+        error_rate_slo: float = 0.3,
+        min_samples: int = 5,
+        probe_seconds: float = 120.0,
+        window: int = 50,
+    ):
+        """
+        Initialize fallback router.
+
+        Args:
+            chains: Mapping of primary model to its alternates, best first
+            p95_slo: Highest acceptable p95 latency (seconds)
+            error_rate_slo: Highest acceptable share of failed requests
+            min_samples: Requests needed before a model can be judged
+            probe_seconds: Time before a degraded model is probed again
+            window: Recent requests kept per model
+        """
+        self.chains = {model: list(alts) for model, alts in (chains or {}).items()}
+        self.p95_slo = p95_slo
+        self.error_rate_slo = error_rate_slo
+        self.min_samples = min_samples
+        self.probe_seconds = probe_seconds
+        self.window = window
+
+        self.stats: Dict[str, ModelStats] = {}
+        self._degraded_until: Dict[str, float] = {}  # Next probe time
+        self._probing: set[str] = set()
+        self._decisions: Dict[str, str] = {}  # Last model chosen per primary
+        self.fallbacks = 0
+
+    def _stats_for(self, model: str) -> ModelStats:
+        """Get a model's statistics, starting an empty window if needed."""
+        if model not in self.stats:
+            self.stats[model] = ModelStats(self.window)
+        return self.stats[model]
+
+    def breach(self, model: str) -> Optional[str]:
+        """
+        Describe how a model breaches its SLO.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Reason such as "p95 95.0s > 90.0s", or None while within SLO
+            or with too few samples to judge
+        """
+        stats = self.stats.get(model)
+        if stats is None or len(stats.samples) < self.min_samples:
+            return None
+        p95 = stats.p95() or 0.0
+        if p95 > self.p95_slo:
+            return f"p95 {p95:.1f}s > {self.p95_slo:.1f}s"
+        error_rate = stats.error_rate()
+        if error_rate > self.error_rate_slo:
+            return f"error rate {error_rate:.0%} > {self.error_rate_slo:.0%}"
+        return None
+
+    def record(self, model: str, latency: float, ok: bool) -> None:
+        """
+        Record one request and update the model's health.
+
+        Args:
+            model: Model that served the request
+            latency: Seconds the request took
+            ok: False for timeouts, rate limits and server errors
+        """
+        stats = self._stats_for(model)
+        stats.record(latency, ok)
+        now = time.monotonic()
+
+        if model in self._probing:
+            self._probing.discard(model)
+            if ok and latency <= self.p95_slo:
+                # Forget the degraded window so old samples cannot re-trip it
+                stats.samples.clear()
+                stats.samples.append((latency, ok))
+                del self._degraded_until[model]
+                logger.info(
+                    f"Model {model} restored after probe ({latency:.1f}s)",
+                    extra={"extra_fields": {"model": model, "routing": "restored"}},
+                )
+            else:
+                self._degraded_until[model] = now + self.probe_seconds
+                logger.warning(
+                    f"Model {model} probe failed, next probe in "
+                    f"{self.probe_seconds:.0f}s",
+                    extra={"extra_fields": {"model": model, "routing": "degraded"}},
+                )
+            return
+
+        if model not in self._degraded_until:
+            reason = self.breach(model)
+            if reason is not None:
+                self._degraded_until[model] = now + self.probe_seconds
+                logger.warning(
+                    f"Model {model} breached its SLO ({reason})",
+                    extra={
+                        "extra_fields": {
+                            "model": model,
+                            "routing": "degraded",
+                            "reason": reason,
+                            **stats.get_stats(),
+                        }
+                    },
+                )
+
+    def is_degraded(self, model: str) -> bool:
+        """Whether calls for a model currently skip it."""
+        return model in self._degraded_until
+
+    def choose(self, model: str) -> str:
+        """
+        Pick the model to send a call for a primary model to.
+
+        The first model of the chain that is healthy, or degraded with a
+        probe due, wins. If every model is degraded the primary is used.
+
+        Args:
+            model: Requested (primary) model
+
+        Returns:
+            Model to call
+        """
+        now = time.monotonic()
+        chosen = model
+        for candidate in [model, *self.chains.get(model, [])]:
+            until = self._degraded_until.get(candidate)
+            if until is None:
+                chosen = candidate
+                break
+            if now >= until and candidate not in self._probing:
+                # One probe per interval; a probe that never reports back
+                # is retried after the next interval
+                self._probing.add(candidate)
+                self._degraded_until[candidate] = now + self.probe_seconds
+                chosen = candidate
+                break
+
+        previous = self._decisions.get(model, model)
+        self._decisions[model] = chosen
+        if chosen != model:
+            self.fallbacks += 1
+        if chosen != previous:
+            logger.info(
+                f"Routing {model} to {chosen}",
+                extra={
+                    "extra_fields": {
+                        "model": model,
+                        "routed_to": chosen,
+                        "probe": chosen in self._probing,
+                    }
+                },
+            )
+        return chosen
+
+    def get_stats(self) -> Dict:
+        """
+        Get per-model health and current routing decisions.
+
+        Returns:
+            Dictionary with the SLO, per-model statistics (including
+            whether each model is degraded) and the model each primary
+            is currently routed to
+        """
+        models: Dict[str, Dict] = {}
+        for model, stats in self.stats.items():
+            models[model] = {
+                **stats.get_stats(),
+                "degraded": self.is_degraded(model),
+                "breach": self.breach(model),
+            }
+        routes: Dict[str, str] = {
+            primary: self._decisions.get(primary, primary) for primary in self.chains
+        }
+        return {
+            "slo": {"p95_seconds": self.p95_slo, "error_rate": self.error_rate_slo},
+            "models": models,
+            "routes": routes,
+            "chains": self.chains,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def get_fallback_router() -> FallbackRouter:
+    """
+    Get the process-wide fallback router, configured from settings.
+
+    Returns:
+        Shared FallbackRouter
+    """
+    global _fallback_router
+
+    if _fallback_router is None:
+        settings = get_settings()
+        _fallback_router = FallbackRouter(
+            chains=settings.llm_fallback_chains,
+            p95_slo=settings.llm_slo_p95_seconds,
+            error_rate_slo=settings.llm_slo_error_rate,
+            min_samples=settings.llm_health_min_samples,
+            probe_seconds=settings.llm_fallback_probe_seconds,
+            window=settings.llm_health_window,
+        )
+    return _fallback_router
@@ -0,0 +1,84 @@
+"""Per-step model and temperature routing.
+
+Each prompt step (research_company, swot, full_report, ...) can run on its
+own model and temperature, so cheap models handle extraction and summary
+steps while stronger ones write the report. Steps without a route use the
+agent's model and temperature.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Mapping, Optional
+
+from src.utils.prompts import EXPECTED_OUTPUT_TOKENS
+
+# Every step an agent sends to the LLM
+STEPS = tuple(EXPECTED_OUTPUT_TOKENS)
+
+
+@dataclass(frozen=True)
+class StepRoute:
+    """Model and temperature for one prompt step (None = agent default)."""
+
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+
+
+def parse_routes(table: Mapping[str, Mapping[str, Any]]) -> Dict[str, StepRoute]:
+    """
+    Build routes from a config or request table.
+
+    Args:
+        table: Mapping of step name to {"model": ..., "temperature": ...}
+
+    Returns:
+        Mapping of step name to StepRoute
+
+    Raises:
+        ValueError: If the table names an unknown step or route field, or
+            a temperature outside 0-2
+    """
+    unknown_steps = set(table) - set(STEPS)
+    if unknown_steps:
+        raise ValueError(f"Unknown routing steps: {sorted(unknown_steps)}")
+
+    field_names = {f.name for f in fields(StepRoute)}
+    routes = {}
+    for step, entry in table.items():
+        unknown = set(entry) - field_names
+        if unknown:
+            raise ValueError(f"Unknown route fields for {step}: {sorted(unknown)}")
+        temperature = entry.get("temperature")
+        if temperature is not None:
+            temperature = float(temperature)
+            if not 0.0 <= temperature <= 2.0:
+                raise ValueError(f"Temperature for {step} must be 0-2")
+        routes[step] = StepRoute(
+            model=entry.get("model") or None, temperature=temperature
+        )
+    return routes
+
+
+def merge_routes(*tables: Mapping[str, StepRoute]) -> Dict[str, StepRoute]:
+    """
+    Layer route tables, later ones overriding earlier ones field by field.
+
+    A request that only sets a step's temperature keeps the configured
+    model for that step.
+
+    Args:
+        *tables: Route tables, lowest precedence first
+
+    Returns:
+        Merged mapping of step name to StepRoute
+    """
+    merged: Dict[str, StepRoute] = {}
+    for table in tables:
+        for step, route in table.items():
+            base = merged.get(step, StepRoute())
+            merged[step] = StepRoute(
+                model=route.model or base.model,
+                temperature=(
+                    base.temperature if route.temperature is None else route.temperature
+                ),
+            )
+    return merged
@@ -63,6 +63,30 @@ Search Results:
 
 Provide analysis with clear trends and supporting evidence."""
 
+RESEARCHER_MAP_SUMMARIZE = """Extract the facts from these search results that are relevant to: {focus}
+
+Search Results:
+{search_context}
+
+Return concise bullet points. Keep the bracketed source number (e.g. [3]) on every fact so it can still be cited. Omit anything irrelevant."""
+
+# Retrieval intents: what each RESEARCHER_ANALYZE_* prompt needs from sources
+RESEARCHER_COMPANY_INTENT = (
+    "company overview founded headquarters employees size products services "
+    "offerings business model revenue pricing customers market share position "
+    "growth metrics funding"
+)
+
+RESEARCHER_COMPETITORS_INTENT = (
+    "competitors alternatives rivals competitive landscape positioning market "
+    "leader share differentiation compared versus comparison strengths"
+)
+
+RESEARCHER_TRENDS_INTENT = (
+    "market trends industry growth drivers demand adoption challenges risks "
+    "regulation outlook forecast future predictions"
+)
+
 # ==============================================================================
 # ANALYST AGENT PROMPTS
 # ==============================================================================
@@ -86,9 +110,9 @@ Your analysis should be:
 
 Use bullet points, clear headings, and strategic language."""
 
-ANALYST_SWOT = """Based on the research data, perform a comprehensive SWOT analysis for {company_name}.
-
-Research Data:
+# Shared by every analyst call and sent as a cacheable prefix; the task
+# prompts below refer to it instead of repeating the research
+ANALYST_RESEARCH_CONTEXT = """Research data for {company_name}:
 
 COMPANY OVERVIEW:
 {company_overview}
@@ -97,7 +121,9 @@ COMPETITORS:
 {competitors}
 
 MARKET TRENDS:
-{market_trends}
+{market_trends}"""
+
+ANALYST_SWOT = """Based on the research data, perform a comprehensive SWOT analysis for {company_name}.
 
 Provide a detailed SWOT analysis with:
 
@@ -119,10 +145,7 @@ THREATS (external negative factors):
 
 Use bullet points and be specific with evidence."""
 
-ANALYST_COMPETITIVE_MATRIX = """Based on the competitor research, create a competitive matrix comparing {company_name} with its main competitors.
-
-Competitor Research:
-{competitors_info}
+ANALYST_COMPETITIVE_MATRIX = """Based on the competitor research in the research data, create a competitive matrix comparing {company_name} with its main competitors.
 
 Create a comparison matrix with these dimensions:
 1. Market Share/Size
@@ -137,13 +160,7 @@ Format as a clear table or structured comparison.
 Include 3-5 main competitors plus {company_name}.
 Use "High/Medium/Low" or specific data points where available."""
 
-ANALYST_POSITIONING = """Analyze the market positioning of {company_name}.
-
-Company Overview:
-{company_overview}
-
-Competitive Landscape:
-{competitors}
+ANALYST_POSITIONING = """Analyze the market positioning of {company_name}, using the company overview and competitive landscape in the research data.
 
 Provide analysis covering:
 
@@ -164,14 +181,11 @@ Provide analysis covering:
 
 Be specific and strategic."""
 
-ANALYST_RECOMMENDATIONS = """Based on the SWOT analysis and market trends, provide strategic recommendations for {company_name}.
+ANALYST_RECOMMENDATIONS = """Based on the SWOT analysis below and the market trends in the research data, provide strategic recommendations for {company_name}.
 
 SWOT ANALYSIS:
 {swot}
 
-MARKET TRENDS:
-{market_trends}
-
 Provide 5-7 actionable strategic recommendations organized by priority:
 
 HIGH PRIORITY (immediate action needed):
@@ -217,18 +231,33 @@ Report format guidelines:
 
 Write for senior executives and decision-makers."""
 
-WRITER_EXECUTIVE_SUMMARY = """Write a concise executive summary for a market intelligence report on {company_name}.
-
-Use this information:
+# Shared by both writer calls and sent as a cacheable prefix
+WRITER_REPORT_CONTEXT = """Research and analysis for {company_name}:
 
 COMPANY OVERVIEW:
 {company_overview}
 
-KEY INSIGHTS FROM SWOT:
+COMPETITIVE LANDSCAPE:
+{competitors}
+
+COMPETITIVE MATRIX:
+{competitive_matrix}
+
+SWOT ANALYSIS:
 {swot}
 
+MARKET POSITIONING:
+{positioning}
+
+MARKET TRENDS:
+{market_trends}
+
 STRATEGIC RECOMMENDATIONS:
-{strategic_recommendations}
+{strategic_recommendations}"""
+
+WRITER_EXECUTIVE_SUMMARY = """Write a concise executive summary for a market intelligence report on {company_name}.
+
+Draw on the company overview, the key insights from the SWOT analysis and the strategic recommendations above.
 
 Requirements:
 - 200-300 words
@@ -240,7 +269,7 @@ Start directly with content (no "Executive Summary" heading)."""
 
 WRITER_FULL_REPORT = """Create a comprehensive market intelligence report for {company_name} in markdown format.
 
-Use all the provided research and analysis data.
+Use all the research and analysis data provided above.
 
 Structure the report as follows:
 
@@ -250,23 +279,22 @@ Structure the report as follows:
 {exec_summary}
 
 ## 1. Company Overview
-{company_overview}
+[Company overview]
 
 ## 2. Competitive Landscape
-{competitors}
-{competitive_matrix}
+[Competitive landscape, including the competitive matrix]
 
 ## 3. SWOT Analysis
-{swot}
+[SWOT analysis]
 
 ## 4. Market Positioning
-{positioning}
+[Market positioning]
 
 ## 5. Market Trends & Insights
-{market_trends}
+[Market trends]
 
 ## 6. Strategic Recommendations
-{strategic_recommendations}
+[Strategic recommendations]
 
 ## 7. Sources
 [List key sources used]
@@ -280,3 +308,23 @@ Format requirements:
 - Include all relevant details
 - Cite sources where appropriate
 - Make it actionable for executives"""
+
+# ==============================================================================
+# EXPECTED OUTPUT SIZES
+# ==============================================================================
+
+# Typical completion tokens per prompt step, used to project a call's cost
+# before it is sent; observed completions refine these at runtime
+EXPECTED_OUTPUT_TOKENS = {
+    "research_map": 400,
+    "research_company": 800,
+    "research_competitors": 800,
+    "research_trends": 800,
+    "swot": 900,
+    "competitive_matrix": 800,
+    "positioning": 700,
+    "recommendations": 800,
+    "executive_summary": 450,
+    "full_report": 3500,
+}
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 800
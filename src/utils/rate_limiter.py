@@ -0,0 +1,309 @@
+"""Async rate and concurrency limiters."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+_model_limiters: Dict[str, "AdaptiveConcurrencyLimiter"] = {}
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter where callers queue instead of failing.
+
+    Each acquire() reserves a token immediately, letting the bucket go
+    negative, and sleeps until that token would have been refilled. This
+    serves callers in arrival order without holding a lock while waiting,
+    so one bucket can be shared by every run in the process.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens refilled per second (sustained requests/second)
+            burst: Bucket capacity (requests allowed back to back)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+        self.acquired = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last update."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds spent queued (0.0 when a token was available)
+        """
+        self._refill()
+        self._tokens -= 1
+        wait = max(0.0, -self._tokens / self.rate)
+
+        self.acquired += 1
+        if wait > 0:
+            self.queued += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            await asyncio.sleep(wait)
+
+        return wait
+
+    def get_stats(self) -> Dict:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dictionary with configuration and queue wait totals
+        """
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "total_wait": round(self.total_wait, 4),
+            "max_wait": round(self.max_wait, 4),
+            "avg_wait": round(self.total_wait / self.acquired, 4)
+            if self.acquired
+            else 0.0,
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency window that adapts AIMD-style to upstream feedback.
+
+    Each success while the window is full grows it by one request per
+    window's worth of successes (additive increase). A 429, or a latency
+    far above the fastest recent one, halves it (multiplicative decrease),
+    at most once per round trip so a burst of 429s from one window counts
+    once. Callers beyond the window queue in arrival order.
+
+    Latencies are compared per key (the prompt step), so a long report is
+    judged against earlier reports rather than against short summaries
+    sharing the model.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 4.0,
+        min_samples: int = 10,
+        window: int = 100,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            name: Label for logs (e.g. the model name)
+            initial: Starting concurrency
+            min_limit: Concurrency never drops below this
+            max_limit: Concurrency never grows beyond this
+            decrease_factor: Window multiplier on congestion
+            latency_tolerance: Latency above this multiple of the fastest
+                recent one counts as congestion (0 disables the signal)
+            min_samples: Latencies needed per key before the latency
+                signal is used for it
+            window: Number of recent latencies kept per key
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_samples = min_samples
+        self.limit = float(min(max(initial, min_limit), max_limit))
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._last_decrease = 0.0
+
+        self.rate_limited = 0
+        self.slow_responses = 0
+        self.decreases = 0
+        self.queued = 0
+        self.total_wait = 0.0
+
+    @property
+    def concurrency(self) -> int:
+        """Requests currently allowed in flight."""
+        return int(self.limit)
+
+    def _grant(self) -> None:
+        """Hand free slots to queued callers in arrival order."""
+        while self._waiters and self.in_flight < self.concurrency:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot in the window.
+
+        Returns:
+            Seconds spent queued (0.0 when a slot was free)
+        """
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            return 0.0
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Granted just before the cancellation
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+        wait = time.monotonic() - start
+        self.total_wait += wait
+        return wait
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        rate_limited: bool = False,
+        key: str = "",
+    ) -> None:
+        """
+        Free a slot and adapt the window to how the request went.
+
+        Args:
+            latency: Seconds the request took (None if it never finished)
+            rate_limited: True if the upstream answered 429
+            key: Kind of request (e.g. the prompt step) whose recent
+                latencies this one is compared with
+        """
+        # Only a full window proves the upstream can take a bigger one
+        saturated = self.in_flight >= self.concurrency or bool(self._waiters)
+        self.in_flight -= 1
+        now = time.monotonic()
+
+        if latency is not None:
+            congested = rate_limited
+            if rate_limited:
+                self.rate_limited += 1
+            elif self._is_slow(latency, key):
+                self.slow_responses += 1
+                congested = True
+            if not rate_limited:
+                if key not in self._latencies:
+                    self._latencies[key] = deque(maxlen=self.window)
+                self._latencies[key].append(latency)
+
+            # Only requests sent after the last decrease may shrink it again
+            if congested and now - latency >= self._last_decrease:
+                self._decrease(now, "rate limited" if rate_limited else "slow")
+            elif not congested and saturated:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+        self._grant()
+
+    def _is_slow(self, latency: float, key: str = "") -> bool:
+        """Whether a latency signals congestion for its kind of request."""
+        recent = self._latencies.get(key, ())
+        if not self.latency_tolerance or len(recent) < self.min_samples:
+            return False
+        return latency > self.latency_tolerance * min(recent)
+
+    def _decrease(self, now: float, reason: str) -> None:
+        """Shrink the window multiplicatively."""
+        previous = self.concurrency
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._last_decrease = now
+        self.decreases += 1
+        logger.info(
+            f"Concurrency for {self.name or 'limiter'} reduced "
+            f"{previous} -> {self.concurrency} ({reason})",
+            extra={
+                "extra_fields": {
+                    "limiter": self.name,
+                    "concurrency": self.concurrency,
+                    "reason": reason,
+                }
+            },
+        )
+
+    def get_stats(self) -> Dict:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dictionary with the current window, load and feedback counters
+        """
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "rate_limited": self.rate_limited,
+            "slow_responses": self.slow_responses,
+            "decreases": self.decreases,
+            "queued": self.queued,
+            "total_wait": round(self.total_wait, 4),
+            "fastest_latency": {
+                key: round(min(recent), 4) for key, recent in self._latencies.items()
+            },
+        }
+
+
+def get_model_limiter(model: str, **kwargs) -> AdaptiveConcurrencyLimiter:
+    """
+    Get the process-wide concurrency limiter for a model.
+
+    Args:
+        model: Model name
+        **kwargs: AdaptiveConcurrencyLimiter options used on first creation
+
+    Returns:
+        Shared limiter for the model
+    """
+    if model not in _model_limiters:
+        _model_limiters[model] = AdaptiveConcurrencyLimiter(name=model, **kwargs)
+    return _model_limiters[model]
+
+
+def get_model_limiter_stats() -> Dict[str, Dict]:
+    """
+    Get the current window and counters of every model limiter.
+
+    Returns:
+        Mapping of model name to limiter statistics
+    """
+    return {model: lim.get_stats() for model, lim in _model_limiters.items()}
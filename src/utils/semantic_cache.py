@@ -0,0 +1,242 @@
+"""Semantic LLM response cache over locally embedded prompts.
+
+The exact-match cache misses prompts whose search context was merely
+re-ordered or trimmed slightly. This tier embeds the non-system part of a
+prompt with the hashing vectorizer and reuses a stored response when the
+cosine similarity to a previous prompt clears the caller's threshold.
+Entries only match calls with the same model, temperature, system prompt
+and entity (the company a report is about), so one company's analysis is
+never served for another whose prompt happens to read alike.
+
+Vectors live in an in-memory float32 matrix. They are persisted as an
+append-only float16 file plus a JSONL side file, and compacted when the
+entry limit is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.messages import BaseMessage
+
+from src.tools.source_index import hash_vectorize
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Compact the files once they hold this much more than max_entries
+_COMPACT_SLACK = 1.25
+
+_semantic_caches: Dict[str, "SemanticCache"] = {}
+
+
+def _scope(
+    model: str, temperature: float, messages: List[BaseMessage], entity: str
+) -> str:
+    """Hash of everything that must match exactly for a reuse."""
+    system = [str(m.content) for m in messages if m.type == "system"]
+    payload = json.dumps([model, temperature, system, entity.casefold()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    """Text compared by similarity: all non-system messages."""
+    return "\n".join(str(m.content) for m in messages if m.type != "system")
+
+
+class SemanticCache:
+    """Similarity-matched LLM responses, shared by every agent in a process."""
+
+    def __init__(
+        self,
+        path: str = "./data/semantic_cache",
+        dim: int = 2048,
+        max_entries: int = 2000,
+        ttl_seconds: float = 604800.0,
+    ):
+        """
+        Load (or create) a semantic cache directory.
+
+        Args:
+            path: Cache directory
+            dim: Hashing vectorizer dimension
+            max_entries: Entries kept before the oldest are evicted
+            ttl_seconds: Age after which entries are no longer reused
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self._vectors_path = self.path / "vectors.f16"
+        self._entries_path = self.path / "entries.jsonl"
+
+        self.entries: List[Dict] = []
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self._load()
+
+        self.reuses = 0
+        self.misses = 0
+
+    def _load(self) -> None:
+        """Read persisted entries, ignoring a half-written tail."""
+        if not self._entries_path.exists() or not self._vectors_path.exists():
+            return
+
+        with open(self._entries_path, "rb") as f:
+            entries = [json.loads(line) for line in f if line.endswith(b"\n")]
+        vectors = np.fromfile(self._vectors_path, dtype=np.float16)
+        rows = min(len(entries), len(vectors) // self.dim)
+
+        self.entries = entries[:rows]
+        self.matrix = (
+            vectors[: rows * self.dim].reshape(rows, self.dim).astype(np.float32)
+        )
+
+        # Rewrite after an interrupted append so both files line up again
+        if rows > self.max_entries or len(vectors) != rows * self.dim:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Keep the newest max_entries and rewrite the files."""
+        self.entries = self.entries[-self.max_entries :]
+        self.matrix = self.matrix[-self.max_entries :]
+
+        tmp_vectors = self._vectors_path.with_suffix(".tmp")
+        tmp_entries = self._entries_path.with_suffix(".tmp")
+        self.matrix.astype(np.float16).tofile(tmp_vectors)
+        tmp_entries.write_text(
+            "".join(json.dumps(e) + "\n" for e in self.entries), encoding="utf-8"
+        )
+        os.replace(tmp_vectors, self._vectors_path)
+        os.replace(tmp_entries, self._entries_path)
+        logger.debug(f"Compacted semantic cache to {len(self.entries)} entries")
+
+    def lookup(
+        self,
+        model: str,
+        temperature: float,
+        messages: List[BaseMessage],
+        threshold: float,
+        entity: str,
+    ) -> Tuple[Optional[Dict], float]:
+        """
+        Find a cached response whose prompt is similar enough to reuse.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            messages: Messages about to be sent
+            threshold: Minimum cosine similarity for a reuse
+            entity: Company the prompt is about; entries of other
+                entities are never candidates
+
+        Returns:
+            Tuple of (reusable entry or None, best similarity found)
+        """
+        scope = _scope(model, temperature, messages, entity)
+        oldest = time.time() - self.ttl_seconds
+
+        with self._lock:
+            candidates = np.array(
+                [
+                    i
+                    for i, e in enumerate(self.entries)
+                    if e["scope"] == scope and e["created"] >= oldest
+                ],
+                dtype=np.int64,
+            )
+            if not len(candidates):
+                self.misses += 1
+                return None, 0.0
+
+            query = hash_vectorize([_prompt_text(messages)], self.dim)[0]
+            similarities = self.matrix[candidates] @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < threshold:
+                self.misses += 1
+                return None, similarity
+            self.reuses += 1
+            return self.entries[candidates[best]], similarity
+
+    def add(
+        self,
+        model: str,
+        temperature: float,
+        messages: List[BaseMessage],
+        content: str,
+        input_tokens: int,
+        output_tokens: int,
+        entity: str,
+    ) -> None:
+        """
+        Store a response for similarity lookups.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            messages: Messages that were sent
+            content: Response text
+            input_tokens: Input tokens of the call
+            output_tokens: Output tokens of the call
+            entity: Company the prompt is about
+        """
+        vector = hash_vectorize([_prompt_text(messages)], self.dim)
+        entry = {
+            "scope": _scope(model, temperature, messages, entity),
+            "created": time.time(),
+            "content": content,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+
+        with self._lock:
+            self.entries.append(entry)
+            self.matrix = np.vstack([self.matrix, vector])
+
+            if len(self.entries) > self.max_entries * _COMPACT_SLACK:
+                self._compact()
+                return
+
+            with open(self._vectors_path, "ab") as f:
+                f.write(vector.astype(np.float16).tobytes())
+            with open(self._entries_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def get_stats(self) -> Dict:
+        """
+        Get reuse statistics.
+
+        Returns:
+            Dictionary with reuses, misses and entry count
+        """
+        return {
+            "reuses": self.reuses,
+            "misses": self.misses,
+            "entries": len(self.entries),
+        }
+
+
+def get_semantic_cache(path: str, **kwargs) -> SemanticCache:
+    """
+    Get the process-wide semantic cache for a directory.
+
+    Args:
+        path: Cache directory
+        **kwargs: SemanticCache options used when it is first opened
+
+    Returns:
+        Shared SemanticCache instance
+    """
+    if path not in _semantic_caches:
+        _semantic_caches[path] = SemanticCache(path, **kwargs)
+    return _semantic_caches[path]
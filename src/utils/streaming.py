@@ -0,0 +1,182 @@
+"""Token streaming sinks for LLM calls.
+
+Agents forward each streamed chunk to registered callbacks as a
+StreamChunk. A callback may be a plain function or a coroutine function.
+When a streamed request fails and is retried, a reset chunk tells sinks
+to discard the text already streamed under that call_id.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+
+@dataclass(frozen=True, slots=True)
+class StreamChunk:
+    """A piece of streamed LLM output."""
+
+    agent: str
+    call_id: str  # Groups the chunks of one LLM call
+    text: str
+    reset: bool = False  # Discard this call's earlier text (attempt failed)
+
+
+StreamCallback = Callable[[StreamChunk], Union[None, Awaitable[None]]]
+
+
+class FileStreamSink:
+    """Append streamed text to a file as it arrives."""
+
+    def __init__(self, path: str):
+        """
+        Initialize file sink.
+
+        Args:
+            path: File to append to (parent directories are created)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._last_call: Optional[str] = None
+
+    def __call__(self, chunk: StreamChunk) -> None:
+        """Write a chunk, separating calls and retries with a header line."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            if chunk.reset:
+                f.write(
+                    f"\n\n--- {chunk.agent} [{chunk.call_id}] retried, "
+                    "discard the text above ---\n"
+                )
+                self._last_call = chunk.call_id
+                return
+            if chunk.call_id != self._last_call:
+                f.write(f"\n\n--- {chunk.agent} [{chunk.call_id}] ---\n")
+                self._last_call = chunk.call_id
+            f.write(chunk.text)
+
+
+class StreamBuffer:
+    """
+    In-memory record of streamed chunks for pollers and subscribers.
+
+    The UI polls latest_text() between refreshes; the API serves
+    subscribe() as server-sent events. Any number of readers can follow
+    the same buffer.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, open buffer."""
+        self.chunks: List[StreamChunk] = []
+        self.closed = False
+        self.closed_at: Optional[float] = None  # time.monotonic() at close
+        self._changed = asyncio.Event()
+
+    def __call__(self, chunk: StreamChunk) -> None:
+        """Record a chunk and wake subscribers."""
+        self.chunks.append(chunk)
+        self._changed.set()
+
+    def close(self) -> None:
+        """Mark the stream finished."""
+        if not self.closed:
+            self.closed = True
+            self.closed_at = time.monotonic()
+        self._changed.set()
+
+    def latest_text(self) -> str:
+        """Text streamed so far by the most recent LLM call's current attempt."""
+        if not self.chunks:
+            return ""
+        call_id = self.chunks[-1].call_id
+        text: List[str] = []
+        for chunk in self.chunks:
+            if chunk.call_id != call_id:
+                continue
+            if chunk.reset:
+                text.clear()
+            else:
+                text.append(chunk.text)
+        return "".join(text)
+
+    async def subscribe(self, start: int = 0) -> AsyncIterator[StreamChunk]:
+        """
+        Yield chunks from an index onwards until the buffer is closed.
+
+        Args:
+            start: Index of the first chunk to yield
+
+        Yields:
+            StreamChunk objects in arrival order
+        """
+        position = start
+        while True:
+            while position < len(self.chunks):
+                yield self.chunks[position]
+                position += 1
+            if self.closed:
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+
+class StreamBufferStore:
+    """
+    Stream buffers by run ID, evicted a grace period after they close.
+
+    Closed buffers stay readable for ttl_seconds so late subscribers can
+    still replay a finished run. Expired buffers are dropped on the next
+    access, the way the caches drop expired entries; subscribers already
+    following one keep their reference.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            ttl_seconds: Time a closed buffer is kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self._buffers: Dict[str, StreamBuffer] = {}
+
+    def _evict(self) -> None:
+        """Drop buffers closed longer than ttl_seconds ago."""
+        oldest = time.monotonic() - self.ttl_seconds
+        expired = [
+            run_id
+            for run_id, buffer in self._buffers.items()
+            if buffer.closed_at is not None and buffer.closed_at < oldest
+        ]
+        for run_id in expired:
+            del self._buffers[run_id]
+
+    def open(self, run_id: str) -> StreamBuffer:
+        """
+        Get a run's buffer, creating it if needed.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            The run's StreamBuffer
+        """
+        self._evict()
+        return self._buffers.setdefault(run_id, StreamBuffer())
+
+    def get(self, run_id: str) -> Optional[StreamBuffer]:
+        """
+        Get a run's buffer unless it is unknown or expired.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            The run's StreamBuffer, or None
+        """
+        self._evict()
+        return self._buffers.get(run_id)
+
+    def __len__(self) -> int:
+        """Number of buffers held, including expired ones not yet evicted."""
+        return len(self._buffers)
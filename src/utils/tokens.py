@@ -0,0 +1,60 @@
+"""Lightweight token estimation for prompt sizing."""
+
+from typing import Any, List, Sequence, Union
+
+from langchain_core.messages import BaseMessage
+
+# Average characters per token for English prose with GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+# Role and separator tokens each chat message adds
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def message_text(content: Union[str, List[Any]]) -> str:
+    """
+    Get the text of a message's content.
+
+    Args:
+        content: String content, or a list of content parts
+
+    Returns:
+        Text of the string or of all text parts
+    """
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part if isinstance(part, str) else str(part.get("text", "")) for part in content
+    )
+
+
+def estimate_message_tokens(messages: Sequence[BaseMessage]) -> int:
+    """
+    Estimate the prompt tokens of a chat request.
+
+    Args:
+        messages: Messages about to be sent
+
+    Returns:
+        Approximate input token count
+    """
+    return sum(
+        MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message_text(m.content))
+        for m in messages
+    )
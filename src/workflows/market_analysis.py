@@ -1,15 +1,22 @@
 """Main LangGraph workflow for market intelligence."""
 
+import asyncio
+from typing import Any, Mapping
+
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.checkpoint.memory import MemorySaver
 
-from src.workflows.types import IntelligenceState
+from src.workflows.types import AnalysisOutput, IntelligenceState
 from src.agents.researcher import ResearchAgent
 from src.agents.analyst import AnalysisAgent
 from src.agents.writer import WriterAgent
+from src.tools.entity_resolver import EntityResolver
+from src.utils.config import get_settings
 from src.utils.cost_tracker import CostTracker, BudgetExceededError
 from src.utils.logging import setup_logger
+from src.utils.model_routing import parse_routes
+from src.utils.streaming import FileStreamSink, StreamCallback
 
 logger = setup_logger(__name__)
 
@@ -31,6 +38,9 @@ class MarketIntelligenceWorkflow:
         checkpoint_path: str = "./checkpoints.db",
         max_budget: float = 2.0,
         model_name: str | None = None,
+        use_llm_cache: bool = True,
+        model_routes: Mapping[str, Mapping[str, Any]] | None = None,
+        refresh_sources: bool = False,
     ):
         """
         Initialize workflow.
@@ -39,21 +49,50 @@ class MarketIntelligenceWorkflow:
             checkpoint_path: Path to SQLite checkpoint database
             max_budget: Maximum cost per run in USD
             model_name: Name of the LLM model to use
+            use_llm_cache: Set False for non-deterministic runs that must
+                not reuse cached LLM responses
+            model_routes: Per-step {"model": ..., "temperature": ...}
+                overrides for this run, layered over the configured routes
+            refresh_sources: Set True to search the web for every topic even
+                when the local source index already covers it
+
+        Raises:
+            ValueError: If model_routes names an unknown step or field
         """
         self.max_budget = max_budget
-        self.cost_tracker = CostTracker()
+        self.cost_tracker = CostTracker(budget=max_budget)
         self.checkpoint_path = checkpoint_path
         self.model_name = model_name
+        routes = parse_routes(model_routes or {})
 
         # Initialize agents (shared cost tracker)
         self.research_agent = ResearchAgent(
-            cost_tracker=self.cost_tracker, model=model_name
+            cost_tracker=self.cost_tracker, model=model_name, routes=routes
         )
         self.analysis_agent = AnalysisAgent(
-            cost_tracker=self.cost_tracker, model=model_name
+            cost_tracker=self.cost_tracker, model=model_name, routes=routes
         )
         self.writer_agent = WriterAgent(
-            cost_tracker=self.cost_tracker, model=model_name
+            cost_tracker=self.cost_tracker, model=model_name, routes=routes
+        )
+
+        if not use_llm_cache:
+            for agent in (self.research_agent, self.analysis_agent, self.writer_agent):
+                agent.response_cache = None
+                agent.semantic_cache = None
+        self.research_agent.refresh_sources = refresh_sources
+
+        settings = get_settings()
+        if settings.llm_stream_log_path:
+            self.add_stream_callback(FileStreamSink(settings.llm_stream_log_path))
+
+        self.entity_resolver = (
+            EntityResolver(
+                settings.entity_alias_path,
+                fuzzy_threshold=settings.entity_fuzzy_threshold,
+            )
+            if settings.entity_resolution_enabled
+            else None
         )
 
         # Build workflow graph blueprint
@@ -61,6 +100,45 @@ class MarketIntelligenceWorkflow:
 
         logger.info("Market Intelligence Workflow initialized")
 
+    def add_stream_callback(self, callback: StreamCallback) -> None:
+        """
+        Stream every agent's LLM output to a callback.
+
+        Args:
+            callback: Function or coroutine function taking a StreamChunk
+        """
+        for agent in (self.research_agent, self.analysis_agent, self.writer_agent):
+            agent.add_stream_callback(callback)
+
+    def _check_projected_budget(self, step: str, projected: float) -> None:
+        """
+        Refuse to start a step whose projected cost would exceed the budget.
+
+        Args:
+            step: Workflow step about to run
+            projected: Projected cost of the step and everything after it
+
+        Raises:
+            BudgetExceededError: If spent plus projected cost exceeds max_budget
+        """
+        spent = self.cost_tracker.total_cost
+        logger.info(
+            f"Projected cost from {step}: ${projected:.4f}",
+            extra={
+                "extra_fields": {
+                    "step": step,
+                    "spent": round(spent, 6),
+                    "projected": round(projected, 6),
+                    "budget": self.max_budget,
+                }
+            },
+        )
+        if spent + projected > self.max_budget:
+            raise BudgetExceededError(
+                f"Projected cost ${spent + projected:.4f} from {step} "
+                f"exceeds budget ${self.max_budget:.2f}"
+            )
+
     def _build_graph(self) -> StateGraph:
         """Build LangGraph workflow."""
         # Initialize graph
@@ -82,7 +160,11 @@ class MarketIntelligenceWorkflow:
             {"analysis": "analysis", "end": END},
         )
 
-        graph.add_edge("analysis", "writing")
+        graph.add_conditional_edges(
+            "analysis",
+            self._should_continue_to_writing,
+            {"writing": "writing", "end": END},
+        )
         graph.add_edge("writing", "human_review")
 
         graph.add_conditional_edges(
@@ -129,6 +211,12 @@ class MarketIntelligenceWorkflow:
         try:
             # Check budget before expensive analysis
             self.cost_tracker.check_budget(self.max_budget)
+            research_data = state["research_data"]
+            self._check_projected_budget(
+                "analysis",
+                self.analysis_agent.project_cost(research_data)
+                + self.writer_agent.project_cost(research_data),
+            )
 
             # Run analysis agent
             analysis_results = await self.analysis_agent.run(
@@ -164,18 +252,22 @@ class MarketIntelligenceWorkflow:
         logger.info(f"Writing node: {state['company_name']}")
 
         try:
+            analysis_data: AnalysisOutput = {
+                "company_name": state["company_name"],
+                "swot": state.get("swot", ""),
+                "competitive_matrix": state.get("competitive_matrix", ""),
+                "positioning": state.get("positioning", ""),
+                "strategic_recommendations": state.get("strategic_recommendations", ""),
+            }
+            self._check_projected_budget(
+                "writing",
+                self.writer_agent.project_cost(state["research_data"], analysis_data),
+            )
+
             # Run writer agent
             report_results = await self.writer_agent.run(
                 research_data=state["research_data"],
-                analysis_data={
-                    "company_name": state["company_name"],
-                    "swot": state.get("swot", ""),
-                    "competitive_matrix": state.get("competitive_matrix", ""),
-                    "positioning": state.get("positioning", ""),
-                    "strategic_recommendations": state.get(
-                        "strategic_recommendations", ""
-                    ),
-                },
+                analysis_data=analysis_data,
             )
 
             # Get cost summary
@@ -189,8 +281,15 @@ class MarketIntelligenceWorkflow:
                 "report_metadata": report_results.get("metadata", {}),
                 "total_cost": cost_summary["total_cost"],
                 "total_tokens": cost_summary["total_tokens"],
+                "cost_by_step": cost_summary["by_step"],
             }
 
+        except BudgetExceededError as e:
+            logger.error(f"Budget exceeded: {e}")
+            return {
+                "errors": [f"Budget exceeded: {str(e)}"],
+                "current_agent": "writing",
+            }
         except Exception as e:
             logger.error(f"Writing node failed: {e}")
             return {
@@ -223,6 +322,15 @@ class MarketIntelligenceWorkflow:
 
         return "analysis"
 
+    def _should_continue_to_writing(self, state: IntelligenceState) -> str:
+        """Decide whether to continue to writing or end."""
+        # Analysis failed or its projected cost was refused
+        if state.get("errors"):
+            logger.warning("Analysis had errors, ending workflow")
+            return "end"
+
+        return "writing"
+
     def _check_approval(self, state: IntelligenceState) -> str:
         """Check if report is approved or needs revision."""
         # Check max revisions
@@ -260,6 +368,12 @@ class MarketIntelligenceWorkflow:
         Returns:
             Final state dictionary
         """
+        # Canonical name first, so equivalent requests share search/LLM caches
+        if self.entity_resolver is not None:
+            company_name = await asyncio.to_thread(
+                self.entity_resolver.resolve, company_name
+            )
+
         logger.info(f"Starting workflow for: {company_name}")
 
         # Initial state
@@ -289,6 +403,7 @@ class MarketIntelligenceWorkflow:
             "iteration": 0,
             "total_cost": 0.0,
             "total_tokens": 0,
+            "cost_by_step": {},
             "errors": [],
             "human_feedback": None,
             "approved": False,
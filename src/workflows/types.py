@@ -3,6 +3,8 @@
 from typing import Annotated, Any, Dict, List, Literal, TypedDict, Union
 import operator
 
+from src.tools.source import Source
+
 
 class ResearchOutput(TypedDict):
     """Output structure for Research Agent."""
@@ -12,7 +14,7 @@ class ResearchOutput(TypedDict):
     company_overview: str
     competitors: str
     market_trends: str
-    raw_sources: List[Any]
+    raw_sources: List[Source]
 
 
 class AnalysisOutput(TypedDict):
@@ -49,7 +51,7 @@ class IntelligenceState(TypedDict):
     research_data: ResearchOutput
     competitors: str  # Markdown string from analysis
     market_trends: str  # Markdown string from analysis
-    raw_sources: List[Any]
+    raw_sources: List[Source]
 
     # Analysis phase outputs
     swot: str
@@ -67,6 +69,7 @@ class IntelligenceState(TypedDict):
     iteration: int
     total_cost: float
     total_tokens: int
+    cost_by_step: Dict[str, Dict[str, Any]]  # Cost and latency per prompt step
     errors: Annotated[List[str], operator.add]  # Accumulate errors across nodes
 
     # Human-in-the-loop
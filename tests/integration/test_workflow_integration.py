@@ -1,5 +1,8 @@
 """Integration tests for workflow error handling and cost limits."""
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock
 
@@ -55,6 +58,30 @@ class TestWorkflowErrorRecovery:
         # Should have errors about budget
         assert len(result.get("errors", [])) > 0 or result["total_cost"] < 0.001
 
+    async def test_analysis_error_skips_writing(self):
+        """Test a failed or refused analysis ends the run before writing."""
+        workflow = MarketIntelligenceWorkflow(checkpoint_path=":memory:")
+        workflow.research_agent.run = AsyncMock(
+            return_value={
+                "company_name": "Test Company",
+                "competitors": "Competitor A",
+                "market_trends": "Market growing",
+                "raw_sources": [],
+                "industry": "Tech",
+                "company_overview": "Overview",
+            }
+        )
+        workflow.analysis_agent.run = AsyncMock(side_effect=Exception("LLM down"))
+        workflow.writer_agent.run = AsyncMock()
+
+        result = await workflow.run(
+            company_name="Test Company", thread_id="test-analysis-error-1"
+        )
+
+        assert result["errors"] == ["Analysis failed: LLM down"]
+        assert result["current_agent"] == "analysis"
+        workflow.writer_agent.run.assert_not_called()
+
 
 @pytest.mark.asyncio
 class TestWorkflowIntegration:
@@ -103,6 +130,65 @@ class TestWorkflowIntegration:
         assert "Test summary" in result["executive_summary"]
         assert result["total_cost"] == 0.0
 
+    async def test_equivalent_company_names_research_the_same_entity(self):
+        """Test name variants are resolved to one canonical company."""
+        workflow = MarketIntelligenceWorkflow(checkpoint_path=":memory:")
+        workflow.research_agent.run = AsyncMock(side_effect=Exception("stop"))
+
+        for i, name in enumerate(["Initech Inc.", "initech", "Initech Model 2"]):
+            await workflow.run(company_name=name, thread_id=f"test-entity-{i}")
+
+        researched = [
+            call.kwargs["company_name"]
+            for call in workflow.research_agent.run.call_args_list
+        ]
+        assert researched == ["Initech"] * 3
+
+
+@pytest.mark.asyncio
+class TestConcurrentWorkflows:
+    """Test that concurrent runs share the event loop fairly."""
+
+    async def test_concurrent_workflows_overlap_search_latency(self):
+        """Test N workflows overlap their search latency instead of adding it up."""
+        search_latency = 0.2
+        num_workflows = 4
+
+        async def slow_search(**kwargs):
+            await asyncio.sleep(search_latency)
+            return {"query": kwargs["query"], "results": [{"url": "a.com"}]}
+
+        workflows = []
+        for _ in range(num_workflows):
+            workflow = MarketIntelligenceWorkflow(checkpoint_path=":memory:")
+            workflow.research_agent.search_tool.backend.client = AsyncMock()
+            workflow.research_agent.search_tool.backend.client.search = slow_search
+            for agent in (
+                workflow.research_agent,
+                workflow.analysis_agent,
+                workflow.writer_agent,
+            ):
+                agent._invoke_llm = AsyncMock(return_value="LLM output")
+            workflows.append(workflow)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                workflow.run(
+                    company_name=f"Company {i}",
+                    industry="Tech",
+                    thread_id=f"test-concurrent-{i}",
+                )
+                for i, workflow in enumerate(workflows)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        # Each run issues three searches; sequential runs would take N times longer
+        serial_latency = num_workflows * 3 * search_latency
+        assert elapsed < serial_latency / 2
+        assert all(not result["errors"] for result in results)
+
 
 class TestWorkflowCheckpointing:
     """Test checkpoint persistence and recovery."""
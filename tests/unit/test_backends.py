@@ -0,0 +1,135 @@
+"""Unit tests for pluggable search backends."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tools.backends import (
+    FixtureBackend,
+    HedgedBackend,
+    SearchBackend,
+    create_backend,
+)
+from src.utils.config import get_settings
+
+
+class StaticBackend(SearchBackend):
+    """Backend returning a fixed response after a delay."""
+
+    def __init__(self, name: str, latency: float = 0.0, error: bool = False):
+        self.name = name
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+
+    async def search(self, query, max_results=5, search_depth="advanced", **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise RuntimeError(f"{self.name} down")
+        return {"query": query, "results": [{"url": f"https://{self.name}.com"}]}
+
+
+@pytest.mark.asyncio
+async def test_fixture_backend_records_and_replays(tmp_path):
+    """Test fixtures are recorded once and replayed offline."""
+    live = StaticBackend("live")
+    recorder = FixtureBackend(path=str(tmp_path), record_from=live)
+
+    recorded = await recorder.search("tesla overview", max_results=5)
+    replayed = await FixtureBackend(path=str(tmp_path)).search(
+        "tesla overview", max_results=5
+    )
+
+    assert replayed == recorded
+    assert live.calls == 1
+    assert (await FixtureBackend(path=str(tmp_path)).search("unknown"))["results"] == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_backend_returns_fast_secondary_when_primary_slow():
+    """Test the hedge fires after the delay and wins the race."""
+    primary = StaticBackend("slow", latency=1.0)
+    secondary = StaticBackend("fast", latency=0.01)
+    hedged = HedgedBackend(primary, secondary, initial_delay=0.05)
+
+    start = time.perf_counter()
+    response = await hedged.search("query")
+
+    assert time.perf_counter() - start < 0.5
+    assert response["results"][0]["url"] == "https://fast.com"
+    assert hedged.get_stats()["hedges_won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_backend_skips_hedge_when_primary_fast():
+    """Test no second request is sent when the primary answers in time."""
+    primary = StaticBackend("primary")
+    secondary = StaticBackend("secondary")
+    hedged = HedgedBackend(primary, secondary, initial_delay=0.5)
+
+    response = await hedged.search("query")
+
+    assert response["results"][0]["url"] == "https://primary.com"
+    assert secondary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_backend_fails_over_on_error():
+    """Test a failing primary triggers the secondary immediately."""
+    hedged = HedgedBackend(
+        StaticBackend("broken", error=True),
+        StaticBackend("backup"),
+        initial_delay=5.0,
+    )
+
+    response = await hedged.search("query")
+
+    assert response["results"][0]["url"] == "https://backup.com"
+
+
+@pytest.mark.asyncio
+async def test_hedged_backend_records_cancelled_and_failed_primaries():
+    """Test primaries that lose to the hedge or fail still add a sample."""
+    slow = HedgedBackend(
+        StaticBackend("slow", latency=1.0),
+        StaticBackend("fast"),
+        initial_delay=0.05,
+    )
+    await slow.search("query")
+
+    assert len(slow._latencies) == 1
+    assert slow._latencies[0] >= 0.05
+
+    broken = HedgedBackend(
+        StaticBackend("broken", error=True), StaticBackend("backup"), initial_delay=5.0
+    )
+    await broken.search("query")
+
+    assert len(broken._latencies) == 1
+
+
+def test_hedge_delay_tracks_primary_p95():
+    """Test the hedge delay switches to p95 once enough samples exist."""
+    hedged = HedgedBackend(
+        StaticBackend("a"), StaticBackend("b"), initial_delay=2.0, min_samples=20
+    )
+    assert hedged.hedge_delay == 2.0
+
+    hedged._latencies.extend([0.1] * 19 + [0.9])
+    assert hedged.hedge_delay == 0.1
+
+    hedged._latencies.extend([0.9] * 5)
+    assert hedged.hedge_delay == 0.9
+
+
+def test_create_backend_requires_brave_key():
+    """Test Brave backend needs an API key."""
+    settings = get_settings()
+    settings.brave_search_api_key = None
+
+    with pytest.raises(ValueError, match="BRAVE_SEARCH_API_KEY"):
+        create_backend("brave", settings)
+    with pytest.raises(ValueError, match="Unknown search backend"):
+        create_backend("bing", settings)
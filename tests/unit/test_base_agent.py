@@ -3,8 +3,15 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
 from src.agents.base import BaseAgent
-from src.utils.cost_tracker import CostTracker
+from src.agents.writer import WriterAgent
+from src.utils.cost_projection import OutputTokenModel
+from src.utils.cost_tracker import BudgetExceededError, CostTracker
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.model_health import FallbackRouter
+from src.utils.model_routing import StepRoute
 
 
 class MockAgent(BaseAgent):
@@ -27,6 +34,8 @@ async def test_base_agent_initialization():
             default_model="x-ai/grok-4.1-fast:free",
             openrouter_api_key="test-key",
             openrouter_base_url="https://openrouter.ai/api/v1",
+            llm_cache_enabled=False,
+            semantic_cache_enabled=False,
         )
 
         agent = MockAgent(
@@ -49,6 +58,8 @@ async def test_base_agent_uses_default_model():
             default_model="x-ai/grok-4.1-fast:free",
             openrouter_api_key="test-key",
             openrouter_base_url="https://openrouter.ai/api/v1",
+            llm_cache_enabled=False,
+            semantic_cache_enabled=False,
         )
 
         agent = MockAgent(name="TestAgent")
@@ -64,6 +75,8 @@ async def test_create_messages():
             default_model="test-model",
             openrouter_api_key="test-key",
             openrouter_base_url="https://test.com",
+            llm_cache_enabled=False,
+            semantic_cache_enabled=False,
         )
 
         agent = MockAgent(name="TestAgent")
@@ -85,6 +98,8 @@ async def test_get_cost_summary():
             default_model="test-model",
             openrouter_api_key="test-key",
             openrouter_base_url="https://test.com",
+            llm_cache_enabled=False,
+            semantic_cache_enabled=False,
         )
 
         agent = MockAgent(name="TestAgent", cost_tracker=tracker)
@@ -97,3 +112,346 @@ async def test_get_cost_summary():
         assert summary["total_input_tokens"] == 1000
         assert summary["total_output_tokens"] == 500
         assert summary["calls"] == 1
+
+
+class FakeLLM:
+    """Chat model stand-in returning a fixed reply with usage metadata."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(
+            content=f"reply {self.calls}",
+            response_metadata={
+                "usage": {"prompt_tokens": 1000, "completion_tokens": 500}
+            },
+        )
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        for token in ["rep", "ly ", str(self.calls)]:
+            yield AIMessageChunk(content=token)
+        yield AIMessageChunk(
+            content="",
+            usage_metadata={
+                "input_tokens": 1000,
+                "output_tokens": 500,
+                "total_tokens": 1500,
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_served_from_cache():
+    """Test repeated prompts hit the cache and are tracked as free calls."""
+    tracker = CostTracker()
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+
+    first = await agent._invoke_llm(agent._create_messages("hello"))
+    second = await agent._invoke_llm(agent._create_messages("hello"))
+    other = await agent._invoke_llm(agent._create_messages("different"))
+    fresh = await agent._invoke_llm(agent._create_messages("hello"), use_cache=False)
+
+    assert (first, second, other, fresh) == ("reply 1", "reply 1", "reply 2", "reply 3")
+    summary = tracker.get_summary()
+    assert summary["calls"] == 4
+    assert summary["cached_calls"] == 1
+    assert summary["total_input_tokens"] == 3000
+    assert summary["cost_saved"] == round(
+        tracker.calculate_cost("openai/gpt-5-mini", 1000, 500), 4
+    )
+    assert tracker.total_cost == pytest.approx(
+        3 * tracker.calculate_cost("openai/gpt-5-mini", 1000, 500)
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_model_and_temperature():
+    """Test different models or temperatures never share cache entries."""
+    messages = [HumanMessage(content="hello")]
+
+    key = LLMResponseCache.make_llm_key("a", 0.3, messages)
+
+    assert key == LLMResponseCache.make_llm_key("a", 0.3, messages)
+    assert key != LLMResponseCache.make_llm_key("b", 0.3, messages)
+    assert key != LLMResponseCache.make_llm_key("a", 0.7, messages)
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_reuses_near_identical_prompts():
+    """Test agents with a threshold reuse responses to re-ordered prompts."""
+    tracker = CostTracker()
+    agent = MockAgent(name="WriterAgent", cost_tracker=tracker)
+    agent.response_cache = None  # Isolate the semantic tier
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+    snippets = ["Acme revenue grew 20 percent", "Acme hired 500 engineers"]
+
+    first = await agent._invoke_llm(
+        agent._create_messages(" ".join(snippets)), entity="Acme"
+    )
+    second = await agent._invoke_llm(
+        agent._create_messages(" ".join(snippets[::-1])), entity="Acme"
+    )
+    other = await agent._invoke_llm(
+        agent._create_messages(" ".join(snippets)), entity="Globex"
+    )
+    unscoped = await agent._invoke_llm(agent._create_messages(" ".join(snippets)))
+
+    assert first == second == "reply 1"
+    assert (other, unscoped) == ("reply 2", "reply 3")
+    assert tracker.get_summary()["cached_calls"] == 1
+    assert agent.semantic_cache.get_stats()["reuses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_agents_without_threshold_skip_semantic_cache():
+    """Test agents not listed in the thresholds never reuse by similarity."""
+    agent = MockAgent(name="ResearchAgent")
+
+    assert agent.semantic_cache is None
+
+
+@pytest.mark.asyncio
+async def test_streaming_forwards_chunks_and_tracks_usage():
+    """Test registered callbacks receive tokens and usage is still costed."""
+    tracker = CostTracker()
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+    received = []
+
+    async def async_sink(chunk):
+        received.append(("async", chunk.text))
+
+    agent.add_stream_callback(lambda chunk: received.append(("sync", chunk.text)))
+    agent.add_stream_callback(async_sink)
+
+    content = await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert content == "reply 1"
+    assert [t for kind, t in received if kind == "sync"] == ["rep", "ly ", "1"]
+    assert [t for kind, t in received if kind == "async"] == ["rep", "ly ", "1"]
+    summary = tracker.get_summary()
+    assert summary["total_input_tokens"] == 1000
+    assert summary["total_output_tokens"] == 500
+
+
+@pytest.mark.asyncio
+async def test_streaming_replays_cache_hits_and_survives_failing_sink():
+    """Test cached responses reach sinks in one chunk despite a broken sink."""
+    agent = MockAgent(name="TestAgent")
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+    received = []
+
+    def broken_sink(chunk):
+        raise RuntimeError("sink down")
+
+    agent.add_stream_callback(broken_sink)
+    agent.add_stream_callback(lambda chunk: received.append(chunk))
+
+    await agent._invoke_llm(agent._create_messages("hello"))
+    cached = await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert cached == "reply 1"
+    assert received[-1].text == "reply 1"
+    assert received[-1].call_id != received[0].call_id
+
+
+@pytest.mark.asyncio
+async def test_shared_context_forms_a_stable_prefix():
+    """Test shared context follows the system prompt, marked where needed."""
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini")
+
+    first = agent._create_messages("task one", shared_context="research")
+    second = agent._create_messages("task two", shared_context="research")
+    openai = agent._mark_shared_context(first, "openai/gpt-5-mini")
+    anthropic = agent._mark_shared_context(first, "anthropic/claude-sonnet-4.5")
+
+    assert first[:2] == second[:2]
+    assert first[1].content == "research"
+    assert first[2].content == "task one"
+    assert openai == first
+    assert anthropic[1].content == [
+        {"type": "text", "text": "research", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert anthropic[2] == first[2]
+
+
+class PromptCachingLLM:
+    """Chat model stand-in reporting prompt-cache reads in usage metadata."""
+
+    async def ainvoke(self, messages, **kwargs):
+        return AIMessage(
+            content="reply",
+            usage_metadata={
+                "input_tokens": 1000,
+                "output_tokens": 100,
+                "total_tokens": 1100,
+                "input_token_details": {"cache_read": 800},
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_reads_are_tracked():
+    """Test cached prompt tokens from usage metadata reach the tracker."""
+    tracker = CostTracker()
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.llm = agent._llms[agent.model_name] = PromptCachingLLM()
+
+    await agent._invoke_llm(agent._create_messages("hello", shared_context="ctx"))
+
+    summary = tracker.get_summary()
+    assert summary["cache_read_tokens"] == 800
+    assert tracker.total_cost == pytest.approx(
+        tracker.calculate_cost("openai/gpt-5-mini", 1000, 100, cache_read_tokens=800)
+    )
+    assert tracker.total_cost < tracker.calculate_cost("openai/gpt-5-mini", 1000, 100)
+
+
+@pytest.mark.asyncio
+async def test_calls_over_projected_budget_are_not_sent():
+    """Test admission rejects a call before it reaches the LLM."""
+    tracker = CostTracker(budget=0.0001)
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.output_model = OutputTokenModel(priors={"big_step": 100_000})
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+
+    with pytest.raises(BudgetExceededError):
+        await agent._invoke_llm(agent._create_messages("hello"), step="big_step")
+
+    assert agent.llm.calls == 0
+    assert tracker.rejected_calls == 1
+    assert tracker.reserved_cost == 0.0
+
+
+@pytest.mark.asyncio
+async def test_completed_calls_refine_expected_output():
+    """Test completion sizes feed the output model and release reservations."""
+    tracker = CostTracker(budget=1.0)
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.output_model = OutputTokenModel(priors={"step": 100}, alpha=0.5)
+    agent.llm = agent._llms[agent.model_name] = FakeLLM()
+
+    await agent._invoke_llm(agent._create_messages("hello"), step="step")
+
+    # FakeLLM reports 500 completion tokens
+    assert agent.output_model.expected("step") == 300
+    assert tracker.reserved_cost == 0.0
+
+
+class RecordingLLM(FakeLLM):
+    """FakeLLM that records the keyword arguments of each call."""
+
+    def __init__(self):
+        super().__init__()
+        self.kwargs = []
+        self.messages = []
+
+    async def ainvoke(self, messages, **kwargs):
+        self.kwargs.append(kwargs)
+        self.messages.append(messages)
+        return await super().ainvoke(messages, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_routed_steps_use_their_model_and_temperature():
+    """Test a step's route picks the client and temperature of the call."""
+    tracker = CostTracker()
+    agent = MockAgent(
+        name="TestAgent",
+        model="openai/gpt-5-mini",
+        cost_tracker=tracker,
+        routes={"full_report": StepRoute("openai/gpt-5-nano", 0.1)},
+    )
+    agent.response_cache = None
+    default_llm, routed_llm = RecordingLLM(), RecordingLLM()
+    agent.llm = agent._llms[agent.model_name] = default_llm
+    agent._llms["openai/gpt-5-nano"] = routed_llm
+
+    await agent._invoke_llm(agent._create_messages("report"), step="full_report")
+    await agent._invoke_llm(agent._create_messages("summary"), step="swot")
+
+    assert routed_llm.kwargs == [{"temperature": 0.1}]
+    assert default_llm.kwargs == [{}]
+    by_step = tracker.get_summary()["by_step"]
+    assert by_step["full_report"]["models"] == ["openai/gpt-5-nano"]
+    assert by_step["swot"]["models"] == ["openai/gpt-5-mini"]
+
+
+@pytest.mark.asyncio
+async def test_cache_markers_follow_the_routed_model():
+    """Test a step routed to a marker-caching model gets cache_control."""
+    agent = MockAgent(
+        name="TestAgent",
+        model="openai/gpt-5-mini",
+        routes={"full_report": StepRoute("anthropic/claude-sonnet-4.5")},
+    )
+    agent.response_cache = None
+    default_llm, routed_llm = RecordingLLM(), RecordingLLM()
+    agent.llm = agent._llms[agent.model_name] = default_llm
+    agent._llms["anthropic/claude-sonnet-4.5"] = routed_llm
+    messages = agent._create_messages("task", shared_context="research")
+
+    await agent._invoke_llm(messages, step="full_report")
+    await agent._invoke_llm(messages, step="swot")
+
+    assert routed_llm.messages[0][1].content[0]["cache_control"] == {
+        "type": "ephemeral"
+    }
+    assert default_llm.messages[0][1].content == "research"
+
+
+@pytest.mark.asyncio
+async def test_writer_reports_the_models_each_step_used():
+    """Test report metadata lists routed models rather than the default."""
+    writer = WriterAgent(
+        model="openai/gpt-5-mini",
+        routes={"full_report": StepRoute("openai/gpt-5-nano")},
+    )
+    writer.response_cache = None
+    writer.semantic_cache = None
+    writer.llm = writer._llms[writer.model_name] = FakeLLM()
+    writer._llms["openai/gpt-5-nano"] = FakeLLM()
+
+    result = await writer.run(
+        research_data={"company_name": "Acme", "raw_sources": []},
+        analysis_data={"company_name": "Acme"},
+    )
+
+    assert result["metadata"]["models_used"] == {
+        "executive_summary": ["openai/gpt-5-mini"],
+        "full_report": ["openai/gpt-5-nano"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_calls_fall_back_while_model_breaches_slo():
+    """Test a degraded model's calls go to its alternate and feed its stats."""
+    tracker = CostTracker()
+    agent = MockAgent(name="TestAgent", model="openai/gpt-5-mini", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.fallback_router = FallbackRouter(
+        chains={"openai/gpt-5-mini": ["openai/gpt-5-nano"]},
+        p95_slo=10.0,
+        min_samples=2,
+    )
+    for _ in range(2):
+        agent.fallback_router.record("openai/gpt-5-mini", 30.0, ok=True)
+    primary_llm, alternate_llm = FakeLLM(), FakeLLM()
+    agent.llm = agent._llms[agent.model_name] = primary_llm
+    agent._llms["openai/gpt-5-nano"] = alternate_llm
+
+    await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert (primary_llm.calls, alternate_llm.calls) == (0, 1)
+    assert (
+        tracker.get_summary()["by_model"]["openai/gpt-5-nano"]["output_tokens"] == 500
+    )
+    models = agent.fallback_router.get_stats()["models"]
+    assert models["openai/gpt-5-nano"]["samples"] == 1
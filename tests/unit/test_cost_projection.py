@@ -0,0 +1,46 @@
+"""Unit tests for pre-flight cost projection."""
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.utils.cost_projection import OutputTokenModel
+from src.utils.tokens import MESSAGE_OVERHEAD_TOKENS, estimate_message_tokens
+
+
+def test_output_model_starts_from_priors():
+    """Test unseen steps use their prior or the default."""
+    model = OutputTokenModel(priors={"swot": 900}, default=500)
+
+    assert model.expected("swot") == 900
+    assert model.expected("unknown") == 500
+
+
+def test_output_model_moves_towards_observations():
+    """Test observed completion sizes update the expectation by EWMA."""
+    model = OutputTokenModel(priors={"swot": 1000}, alpha=0.5)
+
+    model.observe("swot", 2000)
+    assert model.expected("swot") == 1500
+
+    model.observe("swot", 2000)
+    assert model.expected("swot") == 1750
+
+    stats = model.get_stats()
+    assert stats["swot"] == {"expected_tokens": 1750, "observations": 2}
+
+
+def test_estimate_message_tokens_counts_text_parts_and_overhead():
+    """Test content-part messages are measured by their text."""
+    messages = [
+        SystemMessage(content="a" * 40),
+        HumanMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": "b" * 80,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        ),
+    ]
+
+    assert estimate_message_tokens(messages) == 10 + 20 + 2 * MESSAGE_OVERHEAD_TOKENS
@@ -123,3 +123,83 @@ def test_unknown_model_fallback():
     expected_cost = tracker.calculate_cost("openai/gpt-5-mini", 10_000, 5_000)
 
     assert abs(cost - expected_cost) < 0.0001
+
+
+def test_prompt_cache_tokens_are_discounted():
+    """Test cache reads and writes use their own prices."""
+    tracker = CostTracker()
+
+    # Claude Sonnet 4.5: reads $0.30/1M, writes $3.75/1M, rest $3/1M
+    cost = tracker.track_usage(
+        "anthropic/claude-sonnet-4.5",
+        input_tokens=10_000,
+        output_tokens=1_000,
+        cache_read_tokens=6_000,
+        cache_write_tokens=2_000,
+    )
+
+    expected = (2_000 * 3.00 + 6_000 * 0.30 + 2_000 * 3.75 + 1_000 * 15.00) / 1_000_000
+    assert cost == pytest.approx(expected)
+
+    summary = tracker.get_summary()
+    assert summary["cache_read_tokens"] == 6_000
+    assert summary["cache_write_tokens"] == 2_000
+    full_price = tracker.calculate_cost("anthropic/claude-sonnet-4.5", 10_000, 1_000)
+    assert summary["prompt_cache_saved"] == round(full_price - expected, 4)
+    assert summary["by_model"]["anthropic/claude-sonnet-4.5"]["cost"] == (
+        pytest.approx(expected)
+    )
+
+
+def test_admit_reserves_and_rejects_over_budget_calls():
+    """Test admission counts in-flight reservations against the budget."""
+    tracker = CostTracker(budget=0.01)
+    model = "openai/gpt-5-mini"  # $0.25/1M in, $2/1M out
+
+    # 1000 in + 2000 out = $0.00425
+    first = tracker.admit(model, 1_000, 2_000)
+    second = tracker.admit(model, 1_000, 2_000)
+    assert tracker.reserved_cost == pytest.approx(first + second)
+
+    with pytest.raises(BudgetExceededError):
+        tracker.admit(model, 1_000, 2_000)
+    assert tracker.rejected_calls == 1
+
+    tracker.release(first)
+    assert tracker.admit(model, 1_000, 2_000) == pytest.approx(first)
+    assert tracker.get_summary()["rejected_calls"] == 1
+
+
+def test_admit_without_budget_always_admits():
+    """Test a tracker without a budget only reserves."""
+    tracker = CostTracker()
+
+    reserved = tracker.admit("openai/gpt-5-mini", 10_000_000, 10_000_000)
+
+    assert reserved > 1.0
+    tracker.release(reserved)
+    assert tracker.reserved_cost == 0.0
+
+
+def test_summary_breaks_down_cost_and_latency_by_step():
+    """Test calls tracked with a step are grouped per step."""
+    tracker = CostTracker()
+
+    tracker.track_usage("openai/gpt-5-nano", 1_000, 500, step="swot", latency=1.5)
+    tracker.track_usage("openai/gpt-5-nano", 1_000, 500, step="swot", latency=2.5)
+    tracker.track_usage(
+        "anthropic/claude-sonnet-4.5", 2_000, 1_000, step="full_report", latency=9.0
+    )
+    tracker.track_cache_hit("openai/gpt-5-nano", 1_000, 500, step="swot")
+    tracker.track_usage("openai/gpt-5-nano", 1_000, 500)
+
+    by_step = tracker.get_summary()["by_step"]
+
+    assert set(by_step) == {"swot", "full_report"}
+    assert by_step["swot"]["calls"] == 3
+    assert by_step["swot"]["cached_calls"] == 1
+    assert by_step["swot"]["latency_seconds"] == 4.0
+    assert by_step["swot"]["cost"] == pytest.approx(
+        2 * tracker.calculate_cost("openai/gpt-5-nano", 1_000, 500), abs=1e-6
+    )
+    assert by_step["full_report"]["models"] == ["anthropic/claude-sonnet-4.5"]
@@ -0,0 +1,63 @@
+"""Unit tests for source deduplication."""
+
+from src.tools.dedup import SourceDeduplicator, normalize_url
+
+ARTICLE = (
+    "Tesla delivered a record number of vehicles in the third quarter as "
+    "demand for the Model Y remained strong across Europe and China while "
+    "price cuts weighed on margins and investors watched energy storage growth"
+)
+
+
+def test_normalize_url():
+    """Test trivially different URLs normalize to the same value."""
+    assert normalize_url("https://www.Example.com/news/?utm_source=x#top") == (
+        normalize_url("https://example.com/news")
+    )
+    assert normalize_url("https://example.com/a?id=1") != normalize_url(
+        "https://example.com/a?id=2"
+    )
+
+
+def test_exact_duplicates_removed_across_responses():
+    """Test repeated URLs and identical content are removed cross-query."""
+    dedup = SourceDeduplicator()
+
+    first = dedup.filter_response(
+        {"results": [{"url": "https://a.com/x", "content": "Alpha beta gamma"}]}
+    )
+    second = dedup.filter_response(
+        {
+            "results": [
+                {"url": "https://www.a.com/x/", "content": "Different text"},
+                {"url": "https://b.com/y", "content": "alpha, beta; gamma!"},
+                {"url": "https://c.com/z", "content": "Genuinely new content"},
+            ]
+        }
+    )
+
+    assert len(first["results"]) == 1
+    assert [r["url"] for r in second["results"]] == ["https://c.com/z"]
+    assert dedup.get_stats()["removed"] == 2
+    assert dedup.get_stats()["tokens_saved"] > 0
+
+
+def test_near_duplicates_removed():
+    """Test lightly edited syndicated copies are caught by MinHash."""
+    dedup = SourceDeduplicator(similarity_threshold=0.7)
+    syndicated = ARTICLE.replace("investors watched", "investors closely watched")
+
+    response = dedup.filter_response(
+        {
+            "results": [
+                {"url": "https://news.com/tesla", "content": ARTICLE},
+                {"url": "https://mirror.com/tesla", "content": syndicated},
+                {"url": "https://other.com/ford", "content": "Ford recalls trucks"},
+            ]
+        }
+    )
+
+    assert [r["url"] for r in response["results"]] == [
+        "https://news.com/tesla",
+        "https://other.com/ford",
+    ]
@@ -0,0 +1,163 @@
+"""Unit tests for page enrichment against a local HTTP server."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.tools.enrichment import PageEnricher, strip_boilerplate
+from src.tools.search_cache import SearchCache
+
+ARTICLE = """
+<html><head><title>Acme</title><style>body { color: red }</style></head>
+<body>
+  <header><a href="/">Home</a> <a href="/about">About us and our team</a></header>
+  <nav><ul><li>Products for every single need</li></ul></nav>
+  <main>
+    <h1>Acme</h1>
+    <p>Acme reported revenue of $4.2 billion in 2024.</p>
+    <p>The company employs roughly 12,000 people worldwide.</p>
+    <p>Share this article</p>
+  </main>
+  <script>track("page view event fired here");</script>
+  <footer>Copyright 2025 Acme Corporation, all rights reserved</footer>
+</body></html>
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serve fixed pages, recording requests and peak concurrency."""
+
+    requests: list[str] = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append(self.path)
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.1)
+            if self.path == "/hang":
+                time.sleep(1.0)
+            if self.path == "/missing":
+                self.send_error(404)
+                return
+            body = ARTICLE.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if self.path == "/undeclared":
+                body *= 50  # No Content-Length, body ends at close
+            else:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run the stand-in server on a free local port."""
+    StandInHandler.requests = []
+    StandInHandler.active = StandInHandler.peak = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_strip_boilerplate_keeps_article_text():
+    """Test navigation, scripts, footers and short lines are removed."""
+    text = strip_boilerplate(ARTICLE)
+
+    assert text.splitlines() == [
+        "Acme reported revenue of $4.2 billion in 2024.",
+        "The company employs roughly 12,000 people worldwide.",
+    ]
+    assert len(strip_boilerplate(ARTICLE, max_chars=10)) == 10
+
+
+@pytest.mark.asyncio
+async def test_enrich_replaces_top_k_snippets(server):
+    """Test only the top-scored results are fetched and replaced."""
+    enricher = PageEnricher(top_k=2)
+    response = {
+        "results": [
+            {"url": f"{server}/a", "content": "snippet", "score": 0.2},
+            {"url": f"{server}/b", "content": "snippet", "score": 0.9},
+            {"url": f"{server}/c", "content": "snippet", "score": 0.8},
+            {"url": "wiki://local", "content": "snippet", "score": 1.0},
+        ]
+    }
+
+    enriched = await enricher.enrich(response)
+    await enricher.aclose()
+
+    assert sorted(StandInHandler.requests) == ["/b", "/c"]
+    assert "$4.2 billion" in enriched["results"][1]["content"]
+    assert enriched["results"][1]["enriched"] is True
+    assert enriched["results"][0]["content"] == "snippet"
+    assert response["results"][1]["content"] == "snippet"  # Input untouched
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_and_failures(server):
+    """Test one host gets bounded concurrency and failures keep snippets."""
+    enricher = PageEnricher(top_k=10, max_per_host=2, timeout=0.5)
+    results = [
+        {"url": f"{server}/slow{i}", "content": "snippet", "score": 1.0}
+        for i in range(6)
+    ] + [
+        {"url": f"{server}/missing", "content": "snippet", "score": 0.5},
+        {"url": f"{server}/hang", "content": "snippet", "score": 0.5},
+    ]
+
+    enriched = await enricher.enrich({"results": results})
+    await enricher.aclose()
+
+    assert StandInHandler.peak <= 2
+    assert [r["content"] for r in enriched["results"][-2:]] == ["snippet"] * 2
+    assert enricher.get_stats()["failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cleaned_pages_are_cached(server, tmp_path):
+    """Test repeated URLs are served from the cache without refetching."""
+    cache = SearchCache(path=str(tmp_path / "pages.db"))
+    response = {"results": [{"url": f"{server}/a", "content": "s", "score": 1}]}
+
+    for _ in range(2):
+        enricher = PageEnricher(cache=cache)
+        enriched = await enricher.enrich(response)
+        await enricher.aclose()
+
+    assert StandInHandler.requests == ["/a"]
+    assert enricher.get_stats()["cache_hits"] == 1
+    assert "12,000 people" in enriched["results"][0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_oversized_pages_are_skipped_while_streaming(server):
+    """Test declared and undeclared oversized bodies are abandoned."""
+    enricher = PageEnricher(max_bytes=len(ARTICLE.encode()) * 2)
+
+    assert "12,000 people" in (await enricher.fetch_text(f"{server}/a"))
+    enricher.max_bytes = 100
+    assert await enricher.fetch_text(f"{server}/a") is None
+    enricher.max_bytes = len(ARTICLE.encode()) * 2
+    assert await enricher.fetch_text(f"{server}/undeclared") is None
+    await enricher.aclose()
+
+    assert enricher.get_stats()["failed"] == 0
@@ -0,0 +1,98 @@
+"""Unit tests for canonical company-name resolution."""
+
+from src.tools import entity_resolver
+from src.tools.entity_resolver import EntityResolver, normalize_company_name
+
+
+def test_normalize_strips_legal_suffixes_and_punctuation():
+    """Test legal forms and punctuation do not change the key."""
+    assert normalize_company_name("Tesla, Inc.") == "tesla"
+    assert normalize_company_name("  ACME  Corp ") == "acme"
+    assert normalize_company_name("AT&T Inc") == "at&t"
+    assert normalize_company_name("Company") == "company"
+
+
+def test_equivalent_names_share_canonical(tmp_path):
+    """Test suffix, alias and product variants resolve together."""
+    resolver = EntityResolver(str(tmp_path / "aliases.json"))
+
+    assert resolver.resolve("Tesla Inc") == "Tesla"
+    assert resolver.resolve("tesla") == "Tesla"
+    assert resolver.resolve("tesla motors") == "Tesla"
+    assert resolver.resolve("Tesla Model Y") == "Tesla"
+    assert resolver.resolve("General Motors") == "General Motors"
+    assert resolver.resolve("General Electric") == "General Electric"
+
+
+def test_prefix_needs_a_product_suffix(tmp_path):
+    """Test a known name followed by other words is a different company."""
+    resolver = EntityResolver(str(tmp_path / "aliases.json"))
+    resolver.resolve("Apple")
+    resolver.resolve("Delta")
+
+    assert resolver.resolve("Apple iPad Pro 13") == "Apple iPad Pro 13"
+    assert resolver.resolve("Apple Pro 2") == "Apple"
+    assert resolver.resolve("Apple Hospitality REIT") == "Apple Hospitality REIT"
+    assert resolver.resolve("Delta Electronics") == "Delta Electronics"
+
+
+def test_guessed_matches_are_not_saved_until_confirmed(tmp_path):
+    """Test prefix and fuzzy matches only persist through add_alias."""
+    path = str(tmp_path / "aliases.json")
+    EntityResolver(path).resolve("Initech LLC")
+    assert EntityResolver(path).resolve("Initech Model 2") == "Initech"
+    assert EntityResolver(path).resolve("Inittech") == "Inittech"
+
+    resolver = EntityResolver(path)
+    assert resolver.list_aliases() == {"initech": "Initech"}
+
+    resolver.add_alias("Initech Model 2", "Initech")
+
+    assert EntityResolver(path).list_aliases() == {
+        "initech": "Initech",
+        "initech model 2": "Initech",
+    }
+
+
+def test_fuzzy_match_keeps_the_given_name_and_warns(tmp_path, monkeypatch):
+    """Test a near-miss name is researched as given until confirmed."""
+    resolver = EntityResolver(str(tmp_path / "aliases.json"))
+    resolver.resolve("Salesforce")
+    warnings = []
+    monkeypatch.setattr(
+        entity_resolver.logger, "warning", lambda msg, **_: warnings.append(msg)
+    )
+
+    assert resolver.resolve("Salesforge") == "Salesforge"
+    assert len(warnings) == 1 and "looks like 'Salesforce'" in warnings[0]
+    assert resolver.list_aliases() == {"salesforce": "Salesforce"}
+
+    resolver.add_alias("Salesforge", "Salesforce")
+    assert resolver.resolve("Salesforge") == "Salesforce"
+
+
+def test_remove_alias(tmp_path):
+    """Test removed aliases stay removed for resolvers sharing the file."""
+    path = str(tmp_path / "aliases.json")
+    first, second = EntityResolver(path), EntityResolver(path)
+    first.add_alias("Initech Payroll", "Initech")
+    second.resolve("Globex Corp")
+
+    assert first.remove_alias("initech payroll")
+    assert not first.remove_alias("facebook")  # Built-in, not learned
+    second.resolve("Hooli")
+
+    aliases = EntityResolver(path).list_aliases()
+    assert "initech payroll" not in aliases
+    assert {"initech", "globex", "hooli"} <= set(aliases)
+
+
+def test_resolvers_sharing_a_file_keep_each_others_aliases(tmp_path):
+    """Test separate resolvers merge, rather than overwrite, the table."""
+    path = str(tmp_path / "aliases.json")
+    first, second = EntityResolver(path), EntityResolver(path)
+
+    first.resolve("Initech LLC")
+    second.resolve("Globex Corp")
+
+    assert {"initech", "globex"} <= set(EntityResolver(path).aliases)
@@ -0,0 +1,77 @@
+"""Unit tests for multi-query expansion and rank fusion."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tools.fusion import reciprocal_rank_fusion
+from src.tools.search import TavilySearchTool
+
+
+def test_rrf_promotes_results_found_by_several_queries():
+    """Test a source ranked well in two lists beats a single top hit."""
+    list_a = [
+        {"url": "https://a.com", "score": 0.9},
+        {"url": "https://shared.com", "score": 0.5},
+    ]
+    list_b = [
+        {"url": "https://b.com", "score": 0.8},
+        {"url": "https://www.shared.com/", "score": 0.7},
+    ]
+
+    fused = reciprocal_rank_fusion([list_a, list_b], top_k=2)
+
+    assert fused[0]["url"] == "https://shared.com"
+    assert fused[0]["score"] == 0.7
+    assert len(fused) == 2
+
+
+class MultiQueryClient:
+    """Fake client returning per-query results after a delay."""
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.queries: list[str] = []
+
+    async def search(self, **kwargs):
+        self.queries.append(kwargs["query"])
+        await asyncio.sleep(self.latency)
+        slug = kwargs["query"].split()[-1]
+        return {
+            "query": kwargs["query"],
+            "results": [
+                {"url": "https://common.com", "score": 0.5},
+                {"url": f"https://{slug}.com", "score": 0.9},
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_expanded_topic_runs_subqueries_concurrently():
+    """Test sub-queries overlap and fuse into a single top-k list."""
+    tool = TavilySearchTool()
+    tool.backend.client = MultiQueryClient(latency=0.2)
+
+    start = time.perf_counter()
+    response = await tool.get_market_trends("EV", max_results=3, num_queries=3)
+    elapsed = time.perf_counter() - start
+
+    assert len(tool.backend.client.queries) == 3
+    assert elapsed < 0.4  # Roughly the wall-clock time of one query
+    assert len(response["results"]) == 3
+    assert response["results"][0]["url"] == "https://common.com"
+    assert response["sub_queries"][0].startswith("EV market trends")
+
+
+@pytest.mark.asyncio
+async def test_single_query_keeps_original_behavior():
+    """Test no expansion issues exactly the original query."""
+    tool = TavilySearchTool()
+    tool.backend.client = MultiQueryClient(latency=0)
+
+    await tool.get_company_info("Notion", max_results=5)
+
+    assert tool.backend.client.queries == [
+        "Notion company overview products services business model"
+    ]
@@ -0,0 +1,77 @@
+"""Unit tests for the shared HTTP client registry."""
+
+import pytest
+
+from src.tools.backends import TavilyBackend
+from src.utils.http_clients import (
+    BorrowedClient,
+    aclose_http_clients,
+    get_http_client,
+)
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_name():
+    """Test one pooled client is reused per upstream name."""
+    first = get_http_client("test-upstream")
+
+    assert get_http_client("test-upstream") is first
+    assert get_http_client("other-upstream") is not first
+
+    await aclose_http_clients()
+    assert first.is_closed
+    assert get_http_client("test-upstream") is not first
+    await aclose_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_borrowed_client_stays_open():
+    """Test SDK-style 'async with' use does not close the shared pool."""
+    client = get_http_client("test-upstream")
+
+    async with BorrowedClient(client) as borrowed:
+        assert borrowed is client
+
+    assert not client.is_closed
+    await aclose_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_tavily_backend_uses_shared_pool():
+    """Test every Tavily request borrows the same pooled client."""
+    backend = TavilyBackend(api_key="tvly-test")
+
+    async with backend.client._client_creator() as first:
+        pass
+    async with backend.client._client_creator() as second:
+        pass
+
+    assert first is second
+    assert not first.is_closed
+    assert first.headers["Authorization"] == "Bearer tvly-test"
+    await aclose_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_tavily_pool_keeps_proxy_settings():
+    """Test the pooled Tavily client routes through configured proxies."""
+    backend = TavilyBackend(
+        api_key="tvly-test", https_proxy="http://proxy.internal:3128"
+    )
+
+    async with backend.client._client_creator() as proxied:
+        pass
+
+    direct = TavilyBackend(api_key="tvly-test")
+    async with direct.client._client_creator() as plain:
+        pass
+
+    assert proxied is not plain
+    proxy_transports = [
+        transport
+        for pattern, transport in proxied._mounts.items()
+        if pattern.scheme == "https"
+    ]
+    assert proxy_transports and proxy_transports[0] is not None
+    assert not any(t for p, t in plain._mounts.items() if p.scheme == "https")
+    await aclose_http_clients()
@@ -0,0 +1,186 @@
+"""Unit tests for the LLM timeout, retry and hedging policy."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.agents.base import BaseAgent
+from src.utils.config import Settings
+from src.utils.cost_tracker import CostTracker
+from src.utils.llm_policy import LLMCallPolicy, is_retryable
+from src.utils.streaming import StreamBuffer
+
+
+class PolicyAgent(BaseAgent):
+    """Concrete agent for exercising the call policy."""
+
+    def get_system_prompt(self) -> str:
+        return "Test system prompt"
+
+    async def run(self, **kwargs):
+        return {}
+
+
+class ScriptedLLM:
+    """Chat model stand-in playing back failures, delays and replies."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        step = self.script.pop(0)
+        if isinstance(step, BaseException):
+            raise step
+        delay, content = step
+        await asyncio.sleep(delay)
+        return AIMessage(
+            content=content,
+            response_metadata={
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50}
+            },
+        )
+
+
+def status_error(status: int) -> openai.APIStatusError:
+    """Build an OpenAI status error for a response code."""
+    request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+    response = httpx.Response(status, request=request)
+    return openai.APIStatusError("upstream error", response=response, body=None)
+
+
+def make_agent(script, **policy) -> tuple[PolicyAgent, ScriptedLLM, CostTracker]:
+    """Agent with caches off, a scripted model and a fast policy."""
+    tracker = CostTracker()
+    agent = PolicyAgent(name="TestAgent", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.call_policy = LLMCallPolicy(
+        backoff_initial_seconds=0.001, backoff_max_seconds=0.001, **policy
+    )
+    llm = ScriptedLLM(script)
+    agent.llm = agent._llms[agent.model_name] = llm
+    return agent, llm, tracker
+
+
+def test_retryable_errors():
+    """Test only transient failures are retried."""
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(status_error(429))
+    assert is_retryable(status_error(503))
+    assert not is_retryable(status_error(400))
+    assert not is_retryable(status_error(401))
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_policy_overrides_per_agent():
+    """Test per-agent overrides replace only the fields they name."""
+    settings = Settings(
+        llm_deadline_seconds=100,
+        llm_policy_overrides={
+            "WriterAgent": {"deadline_seconds": 600, "max_attempts": 2}
+        },
+    )
+
+    writer = LLMCallPolicy.from_settings(settings, "WriterAgent")
+    other = LLMCallPolicy.from_settings(settings, "AnalysisAgent")
+
+    assert (writer.deadline_seconds, writer.max_attempts) == (600, 2)
+    assert (other.deadline_seconds, other.max_attempts) == (100, 4)
+    with pytest.raises(ValueError):
+        LLMCallPolicy.from_settings(
+            Settings(llm_policy_overrides={"WriterAgent": {"retries": 1}}),
+            "WriterAgent",
+        )
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_and_records_attempts():
+    """Test 5xx and timeouts are retried and every attempt is accounted."""
+    agent, llm, tracker = make_agent(
+        [status_error(502), (1.0, "too slow"), (0.0, "answer")],
+        attempt_timeout_seconds=0.05,
+    )
+
+    content = await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert content == "answer"
+    assert llm.calls == 3
+    summary = tracker.get_summary()
+    assert summary["attempts"] == {"error": 1, "timeout": 1, "ok": 1}
+    assert summary["total_input_tokens"] == 100
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_fails_immediately():
+    """Test request errors are raised without another attempt."""
+    agent, llm, tracker = make_agent([status_error(400), (0.0, "unused")])
+
+    with pytest.raises(openai.APIStatusError):
+        await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert llm.calls == 1
+    assert tracker.get_summary()["attempts"] == {"error": 1}
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    """Test the last error surfaces once the attempts run out."""
+    agent, llm, _ = make_agent([status_error(503)] * 3, max_attempts=3)
+
+    with pytest.raises(openai.APIStatusError):
+        await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_hedge_answers_slow_request():
+    """Test a hedge request wins over a slow one, which is cancelled."""
+    agent, llm, tracker = make_agent(
+        [(1.0, "slow"), (0.0, "hedged")], hedge_after_seconds=0.05
+    )
+
+    content = await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert content == "hedged"
+    assert llm.calls == 2
+    assert tracker.get_summary()["attempts"] == {"ok": 1, "cancelled": 1}
+
+
+class FlakyStreamLLM:
+    """Chat model stand-in whose first stream breaks after one token."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        yield AIMessageChunk(content="partial ")
+        if self.calls == 1:
+            raise status_error(502)
+        yield AIMessageChunk(content="answer")
+
+
+@pytest.mark.asyncio
+async def test_streamed_retry_resets_partial_text():
+    """Test a broken stream is reset and retried under the same call_id."""
+    agent, _, _ = make_agent([])
+    agent.llm = agent._llms[agent.model_name] = FlakyStreamLLM()
+    buffer = StreamBuffer()
+    agent.add_stream_callback(buffer)
+
+    content = await agent._invoke_llm(agent._create_messages("hello"))
+
+    assert content == "partial answer"
+    assert [(c.text, c.reset) for c in buffer.chunks] == [
+        ("partial ", False),
+        ("", True),
+        ("partial ", False),
+        ("answer", False),
+    ]
+    assert len({c.call_id for c in buffer.chunks}) == 1
+    assert buffer.latest_text() == "partial answer"
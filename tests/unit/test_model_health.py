@@ -0,0 +1,106 @@
+"""Unit tests for per-model health statistics and fallback routing."""
+
+from src.utils.model_health import FallbackRouter, ModelStats, percentile
+
+PRIMARY = "anthropic/claude-sonnet-4.5"
+ALTERNATE = "openai/gpt-5-mini"
+
+
+def make_router(**kwargs) -> FallbackRouter:
+    options = {"p95_slo": 10.0, "error_rate_slo": 0.3, "min_samples": 3}
+    options.update(kwargs)
+    return FallbackRouter(chains={PRIMARY: [ALTERNATE]}, **options)
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles over unsorted samples."""
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.95) == 5.0
+    assert percentile([7.0], 0.95) == 7.0
+
+
+def test_model_stats_rolling_window():
+    """Test only the most recent requests count towards the window."""
+    stats = ModelStats(window=3)
+    for latency, ok in [(9.0, False), (1.0, True), (2.0, True), (3.0, True)]:
+        stats.record(latency, ok)
+
+    assert stats.get_stats() == {
+        "samples": 3,
+        "p50": 2.0,
+        "p95": 3.0,
+        "error_rate": 0.0,
+        "requests": 4,
+        "errors": 1,
+    }
+
+
+def test_slow_primary_falls_back_to_alternate():
+    """Test a p95 breach moves calls to the next model in the chain."""
+    router = make_router()
+
+    for _ in range(2):
+        router.record(PRIMARY, 30.0, ok=True)
+    assert router.choose(PRIMARY) == PRIMARY  # Too few samples to judge
+
+    router.record(PRIMARY, 30.0, ok=True)
+
+    assert router.is_degraded(PRIMARY)
+    assert router.choose(PRIMARY) == ALTERNATE
+    stats = router.get_stats()
+    assert stats["routes"] == {PRIMARY: ALTERNATE}
+    assert stats["models"][PRIMARY]["breach"] == "p95 30.0s > 10.0s"
+    assert stats["fallbacks"] == 1
+
+
+def test_error_rate_breach_falls_back():
+    """Test failing requests degrade a model even when they are fast."""
+    router = make_router()
+
+    router.record(PRIMARY, 0.5, ok=True)
+    router.record(PRIMARY, 0.5, ok=False)
+    router.record(PRIMARY, 0.5, ok=False)
+
+    assert router.choose(PRIMARY) == ALTERNATE
+
+
+def test_probe_restores_recovered_primary():
+    """Test one probe goes to the primary and a fast success restores it."""
+    router = make_router(probe_seconds=0.0)
+    for _ in range(3):
+        router.record(PRIMARY, 30.0, ok=True)
+
+    assert router.choose(PRIMARY) == PRIMARY  # The probe
+    assert router.choose(PRIMARY) == ALTERNATE  # Only one probe at a time
+
+    router.record(PRIMARY, 1.0, ok=True)
+
+    assert not router.is_degraded(PRIMARY)
+    assert router.choose(PRIMARY) == PRIMARY
+    assert router.get_stats()["models"][PRIMARY]["samples"] == 1
+
+
+def test_failed_probe_keeps_fallback():
+    """Test a slow probe leaves the primary degraded until the next probe."""
+    router = make_router(probe_seconds=60.0)
+    for _ in range(3):
+        router.record(PRIMARY, 30.0, ok=True)
+    router._degraded_until[PRIMARY] = 0.0  # Probe due now
+
+    assert router.choose(PRIMARY) == PRIMARY
+    router.record(PRIMARY, 30.0, ok=True)
+
+    assert router.is_degraded(PRIMARY)
+    assert router.choose(PRIMARY) == ALTERNATE
+
+
+def test_unchained_models_are_used_as_requested():
+    """Test models without a chain are tracked but never rerouted."""
+    router = make_router()
+    for _ in range(3):
+        router.record(ALTERNATE, 30.0, ok=False)
+
+    assert router.choose(ALTERNATE) == ALTERNATE
+    assert router.get_stats()["models"][ALTERNATE]["degraded"] is True
@@ -0,0 +1,46 @@
+"""Unit tests for per-step model routing."""
+
+import pytest
+
+from src.utils.model_routing import StepRoute, merge_routes, parse_routes
+
+
+def test_parse_routes_builds_step_routes():
+    """Test a config table becomes StepRoute objects."""
+    routes = parse_routes(
+        {
+            "swot": {"model": "openai/gpt-5-mini", "temperature": "0.2"},
+            "full_report": {"model": "anthropic/claude-sonnet-4.5"},
+        }
+    )
+
+    assert routes["swot"] == StepRoute("openai/gpt-5-mini", 0.2)
+    assert routes["full_report"] == StepRoute("anthropic/claude-sonnet-4.5", None)
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        {"write_everything": {"model": "openai/gpt-5-mini"}},
+        {"swot": {"modle": "openai/gpt-5-mini"}},
+        {"swot": {"temperature": 3.0}},
+    ],
+)
+def test_parse_routes_rejects_bad_tables(table):
+    """Test unknown steps, unknown fields and bad temperatures are errors."""
+    with pytest.raises(ValueError):
+        parse_routes(table)
+
+
+def test_merge_routes_overrides_field_by_field():
+    """Test a later table only replaces the fields it sets."""
+    configured = {"swot": StepRoute("openai/gpt-5-mini", 0.4)}
+    requested = {
+        "swot": StepRoute(temperature=0.1),
+        "positioning": StepRoute("openai/gpt-5-nano"),
+    }
+
+    merged = merge_routes(configured, requested)
+
+    assert merged["swot"] == StepRoute("openai/gpt-5-mini", 0.1)
+    assert merged["positioning"] == StepRoute("openai/gpt-5-nano", None)
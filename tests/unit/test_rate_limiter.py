@@ -0,0 +1,169 @@
+"""Unit tests for the token-bucket rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tools.search import TavilySearchTool
+from src.utils.cost_tracker import CostTracker
+from src.utils.llm_policy import LLMCallPolicy
+from src.utils.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucket,
+    get_model_limiter_stats,
+)
+from tests.unit.test_llm_policy import PolicyAgent, ScriptedLLM, status_error
+from tests.unit.test_search import FakeAsyncTavilyClient
+
+
+@pytest.mark.asyncio
+async def test_burst_passes_without_waiting():
+    """Test requests within the burst are not queued."""
+    bucket = TokenBucket(rate=1.0, burst=3)
+
+    waits = [await bucket.acquire() for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.0]
+    assert bucket.get_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_callers_queue_beyond_burst():
+    """Test excess callers wait for refills instead of failing."""
+    bucket = TokenBucket(rate=20.0, burst=2)
+
+    start = time.perf_counter()
+    waits = await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+    elapsed = time.perf_counter() - start
+
+    # 4 requests over the burst at 20/s need ~0.2s
+    assert 0.15 < elapsed < 0.5
+    assert waits == sorted(waits)  # Served in arrival order
+    assert bucket.get_stats()["queued"] == 4
+
+
+def test_invalid_rate():
+    """Test a non-positive rate is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@pytest.mark.asyncio
+async def test_search_tool_reports_queue_wait():
+    """Test search waits on the limiter and reports it separately."""
+    bucket = TokenBucket(rate=20.0, burst=1)
+    tool = TavilySearchTool(rate_limiter=bucket)
+    tool.backend.client = FakeAsyncTavilyClient()
+
+    await asyncio.gather(
+        *(tool.search(f"query {i}", use_cache=False) for i in range(3))
+    )
+
+    stats = tool.get_rate_limit_stats()
+    assert stats["acquired"] == 3
+    assert stats["queued"] == 2
+    assert stats["total_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_queues_beyond_window():
+    """Test callers beyond the window wait for a released slot."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        limiter.release(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.get_stats()["queued"] == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_aimd():
+    """Test full windows grow the limit and a 429 burst halves it once."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=8)
+
+    for _ in range(4):  # Two full windows of two requests
+        await asyncio.gather(limiter.acquire(), limiter.acquire())
+        limiter.release(0.01)
+        limiter.release(0.01)
+    assert limiter.concurrency == 3
+
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    for _ in range(3):
+        limiter.release(0.01, rate_limited=True)
+
+    assert limiter.concurrency == 1
+    assert limiter.get_stats()["rate_limited"] == 3
+    assert limiter.get_stats()["decreases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_backs_off_on_slow_responses():
+    """Test latency far above the fastest recent one shrinks the window."""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=4, latency_tolerance=3.0, min_samples=3
+    )
+    for _ in range(3):
+        await limiter.acquire()
+        limiter.release(0.1)
+
+    await limiter.acquire()
+    limiter.release(1.0)
+
+    assert limiter.concurrency == 2
+    assert limiter.get_stats()["slow_responses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_judges_latency_per_step():
+    """Test long steps are not compared with short steps on the same model."""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=4, latency_tolerance=3.0, min_samples=3
+    )
+    for _ in range(3):
+        await limiter.acquire()
+        limiter.release(0.1, key="executive_summary")
+
+    for _ in range(4):
+        await limiter.acquire()
+        limiter.release(1.0, key="full_report")
+
+    assert limiter.concurrency == 4
+    assert limiter.get_stats()["fastest_latency"] == {
+        "executive_summary": 0.1,
+        "full_report": 1.0,
+    }
+
+    await limiter.acquire()
+    limiter.release(5.0, key="full_report")
+
+    assert limiter.concurrency == 2
+
+
+@pytest.mark.asyncio
+async def test_agents_share_model_limiter():
+    """Test agents report 429s to the shared limiter of their model."""
+    tracker = CostTracker()
+    agent = PolicyAgent(name="TestAgent", model="test/limited", cost_tracker=tracker)
+    agent.response_cache = None
+    agent.call_policy = LLMCallPolicy(
+        backoff_initial_seconds=0.001, backoff_max_seconds=0.001
+    )
+    agent.llm = agent._llms[agent.model_name] = ScriptedLLM(
+        [status_error(429), (0.0, "answer")]
+    )
+
+    assert await agent._invoke_llm(agent._create_messages("hello")) == "answer"
+
+    stats = get_model_limiter_stats()["test/limited"]
+    assert stats["rate_limited"] == 1
+    assert stats["in_flight"] == 0
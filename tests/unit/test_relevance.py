@@ -0,0 +1,71 @@
+"""Unit tests for adaptive, relevance-based result counts."""
+
+import pytest
+
+from src.tools.relevance import relevance_cutoff
+from src.tools.search import TavilySearchTool
+
+
+def scored(*scores):
+    """Build results with the given scores."""
+    return [{"url": f"https://{i}.com", "score": s} for i, s in enumerate(scores)]
+
+
+def test_cutoff_at_min_score():
+    """Test results below the threshold are cut."""
+    assert relevance_cutoff(scored(0.9, 0.8, 0.5, 0.2, 0.1), min_score=0.3) == 3
+
+
+def test_cutoff_at_plateau():
+    """Test a flat tail is cut after its first result."""
+    results = scored(0.95, 0.8, 0.62, 0.61, 0.61, 0.60)
+    assert relevance_cutoff(results, min_score=0.3) == 3
+
+
+def test_flat_run_of_high_scores_is_kept():
+    """Test the plateau rule leaves strong, evenly scored results alone."""
+    results = scored(0.95, 0.94, 0.935, 0.93, 0.92, 0.91, 0.5)
+    assert relevance_cutoff(results, min_score=0.3) == 7
+
+
+def test_cutoff_keeps_minimum():
+    """Test a minimum number of results survives a low-scoring list."""
+    assert relevance_cutoff(scored(0.2, 0.1, 0.05), min_score=0.3) == 2
+    assert relevance_cutoff(scored(0.9, 0.8), min_score=0.3) == 2
+
+
+class PagedClient:
+    """Fake client returning max_results decaying scores."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.requests: list[int] = []
+
+    async def search(self, **kwargs):
+        n = kwargs["max_results"]
+        self.requests.append(n)
+        return {"query": kwargs["query"], "results": scored(*self.scores[:n])}
+
+
+@pytest.mark.asyncio
+async def test_adaptive_search_sends_one_request_and_cuts_tail():
+    """Test one request is sent and the tail past the drop-off is dropped."""
+    tool = TavilySearchTool()
+    tool.backend.client = PagedClient([0.9, 0.85, 0.8, 0.7, 0.25, 0.2, 0.1, 0.1])
+
+    response = await tool.adaptive_search("query", max_results=8)
+
+    assert tool.backend.client.requests == [8]
+    assert len(response["results"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_adaptive_search_keeps_fully_relevant_results():
+    """Test nothing is cut while every result stays relevant."""
+    tool = TavilySearchTool()
+    tool.backend.client = PagedClient([0.9, 0.8, 0.7, 0.6, 0.5])
+
+    response = await tool.adaptive_search("query", max_results=10)
+
+    assert tool.backend.client.requests == [10]
+    assert len(response["results"]) == 5
@@ -0,0 +1,147 @@
+"""Unit tests for the research agent."""
+
+import asyncio
+
+import pytest
+
+from src.agents.researcher import ResearchAgent
+
+
+@pytest.mark.asyncio
+async def test_small_context_skips_map_reduce():
+    """Test contexts under the threshold go straight to the final prompt."""
+    agent = ResearchAgent()
+    calls = []
+
+    async def fake_invoke(messages, model=None, **kwargs):
+        calls.append(model)
+        return "analysis"
+
+    agent._invoke_llm = fake_invoke
+
+    assert await agent._analyze_company("Acme", "[1] A\nContent: tiny\n") == "analysis"
+    assert calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_oversized_context_is_map_reduced():
+    """Test large contexts are summarized on the map model with bounded fan-out."""
+    agent = ResearchAgent()
+    agent.map_reduce_threshold = 200
+    agent.map_reduce_chunk_tokens = 100
+    agent.map_reduce_model = "openai/gpt-5-nano"
+    agent.map_reduce_concurrency = 2
+
+    active = 0
+    peak = 0
+    final_prompts = []
+
+    async def fake_invoke(messages, model=None, **kwargs):
+        nonlocal active, peak
+        if model is None:
+            final_prompts.append(messages[-1].content)
+            return "analysis"
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "- fact [1]"
+
+    agent._invoke_llm = fake_invoke
+    context = "\n".join(
+        f"[{i}] Source {i}\nContent: {'word ' * 80}\n" for i in range(1, 9)
+    )
+
+    result = await agent._analyze_company("Acme", context)
+
+    assert result == "analysis"
+    assert peak == 2
+    assert len(final_prompts) == 1
+    assert "- fact [1]" in final_prompts[0]
+    assert "word word" not in final_prompts[0]
+
+
+def test_threshold_applies_to_unpacked_sources():
+    """Test large sources skip packing so map-reduce sees them in full."""
+    agent = ResearchAgent()
+    agent.map_reduce_threshold = 300
+    results = [
+        {"title": f"Source {i}", "url": f"https://{i}.com", "content": "word " * 80}
+        for i in range(8)
+    ]
+
+    large = agent._format_context({"results": results}, "word", token_budget=100)
+    small = agent._format_context({"results": results[:1]}, "word", token_budget=100)
+
+    assert large.count("word") == 8 * 80
+    assert small == agent.search_tool.format_results_for_llm(
+        {"results": results[:1]},
+        token_budget=100,
+        intent="word",
+        top_k_chunks=agent.chunk_top_k,
+        chunk_words=agent.chunk_words,
+    )
+
+
+@pytest.mark.asyncio
+async def test_topic_served_from_local_index_when_covered():
+    """Test searches are skipped once the local index covers a topic."""
+    agent = ResearchAgent()
+    agent.local_min_hits = 2
+    agent.local_min_similarity = 0.0
+    fetched = [
+        {"title": f"Acme {i}", "url": f"https://{i}.com", "content": f"Acme fact {i}"}
+        for i in range(3)
+    ]
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {"query": "q", "results": fetched}
+
+    hits: dict = {}
+    first = await agent._search_local_first("company", "Acme", "Acme", 5, fetch, hits)
+    second = await agent._search_local_first("company", "Acme", "Acme", 5, fetch, hits)
+
+    assert calls == 1
+    assert first["results"] == fetched
+    assert hits == {"company": 3}
+    assert {r["url"] for r in second["results"]} == {r["url"] for r in fetched}
+    assert all("score" not in r for r in second["results"])
+    context = agent.search_tool.format_results_for_llm(second)
+    assert "Local similarity:" in context and "Relevance:" not in context
+
+
+@pytest.mark.asyncio
+async def test_stale_or_bypassed_local_sources_are_searched_again():
+    """Test stale topics and refresh_sources runs call the search API."""
+    agent = ResearchAgent()
+    agent.local_min_hits = 1
+    agent.local_min_similarity = 0.0
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {
+            "query": "q",
+            "results": [
+                {"title": "Acme", "url": "https://acme.com", "content": "Acme news"}
+            ],
+        }
+
+    hits: dict = {}
+    await agent._search_local_first("trends", "Acme", "Acme", 5, fetch, hits)
+    await agent._search_local_first("trends", "Acme", "Acme", 5, fetch, hits)
+    assert calls == 1
+
+    agent.refresh_sources = True
+    await agent._search_local_first("trends", "Acme", "Acme", 5, fetch, hits)
+    assert calls == 2
+    assert hits == {"trends": 0}
+
+    agent.refresh_sources = False
+    agent.local_max_age_hours["trends"] = 1e-9
+    await agent._search_local_first("trends", "Acme", "Acme", 5, fetch, hits)
+    assert calls == 3
@@ -0,0 +1,74 @@
+"""Unit tests for chunk-level retrieval."""
+
+from src.tools.retrieval import bm25_scores, chunk_text, retrieve_passages
+from src.tools.search import TavilySearchTool
+
+
+def test_chunk_text_overlapping_windows():
+    """Test long texts are split into overlapping word windows."""
+    text = " ".join(f"w{i}" for i in range(25))
+
+    chunks = chunk_text(text, chunk_words=10, overlap=2)
+
+    assert chunks[0].split() == [f"w{i}" for i in range(10)]
+    assert chunks[1].split()[0] == "w8"
+    assert chunks[-1].split()[-1] == "w24"
+    assert chunk_text("short text", chunk_words=10) == ["short text"]
+    assert chunk_text("   ") == []
+
+
+def test_bm25_prefers_matching_chunks():
+    """Test chunks sharing rarer query terms score higher."""
+    chunks = [
+        ["revenue", "grew", "percent"],
+        ["office", "dog", "friendly"],
+        ["revenue", "pricing", "customers"],
+    ]
+
+    scores = bm25_scores(chunks, ["revenue", "pricing"])
+
+    assert scores[2] > scores[0] > scores[1] == 0
+    assert bm25_scores(chunks, []).tolist() == [0, 0, 0]
+
+
+def test_retrieve_passages_keeps_source_indices():
+    """Test selected passages stay keyed by their source's position."""
+    filler = " ".join(["lorem"] * 40)
+    results = [
+        {"content": f"{filler} office culture {filler}", "score": 0.9},
+        {"content": f"{filler} annual revenue pricing {filler}", "score": 0.5},
+        {"content": "nothing relevant here", "score": 0.8},
+    ]
+
+    passages = retrieve_passages(results, "revenue pricing", top_k=1, chunk_words=20)
+
+    assert list(passages) == [1]
+    assert "annual revenue pricing" in passages[1]
+    assert len(passages[1]) < len(results[1]["content"])
+
+
+def test_format_results_with_intent_keeps_citations():
+    """Test retrieval trims context while citation numbers stay fixed."""
+    tool = TavilySearchTool()
+    filler = " ".join(["background"] * 200)
+    response = {
+        "results": [
+            {"title": "Blog", "url": "https://a.com", "content": filler, "score": 0.9},
+            {
+                "title": "Report",
+                "url": "https://b.com",
+                "content": f"{filler} competitors include Acme and Globex {filler}",
+                "score": 0.7,
+            },
+        ]
+    }
+
+    full = tool.format_results_for_llm(response)
+    retrieved = tool.format_results_for_llm(
+        response, intent="competitors rivals", top_k_chunks=1, chunk_words=30
+    )
+
+    assert len(retrieved) < len(full) / 5
+    assert "[2] Report" in retrieved
+    assert "[1] Blog" not in retrieved
+    assert "competitors include Acme and Globex" in retrieved
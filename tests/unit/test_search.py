@@ -0,0 +1,235 @@
+"""Unit tests for search tools."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tools.context_packer import split_context
+from src.tools.search import TavilySearchTool
+from src.tools.single_flight import SingleFlight
+from src.utils.tokens import estimate_tokens
+
+
+class FakeAsyncTavilyClient:
+    """Stand-in for AsyncTavilyClient with a fixed upstream latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: list[dict] = []
+
+    async def search(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.latency)
+        return {
+            "query": kwargs["query"],
+            "results": [
+                {
+                    "title": "Result",
+                    "url": "https://example.com",
+                    "content": "Some content",
+                    "score": 0.9,
+                }
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_search_awaits_async_client():
+    """Test search goes through the async client with all parameters."""
+    tool = TavilySearchTool()
+    tool.backend.client = FakeAsyncTavilyClient()
+
+    response = await tool.search("tesla", max_results=3, search_depth="basic")
+
+    assert response["results"][0]["url"] == "https://example.com"
+    assert tool.backend.client.calls[0]["max_results"] == 3
+    assert tool.backend.client.calls[0]["search_depth"] == "basic"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_do_not_block_event_loop():
+    """Test concurrent searches overlap instead of running back to back."""
+    tool = TavilySearchTool()
+    tool.backend.client = FakeAsyncTavilyClient(latency=0.2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(tool.search(f"query {i}") for i in range(5)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5  # Sequential execution would take ~1.0s
+
+
+def test_format_results_for_llm():
+    """Test formatting numbers results and prepends the AI answer."""
+    tool = TavilySearchTool()
+
+    formatted = tool.format_results_for_llm(
+        {
+            "answer": "Short answer",
+            "results": [
+                {"title": "A", "url": "https://a.com", "content": "x", "score": 0.5}
+            ],
+        }
+    )
+
+    assert formatted.startswith("AI Summary: Short answer")
+    assert "[1] A" in formatted
+    assert tool.format_results_for_llm({"results": []}) == "No search results found."
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_searches_are_coalesced():
+    """Test identical in-flight searches share one upstream call."""
+    single_flight = SingleFlight()
+    tools = [TavilySearchTool(single_flight=single_flight) for _ in range(3)]
+    client = FakeAsyncTavilyClient(latency=0.1)
+    for tool in tools:
+        tool.backend.client = client
+
+    async def observe():
+        await asyncio.sleep(0.05)
+        return single_flight.get_stats()
+
+    *responses, stats = await asyncio.gather(
+        *(tool.search("ai market trends", use_cache=False) for tool in tools),
+        observe(),
+    )
+
+    assert len(client.calls) == 1
+    assert all(r == responses[0] for r in responses)
+    assert stats["in_flight"] == {"ai market trends": 2}
+    assert single_flight.get_stats()["coalesced"] == 2
+    assert single_flight.get_stats()["in_flight"] == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_bypass_searches_never_join_cached_flights():
+    """Test use_cache=False calls coalesce only with other bypass calls."""
+    tool = TavilySearchTool(single_flight=SingleFlight())
+    tool.backend.client = FakeAsyncTavilyClient(latency=0.1)
+
+    await asyncio.gather(
+        tool.search("ai market trends"),
+        tool.search("ai market trends", use_cache=False),
+        tool.search("ai market trends", use_cache=False),
+    )
+
+    assert len(tool.backend.client.calls) == 2
+    assert tool.single_flight.get_stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_errors_propagate_to_all_waiters():
+    """Test an upstream failure is raised in every waiter."""
+    single_flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", failing) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert single_flight.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters():
+    """Test waiters retry, one leading, when the leader's run is cancelled."""
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == [2, 2]
+    assert leader.cancelled()
+    assert single_flight.calls == 2
+    assert single_flight.get_stats()["in_flight"] == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_flight_running():
+    """Test cancelling a waiter neither cancels nor breaks the shared call."""
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    leader = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+
+    assert await leader == "result"
+    assert waiter.cancelled()
+
+
+def test_format_results_with_token_budget_keeps_citation_numbers():
+    """Test packing drops low-scored sources and truncates long ones."""
+    tool = TavilySearchTool()
+    response = {
+        "results": [
+            {
+                "title": "Low",
+                "url": "https://low.com",
+                "content": "x " * 400,
+                "score": 0.1,
+            },
+            {
+                "title": "Long",
+                "url": "https://long.com",
+                "content": "y " * 2000,
+                "score": 0.9,
+            },
+            {
+                "title": "Short",
+                "url": "https://short.com",
+                "content": "short",
+                "score": 0.8,
+            },
+        ]
+    }
+
+    unpacked = tool.format_results_for_llm(response)
+    packed = tool.format_results_for_llm(response, token_budget=100)
+
+    assert len(packed) < len(unpacked)
+    assert "[1] Low" not in packed  # Lowest score dropped first
+    assert "[2] Long" in packed
+    assert "[3] Short" in packed
+    assert "Content: short\n" in packed
+    assert "y y..." in packed
+
+
+def test_split_context_keeps_citation_headers():
+    """Test oversized contexts split between sources and repeat headers."""
+    response = {
+        "results": [
+            {"title": "A", "url": "https://a.com", "content": "a " * 100, "score": 1},
+            {"title": "B", "url": "https://b.com", "content": "b " * 600, "score": 1},
+        ]
+    }
+    context = TavilySearchTool().format_results_for_llm(response)
+
+    chunks = split_context(context, max_tokens=120)
+
+    assert chunks[0].startswith("[1] A")
+    assert all(estimate_tokens(chunk) <= 120 for chunk in chunks)
+    assert all(chunk.startswith("[2] B") for chunk in chunks[1:])
+    assert sum(chunk.split().count("b") for chunk in chunks) == 600
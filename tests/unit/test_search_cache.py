@@ -0,0 +1,76 @@
+"""Unit tests for the persistent search cache."""
+
+import pytest
+
+from src.tools.search import TavilySearchTool
+from src.tools.search_cache import SearchCache
+from tests.unit.test_search import FakeAsyncTavilyClient
+
+
+def test_key_normalizes_query_and_domains():
+    """Test equivalent requests share a cache key."""
+    key1 = SearchCache.make_key("Tesla  Overview ", 5, "advanced", ["B.com", "a.com"])
+    key2 = SearchCache.make_key("tesla overview", 5, "advanced", ["a.com", "b.com"])
+    key3 = SearchCache.make_key("tesla overview", 10, "advanced", ["a.com", "b.com"])
+
+    assert key1 == key2
+    assert key1 != key3
+
+
+def test_get_set_and_stats(tmp_path):
+    """Test hit/miss counters and persistence across instances."""
+    path = str(tmp_path / "cache.db")
+    cache = SearchCache(path=path)
+
+    assert cache.get("k") is None
+    cache.set("k", {"results": [1, 2]})
+    assert cache.get("k") == {"results": [1, 2]}
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+    # A new instance (e.g. another process) sees the warm entry
+    assert SearchCache(path=path).get("k") == {"results": [1, 2]}
+
+
+def test_ttl_expiry(tmp_path):
+    """Test expired entries are treated as misses and removed."""
+    cache = SearchCache(path=str(tmp_path / "cache.db"))
+
+    cache.set("k", {"results": []}, ttl_seconds=-1)
+
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    """Test least recently used entries are evicted over the size cap."""
+    clock = iter(range(1, 100))
+    monkeypatch.setattr("src.tools.search_cache.time.time", lambda: next(clock))
+    cache = SearchCache(path=str(tmp_path / "cache.db"), max_entries=2)
+
+    cache.set("a", {"v": "a"})
+    cache.set("b", {"v": "b"})
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", {"v": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"}
+    assert cache.get("c") == {"v": "c"}
+
+
+@pytest.mark.asyncio
+async def test_search_tool_uses_cache_and_bypass():
+    """Test repeated searches hit the cache unless bypassed."""
+    tool = TavilySearchTool()
+    tool.backend.client = FakeAsyncTavilyClient()
+
+    await tool.search("Tesla overview", max_results=5)
+    await tool.search("tesla  overview", max_results=5)
+    assert len(tool.backend.client.calls) == 1
+    assert tool.get_cache_stats()["hits"] == 1
+
+    await tool.search("tesla overview", max_results=5, use_cache=False)
+    assert len(tool.backend.client.calls) == 2
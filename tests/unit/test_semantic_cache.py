@@ -0,0 +1,77 @@
+"""Unit tests for the semantic LLM response cache."""
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.utils.semantic_cache import SemanticCache
+
+SNIPPETS = [
+    "[1] Acme revenue reached 4 billion dollars in 2024",
+    "[2] Acme employs 12000 people across 30 countries",
+    "[3] Globex and Initech compete with Acme on price",
+]
+
+
+def prompt(snippets, system="You are an analyst."):
+    """Build a system + user message pair around search snippets."""
+    return [
+        SystemMessage(content=system),
+        HumanMessage(content="Write a SWOT for Acme.\n" + "\n".join(snippets)),
+    ]
+
+
+def store(cache, messages, content="SWOT v1", model="m", temperature=0.3):
+    """Add a response about Acme with fixed usage."""
+    cache.add(model, temperature, messages, content, 1000, 400, "Acme")
+
+
+def test_reordered_snippets_are_reused(tmp_path):
+    """Test prompts that only re-order snippets match above threshold."""
+    cache = SemanticCache(str(tmp_path))
+    store(cache, prompt(SNIPPETS))
+
+    entry, similarity = cache.lookup("m", 0.3, prompt(SNIPPETS[::-1]), 0.97, "Acme")
+
+    assert entry is not None and entry["content"] == "SWOT v1"
+    assert similarity > 0.99
+    assert cache.get_stats()["reuses"] == 1
+
+
+def test_different_prompt_or_scope_misses(tmp_path):
+    """Test dissimilar prompts and other models/system prompts never match."""
+    cache = SemanticCache(str(tmp_path))
+    store(cache, prompt(SNIPPETS))
+
+    other = prompt(["[1] Initech sells enterprise staplers to banks"])
+    entry, similarity = cache.lookup("m", 0.3, other, 0.97, "Acme")
+    assert entry is None and similarity < 0.97
+
+    assert cache.lookup("other-model", 0.3, prompt(SNIPPETS), 0.5, "Acme")[0] is None
+    assert cache.lookup("m", 0.7, prompt(SNIPPETS), 0.5, "Acme")[0] is None
+    writer = prompt(SNIPPETS, system="Writer.")
+    assert cache.lookup("m", 0.3, writer, 0.5, "Acme")[0] is None
+    assert cache.get_stats()["misses"] == 4
+
+
+def test_other_company_never_reuses_an_entry(tmp_path):
+    """Test an identical prompt about another company always misses."""
+    cache = SemanticCache(str(tmp_path))
+    store(cache, prompt(SNIPPETS))
+
+    assert cache.lookup("m", 0.3, prompt(SNIPPETS), 0.0, "Globex")[0] is None
+    assert cache.lookup("m", 0.3, prompt(SNIPPETS), 0.97, "ACME")[0] is not None
+
+
+def test_entries_persist_and_compact(tmp_path):
+    """Test entries reload from disk and the oldest are evicted."""
+    cache = SemanticCache(str(tmp_path), max_entries=2)
+    for i in range(3):
+        store(cache, prompt([f"unique topic number {i} alpha{i} beta{i}"]), f"r{i}")
+
+    reloaded = SemanticCache(str(tmp_path), max_entries=2)
+
+    assert [e["content"] for e in reloaded.entries] == ["r1", "r2"]
+    assert reloaded.matrix.shape == (2, reloaded.dim)
+    entry, _ = reloaded.lookup(
+        "m", 0.3, prompt(["unique topic number 2 alpha2 beta2"]), 0.99, "Acme"
+    )
+    assert entry is not None and entry["content"] == "r2"
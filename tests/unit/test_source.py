@@ -0,0 +1,55 @@
+"""Unit tests for compact Source records."""
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.tools.source import Source
+
+RESULT = {
+    "title": "Tesla Q3 deliveries",
+    "url": "https://www.Reuters.com/business/tesla",
+    "content": "Tesla delivered a record number of vehicles.",
+    "score": 0.87,
+    "raw_content": None,
+    "favicon": "https://reuters.com/favicon.ico",
+}
+
+
+def test_from_result_projects_used_fields():
+    """Test unused provider fields are dropped and the domain is derived."""
+    source = Source.from_result(RESULT)
+
+    assert source.to_dict() == {
+        "title": "Tesla Q3 deliveries",
+        "url": "https://www.Reuters.com/business/tesla",
+        "domain": "reuters.com",
+        "content": "Tesla delivered a record number of vehicles.",
+        "score": 0.87,
+    }
+    assert not hasattr(source, "__dict__")
+
+
+def test_urls_and_domains_are_interned():
+    """Test repeated URLs and domains share one string object."""
+    a = Source.from_result(dict(RESULT, url="".join(["https://reuters.com/", "a"])))
+    b = Source.from_result(dict(RESULT, url="".join(["https://reuters.com/", "a"])))
+
+    assert a.url is b.url
+    assert a.domain is b.domain
+
+
+def test_from_result_handles_missing_fields():
+    """Test sparse results still produce a valid record."""
+    source = Source.from_result({"url": None, "score": None})
+
+    assert source.url == ""
+    assert source.score == 0.0
+
+
+def test_checkpoint_roundtrip():
+    """Test Source survives the LangGraph checkpoint serializer."""
+    serde = JsonPlusSerializer()
+    sources = [Source.from_result(RESULT)]
+
+    restored = serde.loads_typed(serde.dumps_typed({"raw_sources": sources}))
+
+    assert restored["raw_sources"] == sources
@@ -0,0 +1,118 @@
+"""Unit tests for the local source vector index."""
+
+import time
+
+import numpy as np
+
+from src.tools.source_index import SourceIndex, get_source_index, hash_vectorize
+
+
+def source(name, content):
+    """Build a search result."""
+    return {"title": name, "url": f"https://{name.lower()}.com", "content": content}
+
+
+def test_hash_vectorize_normalized_and_stable():
+    """Test vectors are unit length and deterministic."""
+    a, b, empty = hash_vectorize(["acme revenue", "acme revenue", ""], dim=256)
+
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert np.array_equal(a, b)
+    assert not empty.any()
+
+
+def test_add_skips_known_urls_and_empty_content(tmp_path):
+    """Test repeats (by normalized URL) and empty sources are not indexed."""
+    index = SourceIndex(str(tmp_path), dim=256)
+
+    assert index.add([source("Acme", "Acme sells anvils"), source("Empty", "")]) == 1
+    assert (
+        index.add([{**source("Acme", "Other text"), "url": "https://www.acme.com/"}])
+        == 0
+    )
+    assert len(index) == 1
+
+
+def test_search_ranks_and_filters_by_entity(tmp_path):
+    """Test search returns similar sources mentioning the entity, best first."""
+    index = SourceIndex(str(tmp_path), dim=512)
+    index.add(
+        [
+            source("Acme", "Acme revenue grew on anvil pricing"),
+            source("Pets", "Office dogs and cats"),
+        ],
+        entity="Acme",
+    )
+    index.add([source("Globex", "Globex beat Acme on anvil pricing")], "Globex")
+
+    hits = index.search("Acme revenue pricing", top_k=5, must_contain="acme")
+
+    assert [record["title"] for record, _ in hits] == ["Acme", "Pets"]
+    assert hits[0][1] > hits[1][1]
+    assert hits[0][0]["entity"] == "Acme"
+    assert index.search("Acme revenue", min_similarity=0.99) == []
+
+
+def test_search_filters_in_memory_and_reads_only_hits(tmp_path, monkeypatch):
+    """Test filtering happens before disk reads and candidates are capped."""
+    index = SourceIndex(str(tmp_path), dim=256)
+    index.add([source(f"Globex{i}", "anvil pricing news") for i in range(20)])
+    index.add([source("Acme", "anvil news")], entity="Acme")
+    reads = []
+    read_record = index._read_record
+    monkeypatch.setattr(
+        index, "_read_record", lambda row: reads.append(row) or read_record(row)
+    )
+
+    hits = index.search("anvil pricing", top_k=3, must_contain="acme")
+
+    assert [record["title"] for record, _ in hits] == ["Acme"]
+    assert reads == [20]
+    assert index.search("anvil pricing", must_contain="acme", max_candidates=5) == []
+
+
+def test_reopen_persists_and_repairs_partial_append(tmp_path):
+    """Test an index reopens from disk and trims a half-written append."""
+    index = SourceIndex(str(tmp_path), dim=256)
+    index.add([source("Acme", "Acme sells anvils"), source("Globex", "Globex too")])
+    with open(tmp_path / "vectors.f16", "ab") as f:
+        f.write(b"\0" * 100)
+
+    reopened = SourceIndex(str(tmp_path), dim=1024)
+
+    assert reopened.dim == 256
+    assert len(reopened) == 2
+    assert reopened.search("anvils", top_k=1)[0][0]["title"] == "Acme"
+    assert reopened.add([source("Initech", "Initech staplers")]) == 1
+    assert reopened.search("staplers", top_k=1)[0][0]["title"] == "Initech"
+
+
+def test_instance_sees_rows_appended_by_another(tmp_path):
+    """Test an open index scores rows another instance appended later."""
+    reader = SourceIndex(str(tmp_path), dim=256)
+    reader.add([source("Acme", "Acme sells anvils")])
+    assert reader.search("anvils", top_k=1)[0][0]["title"] == "Acme"
+
+    SourceIndex(str(tmp_path)).add([source("Globex", "Globex staplers")])
+
+    hits = reader.search("Globex staplers", top_k=1)
+    assert hits[0][0]["title"] == "Globex"
+    assert hits[0][1] > 0.5
+    assert reader.add([source("Globex", "Globex staplers")]) == 0
+
+
+def test_get_source_index_shares_one_instance(tmp_path):
+    """Test agents opening the same directory share an instance."""
+    assert get_source_index(str(tmp_path), dim=256) is get_source_index(str(tmp_path))
+
+
+def test_search_skips_sources_older_than_max_age(tmp_path, monkeypatch):
+    """Test sources past the max age are not returned."""
+    index = SourceIndex(str(tmp_path), dim=256)
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0)
+    index.add([source("Acme", "Acme sells anvils")])
+
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0 + 7200)
+    assert index.search("anvils", max_age_seconds=10_000)
+    assert index.search("anvils", max_age_seconds=3600) == []
+    assert index.search("anvils")
@@ -0,0 +1,84 @@
+"""Unit tests for streaming sinks."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.utils.streaming import (
+    FileStreamSink,
+    StreamBuffer,
+    StreamBufferStore,
+    StreamChunk,
+)
+
+
+def test_stream_buffer_latest_text_follows_newest_call():
+    """Test latest_text only joins chunks of the most recent call."""
+    buffer = StreamBuffer()
+    assert buffer.latest_text() == ""
+
+    buffer(StreamChunk("ResearchAgent", "a", "old "))
+    buffer(StreamChunk("ResearchAgent", "a", "text"))
+    assert buffer.latest_text() == "old text"
+
+    buffer(StreamChunk("WriterAgent", "b", "new"))
+    assert buffer.latest_text() == "new"
+
+    # A failed attempt's text is dropped once the call is reset
+    buffer(StreamChunk("WriterAgent", "b", "", reset=True))
+    assert buffer.latest_text() == ""
+    buffer(StreamChunk("WriterAgent", "b", "retried"))
+    assert buffer.latest_text() == "retried"
+
+
+@pytest.mark.asyncio
+async def test_stream_buffer_subscribe_yields_until_closed():
+    """Test subscribers see past and future chunks and stop on close."""
+    buffer = StreamBuffer()
+    buffer(StreamChunk("WriterAgent", "a", "one"))
+
+    async def produce():
+        await asyncio.sleep(0)
+        buffer(StreamChunk("WriterAgent", "a", "two"))
+        await asyncio.sleep(0)
+        buffer.close()
+
+    async def consume(start):
+        return [c.text async for c in buffer.subscribe(start)]
+
+    results = await asyncio.gather(consume(0), consume(1), produce())
+
+    assert results[0] == ["one", "two"]
+    assert results[1] == ["two"]
+
+
+def test_closed_stream_buffers_expire_after_grace_period(monkeypatch):
+    """Test closed buffers stay readable for the TTL, then are evicted."""
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    store = StreamBufferStore(ttl_seconds=60)
+    store.open("done").close()
+    running = store.open("running")
+
+    now += 30
+    assert store.get("done") is not None
+
+    now += 31
+    assert store.get("done") is None
+    assert store.get("running") is running
+    assert len(store) == 1
+
+
+def test_file_stream_sink_separates_calls(tmp_path):
+    """Test the file sink writes a header whenever a new call starts."""
+    path = tmp_path / "logs" / "stream.log"
+    sink = FileStreamSink(str(path))
+
+    sink(StreamChunk("AnalysisAgent", "a", "Hello "))
+    sink(StreamChunk("AnalysisAgent", "a", "world"))
+    sink(StreamChunk("WriterAgent", "b", "Report"))
+
+    text = path.read_text(encoding="utf-8")
+    assert "--- AnalysisAgent [a] ---\nHello world" in text
+    assert "--- WriterAgent [b] ---\nReport" in text
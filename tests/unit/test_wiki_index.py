@@ -0,0 +1,97 @@
+"""Unit tests for the offline Wikipedia BM25 index."""
+
+import numpy as np
+import pytest
+
+from src.tools.search import WikipediaSearchTool
+from src.tools.wiki_index import WikiIndex, build_index, tokenize
+
+DOCS = [
+    {
+        "title": "Tesla, Inc.",
+        "url": "https://en.wikipedia.org/wiki/Tesla,_Inc.",
+        "text": "Tesla is an American electric vehicle and clean energy company.",
+    },
+    {
+        "title": "Notion (productivity software)",
+        "url": "https://en.wikipedia.org/wiki/Notion",
+        "text": "Notion is a productivity and note-taking web application.",
+    },
+    {
+        "title": "Electric vehicle",
+        "url": "https://en.wikipedia.org/wiki/Electric_vehicle",
+        "text": "An electric vehicle uses electric motors. Electric cars are "
+        "electric vehicles.",
+    },
+]
+
+
+def test_tokenize_drops_stopwords():
+    """Test tokenizer lowercases and removes stopwords."""
+    assert tokenize("The Tesla of EVs, is 2024!") == ["tesla", "evs", "2024"]
+
+
+def test_bm25_ranking(tmp_path):
+    """Test BM25 ranks the most relevant document first."""
+    build_index(DOCS, str(tmp_path))
+    index = WikiIndex(str(tmp_path))
+
+    hits = index.search("tesla electric company", top_k=2)
+
+    assert index.n_docs == 3
+    assert hits[0][0] == 0
+    assert len(hits) == 2
+    assert index.get_document(1)["title"] == "Notion (productivity software)"
+    assert index.search("unknownterm") == []
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_tool_returns_tavily_shaped_results(tmp_path):
+    """Test the tool serves normalized results from the local index."""
+    build_index(DOCS, str(tmp_path))
+    tool = WikipediaSearchTool(index_path=str(tmp_path))
+
+    response = await tool.search("Notion productivity", max_results=1)
+
+    assert tool.available
+    assert response["results"][0]["url"].endswith("/Notion")
+    assert 0.0 < response["results"][0]["score"] < 1.0
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_scores_are_absolute(tmp_path):
+    """Test a top hit about another entity does not get a perfect score."""
+    build_index(DOCS, str(tmp_path))
+    tool = WikipediaSearchTool(index_path=str(tmp_path))
+
+    right = (await tool.search("Tesla", max_results=1))["results"][0]
+    wrong = (await tool.search("Rivian electric vehicle", max_results=1))["results"]
+
+    assert right["title"] == "Tesla, Inc."
+    assert right["score"] > 0.5
+    assert wrong[0]["title"] == "Electric vehicle"
+    assert wrong[0]["score"] < right["score"]
+
+
+def test_chunked_build_matches_single_chunk(tmp_path):
+    """Test merging many small sorted chunks gives the same index."""
+    docs = DOCS * 4
+    build_index(docs, str(tmp_path / "one"))
+    build_index(docs, str(tmp_path / "many"), chunk_postings=5)
+    one, many = WikiIndex(str(tmp_path / "one")), WikiIndex(str(tmp_path / "many"))
+
+    for name in ("term_hashes", "term_offsets", "postings_docs", "postings_tf"):
+        assert np.array_equal(getattr(one, name), getattr(many, name))
+    assert many.search("tesla electric company") == one.search("tesla electric company")
+    assert not list((tmp_path / "many").glob("build-*"))
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_tool_without_index(tmp_path):
+    """Test the tool degrades to no results when no index exists."""
+    tool = WikipediaSearchTool(index_path=str(tmp_path / "missing"))
+
+    response = await tool.search("Tesla")
+
+    assert not tool.available
+    assert response["results"] == []
@@ -100,6 +100,18 @@ class TestConditionalRouting:
         result = workflow._should_continue_to_analysis(state)
         assert result == "end"
 
+    def test_should_continue_to_writing(self):
+        """Test routing ends after analysis errors or a refused budget."""
+        workflow = MarketIntelligenceWorkflow()
+
+        assert workflow._should_continue_to_writing({"errors": []}) == "writing"
+        assert (
+            workflow._should_continue_to_writing(
+                {"errors": ["Budget exceeded: projected cost"]}
+            )
+            == "end"
+        )
+
     def test_check_approval_approved(self):
         """Test approval check when approved."""
         workflow = MarketIntelligenceWorkflow()
@@ -182,3 +194,27 @@ class TestWorkflowNodes:
         assert result["current_agent"] == "human_review"
         assert result["approved"] is True
         assert result["human_feedback"] is None
+
+    async def test_analysis_node_refuses_projected_overrun(self):
+        """Test analysis is not started when the projected cost exceeds budget."""
+        workflow = MarketIntelligenceWorkflow(
+            max_budget=0.001, model_name="anthropic/claude-sonnet-4.5"
+        )
+        workflow.analysis_agent.run = AsyncMock()
+
+        state = {
+            "company_name": "Test Company",
+            "research_data": {
+                "company_name": "Test Company",
+                "company_overview": "Overview " * 2000,
+                "competitors": "Competitors",
+                "market_trends": "Trends",
+                "raw_sources": [],
+            },
+        }
+
+        result = await workflow._analysis_node(state)
+
+        assert result["current_agent"] == "analysis"
+        assert "Budget exceeded" in result["errors"][0]
+        workflow.analysis_agent.run.assert_not_called()